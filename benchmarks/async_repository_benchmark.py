@@ -0,0 +1,135 @@
+"""
+Concurrent requests of BaseRepository, blocking Session in async methods, against AsyncBaseRepository
+with aiosqlite, in a SQLite file
+
+    python benchmarks/async_repository_benchmark.py
+
+Each round FAST_REQUESTS reads by primary key and SLOW_REQUESTS scans of the table arrive at random times
+during ARRIVAL_SECONDS, like the requests of one worker. With the blocking path each scan stall the event loop
+and the reads that arrive meanwhile wait behind it. The columns fast p50/p99 are the latency of the reads by
+primary key from their arrival and loop lag the max delay of a 1ms timer.
+SQLite run the query in the same machine, so the scans use the CPU also in the threads of aiosqlite, with
+a remote database the wait of network is where the async path let the other requests run
+"""
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, create_engine
+
+from fastapi_dream_core.database import AsyncDatabaseSQLModel, DatabaseSQLModel
+from fastapi_dream_core.pagination import PageQuery
+from fastapi_dream_core.repository import AsyncBaseRepository, BaseRepository
+
+ROWS = 200000
+FAST_REQUESTS = 200
+SLOW_REQUESTS = 10
+ARRIVAL_SECONDS = 0.5
+ROUNDS = 3
+
+
+class ConcurrencyItem(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    quantity: int
+
+
+def create_database(directory: str) -> str:
+    path = os.path.join(directory, 'concurrency.db')
+
+    engine = create_engine(f'sqlite:///{path}')
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            ConcurrencyItem.__table__.insert(),
+            [{'name': f'item {index}', 'quantity': index % 1000} for index in range(ROWS)]
+        )
+    engine.dispose()
+
+    return path
+
+
+async def request(coroutine_function, arrival: float, start_time: float, timings: list = None) -> None:
+    """
+    Wait the arrival of request and run it, the latency is from the arrival so it include the time
+    waiting the event loop blocked by other requests
+    """
+    await asyncio.sleep(max(0.0, start_time + arrival - time.perf_counter()))
+    await coroutine_function()
+
+    if timings is not None:
+        timings.append((time.perf_counter() - start_time - arrival) * 1000)
+
+
+async def heartbeat(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start_time = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - start_time - 0.001) * 1000)
+
+
+async def measure(repository, slow_requests: int) -> tuple:
+    fast_timings, lags = [], []
+    stop = asyncio.Event()
+    heartbeat_task = asyncio.ensure_future(heartbeat(lags, stop))
+
+    start_time = time.perf_counter()
+    requests = [
+        request(
+            lambda: repository.find_one_by_filters({'id': random.randint(1, ROWS)}),
+            random.uniform(0, ARRIVAL_SECONDS), start_time, fast_timings
+        )
+        for _ in range(FAST_REQUESTS)
+    ]
+    requests += [
+        request(
+            lambda: repository.find_by_filters_paginated(PageQuery(size=10), filters={'name__contains': '99999'}),
+            random.uniform(0, ARRIVAL_SECONDS), start_time
+        )
+        for _ in range(slow_requests)
+    ]
+
+    await asyncio.gather(*requests)
+    elapsed = time.perf_counter() - start_time
+
+    stop.set()
+    await heartbeat_task
+
+    fast_timings.sort()
+    return (
+        (FAST_REQUESTS + slow_requests) / elapsed,
+        statistics.median(fast_timings),
+        fast_timings[int(len(fast_timings) * 0.99) - 1],
+        max(lags)
+    )
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = create_database(directory)
+
+        database = DatabaseSQLModel(f'sqlite:///{path}')
+        async_database = AsyncDatabaseSQLModel(f'sqlite+aiosqlite:///{path}')
+        repositories = {
+            'BaseRepository': BaseRepository(database.session, ConcurrencyItem),
+            'AsyncBaseRepository': AsyncBaseRepository(async_database.session, ConcurrencyItem),
+        }
+
+        for slow_requests in (0, SLOW_REQUESTS):
+            for name, repository in repositories.items():
+                for _ in range(ROUNDS):
+                    requests_per_second, p50, p99, lag = await measure(repository, slow_requests)
+                    print(
+                        f'{slow_requests:>2} scans | {name:<20} | {requests_per_second:6.0f} req/s | '
+                        f'fast p50 {p50:8.2f}ms | fast p99 {p99:8.2f}ms | loop lag {lag:8.2f}ms'
+                    )
+
+        await async_database.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Rows per second of BaseRepository.create in a loop against create_many by chunk_size, in a SQLite file
+
+    python benchmarks/bulk_insert_benchmark.py
+
+create: one INSERT and one commit by row
+create_many: one executemany by chunk of rows with the same columns and one commit
+"""
+import asyncio
+import os
+import tempfile
+import time
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, create_engine
+
+from fastapi_dream_core.database import DatabaseSQLModel
+from fastapi_dream_core.repository import BaseRepository
+
+ROWS = 20000
+CREATE_ROWS = 2000
+
+
+class BulkItem(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    quantity: int
+    note: Optional[str] = None
+
+
+def build_repository(directory: str, name: str) -> BaseRepository:
+    db_url = f'sqlite:///{os.path.join(directory, name)}.db'
+
+    engine = create_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    engine.dispose()
+
+    return BaseRepository(DatabaseSQLModel(db_url).session, BulkItem)
+
+
+def rows(count: int) -> list:
+    return [{'name': f'item {index}', 'quantity': index} for index in range(count)]
+
+
+async def measure_create(repository: BaseRepository) -> float:
+    start_time = time.perf_counter()
+    for row in rows(CREATE_ROWS):
+        await repository.create(row)
+
+    return CREATE_ROWS / (time.perf_counter() - start_time)
+
+
+async def measure_create_many(repository: BaseRepository, chunk_size: int) -> float:
+    items = rows(ROWS)
+
+    start_time = time.perf_counter()
+    await repository.create_many(items, chunk_size=chunk_size)
+    return ROWS / (time.perf_counter() - start_time)
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        rate = await measure_create(build_repository(directory, 'create'))
+        print(f'{"create":<24} | {CREATE_ROWS:>6} rows | {rate:10.0f} rows/s')
+
+        for chunk_size in (100, 1000, 5000):
+            rate = await measure_create_many(build_repository(directory, f'create_many_{chunk_size}'), chunk_size)
+            print(f'{f"create_many({chunk_size})":<24} | {ROWS:>6} rows | {rate:10.0f} rows/s')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+Peak memory and rows per second of CSVExporter by number of rows, the whole file against the chunks of iter_csv
+
+    python benchmarks/csv_exporter_benchmark.py
+
+to_csv: the path of to_csv_streaming_response before, the list of models and the whole file in a StringIO,
+    then the file as one chunk
+iter_csv: the models come from a generator, like a server side cursor, and the chunks of chunk_size are
+    consumed as the response send them, the peak should not grow with the number of rows
+The memory is measured with tracemalloc, the time without it
+"""
+import datetime
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from pydantic import BaseModel, Field
+
+from fastapi_dream_core.utils.csv_exporter import CSVExporter
+
+ROWS = (10000, 100000, 300000)
+
+
+class ExportItem(BaseModel):
+    id: int
+    name: str = Field(title='Name')
+    description: Optional[str]
+    price: Decimal
+    created_at: datetime.datetime
+
+
+def items(count: int) -> Iterator[ExportItem]:
+    now = datetime.datetime(2024, 1, 1)
+    for index in range(count):
+        yield ExportItem(
+            id=index, name=f'item {index}', description='lorem; "ipsum"' if index % 10 == 0 else None,
+            price=Decimal('10.50'), created_at=now
+        )
+
+
+def to_csv(exporter: CSVExporter, count: int) -> int:
+    chunk = exporter.to_csv(list(items(count))).getvalue().encode()
+    return len(chunk)
+
+
+def iter_csv(exporter: CSVExporter, count: int) -> int:
+    return sum(len(chunk) for chunk in exporter.iter_csv(items(count)))
+
+
+def measure(export, exporter: CSVExporter, count: int) -> tuple:
+    start_time = time.perf_counter()
+    export(exporter, count)
+    rows_per_second = count / (time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    export(exporter, count)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return rows_per_second, peak
+
+
+def main():
+    exporter = CSVExporter(ExportItem)
+
+    for count in ROWS:
+        for name, export in (('to_csv', to_csv), ('iter_csv', iter_csv)):
+            rows_per_second, peak = measure(export, exporter, count)
+            print(f'{count:>7} rows | {name:<8} | {rows_per_second:8.0f} rows/s | peak {peak / 1024 / 1024:8.2f}MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Nanoseconds by operation and memory kept of InMemoryCacheDriver against the previous driver, a class level
+dict with dataclass entries and expiry checked with datetime only when the same key is read again
+
+    python benchmarks/in_memory_cache_benchmark.py
+
+memory: tracemalloc of the driver after set of UNIQUE_KEYS keys that expire in 1 second and are never read
+again, like the keys by request of a long running worker, the new driver is bounded by max_entries.
+The line observe=True also observe get and set in the metrics of cache
+"""
+import dataclasses
+import datetime
+import time
+import tracemalloc
+from typing import Union
+
+from fastapi_dream_core.cache_driver import CacheDriverABC, InMemoryCacheDriver
+
+OPERATIONS = 200000
+KEYS = 1000
+UNIQUE_KEYS = 200000
+VALUE = b'x' * 100
+
+
+@dataclasses.dataclass
+class PreviousCacheData:
+    value: bytes
+    seconds_for_expire: int
+    datetime: datetime
+
+
+class PreviousInMemoryCacheDriver(CacheDriverABC):
+    """
+    The InMemoryCacheDriver before the LRU rewrite, kept here only as reference of the benchmark
+    """
+
+    _memory: dict = {}
+
+    def get(self, key: str) -> Union[bytes, None]:
+        cache_data: PreviousCacheData = self._memory.get(key)
+
+        if not cache_data:
+            return None
+
+        if ((cache_data.datetime - datetime.datetime.now()).total_seconds() * -1) > cache_data.seconds_for_expire:
+            del self._memory[key]
+            return None
+
+        return cache_data.value
+
+    def set(self, key: str, value, seconds_for_expire: int = 600) -> None:
+        self._memory.update({
+            key: PreviousCacheData(
+                value=value if isinstance(value, bytes) else str(value).encode(),
+                seconds_for_expire=seconds_for_expire,
+                datetime=datetime.datetime.now()
+            )
+        })
+
+    def dump(self, key: str) -> None:
+        if self._memory.get(key):
+            del self._memory[key]
+
+        return None
+
+
+def nanoseconds(operation, keys: list) -> float:
+    start_time = time.perf_counter()
+    for index in range(OPERATIONS):
+        operation(keys[index % len(keys)])
+
+    return (time.perf_counter() - start_time) / OPERATIONS * 1e9
+
+
+def memory(build) -> tuple:
+    tracemalloc.start()
+    cache_driver = build()
+
+    for index in range(UNIQUE_KEYS):
+        cache_driver.set(f'request:{index}', VALUE, seconds_for_expire=1)
+
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, len(cache_driver._memory)
+
+
+def main():
+    builders = {
+        'previous': PreviousInMemoryCacheDriver,
+        'InMemoryCacheDriver': lambda: InMemoryCacheDriver(max_entries=KEYS * 10),
+        'observe=True': lambda: InMemoryCacheDriver(max_entries=KEYS * 10, observe=True),
+    }
+    keys = [f'key:{index}' for index in range(KEYS)]
+    missing = [f'missing:{index}' for index in range(KEYS)]
+
+    for name, build in builders.items():
+        cache_driver = build()
+        set_ns = nanoseconds(lambda key: cache_driver.set(key, VALUE), keys)
+        hit_ns = nanoseconds(cache_driver.get, keys)
+        miss_ns = nanoseconds(cache_driver.get, missing)
+        cache_driver._memory.clear()
+
+        size, entries = memory(build)
+        build()._memory.clear()
+
+        print(
+            f'{name:<20} | set {set_ns:7.0f}ns | get hit {hit_ns:7.0f}ns | get miss {miss_ns:7.0f}ns | '
+            f'memory {size / 1024 / 1024:7.1f}MB with {entries} keys'
+        )
+
+
+if __name__ == '__main__':
+    main()
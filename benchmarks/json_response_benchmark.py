@@ -0,0 +1,105 @@
+"""
+Latency of GET routes that return a Page by response class, p50 and p99 in milliseconds, measured with TestClient
+
+    python benchmarks/json_response_benchmark.py
+
+JSONResponse: the default of FastAPI, response_model validation + jsonable_encoder + json.dumps
+FastJSONResponse: fast_api_create_app(default_response_class=FastJSONResponse), response_model validation +
+    orjson (json when orjson is not installed) without jsonable_encoder
+"""
+import datetime
+import statistics
+import time
+import uuid
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlmodel import SQLModel, Field
+
+from fastapi_dream_core.fast_api_create_app import fast_api_create_app
+from fastapi_dream_core.pagination import Page, PageQuery
+from fastapi_dream_core.utils import FastJSONResponse
+from fastapi_dream_core.utils.json_response import orjson
+
+ROUNDS = 200
+
+
+class ItemModel(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    uuid: uuid.UUID
+    name: str
+    description: str
+    price: Decimal
+    created_at: datetime.datetime
+    active: bool
+
+
+class ItemSchema(BaseModel):
+    id: int
+    uuid: uuid.UUID
+    name: str
+    description: str
+    price: Decimal
+    created_at: datetime.datetime
+    active: bool
+
+
+def build_page(size: int) -> Page:
+    now = datetime.datetime.utcnow()
+    items = [
+        ItemModel(
+            id=index, uuid=uuid.uuid4(), name=f'item {index}', description='lorem ipsum ' * 5,
+            price=Decimal('10.50'), created_at=now, active=index % 2 == 0
+        )
+        for index in range(size)
+    ]
+    return Page.create(items=items, total=size * 10, page_query=PageQuery(page=1, size=size))
+
+
+def build_client(default_response_class) -> TestClient:
+    router = APIRouter()
+    pages = {size: build_page(size) for size in (100, 1000)}
+
+    @router.get('/items/{size}', response_model=Page[ItemSchema])
+    async def list_items(size: int):
+        return pages[size]
+
+    app = fast_api_create_app(
+        router, default_response_class=default_response_class, metrics_include_in_app=False,
+        migration_route_include_in_app=False
+    )
+    return TestClient(app)
+
+
+def measure(client: TestClient, size: int) -> tuple:
+    timings = []
+
+    for _ in range(ROUNDS):
+        start_time = time.perf_counter()
+        client.get(f'/items/{size}')
+        timings.append((time.perf_counter() - start_time) * 1000)
+
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    print(f'orjson: {"installed" if orjson is not None else "not installed, json fallback"}')
+
+    clients = {
+        'JSONResponse': build_client(JSONResponse),
+        'FastJSONResponse': build_client(FastJSONResponse),
+    }
+
+    for size in (100, 1000):
+        for name, client in clients.items():
+            p50, p99 = measure(client, size)
+            print(f'{size:>5} items | {name:<16} | p50 {p50:8.3f}ms | p99 {p99:8.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
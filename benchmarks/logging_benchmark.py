@@ -0,0 +1,75 @@
+"""
+Overhead of each log call in the caller, in microseconds, of the synchronous StreamHandler used before
+and of configure_logger, records enqueued and written by a background thread, both write to os.devnull
+
+    python benchmarks/logging_benchmark.py
+
+The column drained include the time waiting the background thread write all records
+"""
+import logging
+import os
+import sys
+import time
+
+from fastapi_dream_core.utils.logger import TEXT_FORMAT, configure_logger, stop_logger
+
+CALLS = 20000
+
+
+def log_info(target: logging.Logger) -> None:
+    for index in range(CALLS):
+        target.info('request completed %s', index)
+
+
+def log_exception(target: logging.Logger) -> None:
+    for index in range(CALLS):
+        try:
+            raise ValueError(index)
+        except ValueError:
+            target.exception('Unhandled error in %s %s', 'GET', '/items')
+
+
+def synchronous_logger(stream) -> logging.Logger:
+    target = logging.getLogger('benchmark.synchronous')
+    target.propagate = False
+    target.setLevel(logging.INFO)
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    target.addHandler(handler)
+    return target
+
+
+def measure(name: str, setup, run) -> None:
+    target, teardown = setup()
+    start_time = time.perf_counter()
+    run(target)
+    caller = time.perf_counter() - start_time
+    teardown()
+    drained = time.perf_counter() - start_time
+
+    print(f'{name:<32} | caller {caller / CALLS * 1e6:7.2f}us | drained {drained / CALLS * 1e6:7.2f}us')
+
+
+def main():
+    devnull = open(os.devnull, 'w')
+
+    def setup_synchronous():
+        return synchronous_logger(devnull), lambda: None
+
+    def setup_background():
+        stderr, sys.stderr = sys.stderr, devnull
+        try:
+            target = configure_logger(log_level=logging.INFO, json_format=True, queue_size=CALLS)
+        finally:
+            sys.stderr = stderr
+
+        return target, stop_logger
+
+    for case, run in (('info', log_info), ('exception', log_exception)):
+        measure(f'{case} | StreamHandler', setup_synchronous, run)
+        measure(f'{case} | configure_logger', setup_background, run)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Requests per second of the middleware stack of fast_api_create_app outside DEV, before and after the rewrite
+of AppMiddleware and DevelopMiddleware as pure ASGI, the requests are sent to the ASGI app without server
+
+    python benchmarks/middleware_benchmark.py
+
+BaseHTTPMiddleware: CORSMiddleware + DevelopMiddleware(is_environment_dev=False) + AppMiddleware of before,
+    subclasses of BaseHTTPMiddleware kept here only as reference of the benchmark
+ASGI: CORSMiddleware + AppMiddleware, DevelopMiddleware is only installed in DEV
+/json return a small JSON, /stream a StreamingResponse of STREAM_CHUNKS chunks
+"""
+import asyncio
+import time
+import traceback
+from http import HTTPStatus
+
+from fastapi import APIRouter, FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+
+from fastapi_dream_core.exceptions import InternalErrorSchema
+from fastapi_dream_core.middleware.app_middleware import AppMiddleware
+from fastapi_dream_core.utils import logger
+
+REQUESTS = 3000
+CONCURRENCY = 50
+STREAM_CHUNKS = 100
+
+
+class PreviousAppMiddleware(BaseHTTPMiddleware):
+
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception:
+            logger.error(traceback.format_exc())
+            return JSONResponse(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, content=InternalErrorSchema().dict())
+
+
+class PreviousDevelopMiddleware(BaseHTTPMiddleware):
+
+    def __init__(self, is_environment_dev: bool = False, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.is_environment_dev = is_environment_dev
+
+    async def dispatch(self, request: Request, call_next):
+        if not self.is_environment_dev:
+            return await call_next(request)
+
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(time.perf_counter() - start_time)
+        return response
+
+
+def build_app(previous: bool) -> FastAPI:
+    router = APIRouter()
+
+    @router.get('/json')
+    async def json_route():
+        return {'id': 1, 'name': 'item', 'active': True}
+
+    @router.get('/stream')
+    async def stream_route():
+        async def chunks():
+            for index in range(STREAM_CHUNKS):
+                yield f'{index},item {index}\n'.encode()
+
+        return StreamingResponse(chunks(), media_type='text/csv')
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(CORSMiddleware, allow_origins=['*'], allow_credentials=True, allow_methods=['*'],
+                       allow_headers=['*'])
+
+    if previous:
+        app.add_middleware(PreviousDevelopMiddleware, is_environment_dev=False)
+        app.add_middleware(PreviousAppMiddleware)
+    else:
+        app.add_middleware(AppMiddleware)
+
+    return app
+
+
+async def request(app: FastAPI, path: str) -> None:
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'benchmark')], 'client': ('127.0.0.1', 50000), 'server': ('benchmark', 80),
+    }
+    messages = []
+    completed = asyncio.Event()
+    received = False
+
+    async def receive():
+        # The body once like a server, then the disconnect when the response is completed
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        await completed.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+        if message['type'] == 'http.response.body' and not message.get('more_body', False):
+            completed.set()
+
+    await app(scope, receive, send)
+    assert messages[0]['status'] == 200
+
+
+async def measure(app: FastAPI, path: str) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def limited():
+        async with semaphore:
+            await request(app, path)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[limited() for _ in range(REQUESTS)])
+    return REQUESTS / (time.perf_counter() - start_time)
+
+
+async def main():
+    apps = {'BaseHTTPMiddleware': build_app(previous=True), 'ASGI': build_app(previous=False)}
+
+    for path in ('/json', '/stream'):
+        for name, app in apps.items():
+            await measure(app, path)
+            print(f'{path:<8} | {name:<18} | {await measure(app, path):8.0f} req/s')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+"""
+Latency of a GET route that return a page of 1000 items read from a SQLite file, p50 and p99 in milliseconds,
+by kind of read, measured with TestClient
+
+    python benchmarks/projection_benchmark.py
+
+models: find_by_filters_paginated hydrate the SQLModels, FastAPI validate them with the response_model and
+    serialize with jsonable_encoder
+projection: projection=ItemSchema select only its columns and return dicts, still validated by the response_model
+projection + FastJSONResponse: the dicts are returned in FastJSONResponse, without a second validation
+"""
+import datetime
+import os
+import statistics
+import tempfile
+import time
+from typing import Optional
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlmodel import SQLModel, Field, create_engine
+
+from fastapi_dream_core.database import DatabaseSQLModel
+from fastapi_dream_core.pagination import Page, PageQuery
+from fastapi_dream_core.repository import BaseRepository
+from fastapi_dream_core.utils import FastJSONResponse
+
+ROWS = 5000
+PAGE_SIZE = 1000
+ROUNDS = 100
+
+
+class ProjectionItem(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    description: str
+    notes: str
+    price: float
+    quantity: int
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+    active: bool
+
+
+class ItemSchema(BaseModel):
+    id: int
+    name: str
+    price: float
+    active: bool
+
+
+def create_database(directory: str) -> str:
+    db_url = f'sqlite:///{os.path.join(directory, "projection.db")}'
+
+    engine = create_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    now = datetime.datetime.utcnow()
+    with engine.begin() as connection:
+        connection.execute(ProjectionItem.__table__.insert(), [
+            {
+                'name': f'item {index}', 'description': 'lorem ipsum ' * 5, 'notes': 'dolor sit amet ' * 10,
+                'price': 10.5, 'quantity': index, 'created_at': now, 'updated_at': now,
+                'active': index % 2 == 0
+            }
+            for index in range(ROWS)
+        ])
+    engine.dispose()
+
+    return db_url
+
+
+def build_client(repository: BaseRepository) -> TestClient:
+    router = APIRouter()
+    page_query = PageQuery(page=1, size=PAGE_SIZE)
+
+    @router.get('/models', response_model=Page[ItemSchema])
+    async def models():
+        return await repository.find_by_filters_paginated(page_query)
+
+    @router.get('/projection', response_model=Page[ItemSchema])
+    async def projection():
+        return await repository.find_by_filters_paginated(page_query, projection=ItemSchema)
+
+    @router.get('/projection-fast-json', response_model=Page[ItemSchema])
+    async def projection_fast_json():
+        return FastJSONResponse(await repository.find_by_filters_paginated(page_query, projection=ItemSchema))
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def measure(client: TestClient, path: str) -> tuple:
+    timings = []
+
+    for _ in range(ROUNDS):
+        start_time = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - start_time) * 1000)
+
+    assert len(response.json()['items']) == PAGE_SIZE
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        database = DatabaseSQLModel(create_database(directory))
+        client = build_client(BaseRepository(database.session, ProjectionItem))
+
+        for name, path in (
+                ('models', '/models'),
+                ('projection', '/projection'),
+                ('projection + FastJSONResponse', '/projection-fast-json')
+        ):
+            measure(client, path)
+            p50, p99 = measure(client, path)
+            print(f'{PAGE_SIZE} items | {name:<30} | p50 {p50:8.3f}ms | p99 {p99:8.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
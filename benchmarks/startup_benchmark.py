@@ -0,0 +1,70 @@
+"""
+Cold start of fastapi_dream_core, each case run in a new interpreter, median of wall time and count of modules
+
+    python benchmarks/startup_benchmark.py
+
+Exit with 1 when a case import a module that it should not, example: redis by the cache_driver package
+or sqlmodel by fast_api_create_app, so it can run in CI as a regression check of the lazy imports
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROUNDS = 5
+
+CASES = {
+    'import fastapi_dream_core': (
+        'import fastapi_dream_core',
+        ('fastapi', 'redis', 'sqlmodel', 'sqlalchemy', 'boto3')
+    ),
+    'InMemoryCacheDriver': (
+        'from fastapi_dream_core.cache_driver import InMemoryCacheDriver',
+        ('redis', 'sqlmodel', 'sqlalchemy', 'boto3')
+    ),
+    'fast_api_create_app': (
+        'from fastapi import APIRouter\n'
+        'from fastapi_dream_core.fast_api_create_app import fast_api_create_app\n'
+        'fast_api_create_app(APIRouter())',
+        ('redis', 'sqlmodel', 'sqlalchemy', 'boto3', 'localstack_client', 'dependency_injector')
+    ),
+}
+
+SCRIPT = '''
+import json, sys, time
+before = set(sys.modules)
+start_time = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start_time
+print(json.dumps({{'seconds': elapsed, 'modules': sorted(set(sys.modules) - before)}}))
+'''
+
+
+def run_case(code: str) -> dict:
+    env = {**os.environ, 'ENVIRONMENT': os.environ.get('ENVIRONMENT', 'PRD')}
+    output = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(code=code)], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    failed = False
+
+    for name, (code, forbidden) in CASES.items():
+        results = [run_case(code) for _ in range(ROUNDS)]
+        milliseconds = statistics.median(result['seconds'] for result in results) * 1000
+        modules = results[-1]['modules']
+        imported = [module for module in forbidden if module in modules]
+
+        print(f'{name:<26} | {milliseconds:8.1f}ms | {len(modules):>4} modules')
+        if imported:
+            failed = True
+            print(f'{"":<26} | imported {", ".join(imported)}')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
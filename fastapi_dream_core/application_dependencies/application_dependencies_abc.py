@@ -1,7 +1,12 @@
 from abc import ABC
+from typing import Optional
 
 
 class ApplicationDependenciesABC(ABC):
 
     def readiness(self) -> bool:
         """Not Implemented"""
+
+    def details(self) -> Optional[dict]:
+        """Extra information of dependency showed in readiness, example: pool statistics"""
+        return None
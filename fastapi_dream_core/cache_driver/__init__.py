@@ -1,3 +1,34 @@
+from typing import TYPE_CHECKING
+
+from fastapi_dream_core.lazy_imports import lazy_attributes
+
 from .cache_driver_abc import CacheDriverABC
-from .redis_cache_driver import RedisCacheDriver
-from .in_memory_driver import InMemoryCacheDriver
+from .async_cache_driver_abc import AsyncCacheDriverABC
+
+# The drivers are imported on first access, so redis is not imported when only InMemoryCacheDriver is used
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'CircuitBreaker': '.circuit_breaker',
+    'RedisCacheDriver': '.redis_cache_driver',
+    'AsyncRedisCacheDriver': '.async_redis_cache_driver',
+    'InMemoryCacheDriver': '.in_memory_driver',
+    'CacheGeneration': '.cache_generation',
+    'AsyncCacheGeneration': '.cache_generation',
+    'InvalidationChannelABC': '.invalidation_channel',
+    'LocalInvalidationChannel': '.invalidation_channel',
+    'RedisInvalidationChannel': '.invalidation_channel',
+    'NearCacheDriver': '.near_cache_driver',
+    'cached': '.cached',
+    'CachedComputation': '.cached',
+    'ResponseCache': '.response_cache',
+})
+
+if TYPE_CHECKING:
+    from .circuit_breaker import CircuitBreaker
+    from .redis_cache_driver import RedisCacheDriver
+    from .async_redis_cache_driver import AsyncRedisCacheDriver
+    from .in_memory_driver import InMemoryCacheDriver
+    from .cache_generation import CacheGeneration, AsyncCacheGeneration
+    from .invalidation_channel import InvalidationChannelABC, LocalInvalidationChannel, RedisInvalidationChannel
+    from .near_cache_driver import NearCacheDriver
+    from .cached import cached, CachedComputation
+    from .response_cache import ResponseCache
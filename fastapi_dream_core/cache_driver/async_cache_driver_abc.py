@@ -0,0 +1,52 @@
+from abc import ABC
+from typing import Union, Dict, Iterable, List
+
+from fastapi_dream_core.cache_driver.compression import to_bytes
+
+
+class AsyncCacheDriverABC(ABC):
+
+    async def get(self, key: str) -> Union[bytes, None]:
+        """Not Implemented"""
+
+    async def set(self, key: str, value, seconds_for_expire: int = 600) -> None:
+        """Not Implemented"""
+
+    async def dump(self, key: str) -> None:
+        """Not Implemented"""
+
+    async def add(self, key: str, value, seconds_for_expire: int = 600) -> bool:
+        """
+        Set the key only when it does not exist and return True when it was set, used as a lock between
+        workers, the drivers should override to make it atomic
+        """
+        if await self.get(key) is not None:
+            return False
+
+        await self.set(key, value, seconds_for_expire=seconds_for_expire)
+        return True
+
+    async def dump_if_equal(self, key: str, value) -> bool:
+        """
+        Delete the key only when it still has the value and return True when it was deleted, used to release
+        a lock only by the worker that holds it, the drivers should override to make it atomic
+        """
+        if await self.get(key) != to_bytes(value):
+            return False
+
+        await self.dump(key)
+        return True
+
+    async def get_many(self, keys: Iterable[str]) -> List[Union[bytes, None]]:
+        """
+        Return the values in the same order of keys, the drivers can override to fetch in one round trip
+        """
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, mapping: Dict[str, object], seconds_for_expire: int = 600) -> None:
+        for key, value in mapping.items():
+            await self.set(key, value, seconds_for_expire=seconds_for_expire)
+
+    async def delete_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            await self.dump(key)
@@ -1,5 +1,7 @@
 from abc import ABC
-from typing import Union
+from typing import Union, Dict, Iterable, List
+
+from fastapi_dream_core.cache_driver.compression import to_bytes
 
 
 class CacheDriverABC(ABC):
@@ -12,3 +14,39 @@ class CacheDriverABC(ABC):
 
     def dump(self, key: str) -> None:
         """Not Implemented"""
+
+    def add(self, key: str, value, seconds_for_expire: int = 600) -> bool:
+        """
+        Set the key only when it does not exist and return True when it was set, used as a lock between
+        workers, the drivers should override to make it atomic
+        """
+        if self.get(key) is not None:
+            return False
+
+        self.set(key, value, seconds_for_expire=seconds_for_expire)
+        return True
+
+    def dump_if_equal(self, key: str, value) -> bool:
+        """
+        Delete the key only when it still has the value and return True when it was deleted, used to release
+        a lock only by the worker that holds it, the drivers should override to make it atomic
+        """
+        if self.get(key) != to_bytes(value):
+            return False
+
+        self.dump(key)
+        return True
+
+    def get_many(self, keys: Iterable[str]) -> List[Union[bytes, None]]:
+        """
+        Return the values in the same order of keys, the drivers can override to fetch in one round trip
+        """
+        return [self.get(key) for key in keys]
+
+    def set_many(self, mapping: Dict[str, object], seconds_for_expire: int = 600) -> None:
+        for key, value in mapping.items():
+            self.set(key, value, seconds_for_expire=seconds_for_expire)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.dump(key)
@@ -0,0 +1,104 @@
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi_dream_core.cache_driver.async_cache_driver_abc import AsyncCacheDriverABC
+from fastapi_dream_core.cache_driver.cache_driver_abc import CacheDriverABC
+
+
+class CacheGeneration:
+
+    def __init__(self, cache_driver: CacheDriverABC, seconds_for_expire: int = 86400):
+        """
+        Generation counters stored in cache driver, a generation is part of the keys of a namespace
+        so bump the generation invalidate all keys of namespace without scan keys
+        :param cache_driver: The driver that store the counters, shared by all workers when is a remote cache
+        :param seconds_for_expire: Seconds that a counter without bump is kept
+        """
+        self._cache_driver = cache_driver
+        self._seconds_for_expire = seconds_for_expire
+
+    @staticmethod
+    def _key(namespace: str) -> str:
+        return f'generation:{namespace}'
+
+    @staticmethod
+    def _parse(value) -> Optional[int]:
+        if value is None:
+            return None
+
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _initial() -> int:
+        # Start from the clock, so a counter expired never return to a generation already used
+        return time.time_ns() // 1000
+
+    @classmethod
+    def _fill(cls, keys: List[str], values: Iterable) -> Tuple[List[int], Dict[str, int]]:
+        """
+        The generations of get_many and the initial generations of the keys that are not in cache
+        """
+        generations = [cls._parse(value) for value in values]
+        missing = {key: cls._initial() for key, generation in zip(keys, generations) if generation is None}
+        generations = [missing.get(key, generation) for key, generation in zip(keys, generations)]
+
+        return generations, missing
+
+    def get(self, namespace: str) -> int:
+        generation = self._parse(self._cache_driver.get(self._key(namespace)))
+        if generation is not None:
+            return generation
+
+        generation = self._initial()
+        self._cache_driver.set(self._key(namespace), generation, seconds_for_expire=self._seconds_for_expire)
+        return generation
+
+    def get_many(self, namespaces: Iterable[str]) -> List[int]:
+        """
+        The generations of namespaces in the same order, read with one get_many of driver
+        """
+        keys = [self._key(namespace) for namespace in namespaces]
+        generations, missing = self._fill(keys, self._cache_driver.get_many(keys))
+        if missing:
+            self._cache_driver.set_many(missing, seconds_for_expire=self._seconds_for_expire)
+
+        return generations
+
+    def bump(self, namespace: str) -> int:
+        generation = max(self.get(namespace) + 1, self._initial())
+        self._cache_driver.set(self._key(namespace), generation, seconds_for_expire=self._seconds_for_expire)
+        return generation
+
+
+class AsyncCacheGeneration(CacheGeneration):
+
+    def __init__(self, cache_driver: AsyncCacheDriverABC, seconds_for_expire: int = 86400):
+        """
+        CacheGeneration over an AsyncCacheDriverABC, get and bump are awaited
+        """
+        super(AsyncCacheGeneration, self).__init__(cache_driver=cache_driver, seconds_for_expire=seconds_for_expire)
+
+    async def get(self, namespace: str) -> int:
+        generation = self._parse(await self._cache_driver.get(self._key(namespace)))
+        if generation is not None:
+            return generation
+
+        generation = self._initial()
+        await self._cache_driver.set(self._key(namespace), generation, seconds_for_expire=self._seconds_for_expire)
+        return generation
+
+    async def get_many(self, namespaces: Iterable[str]) -> List[int]:
+        keys = [self._key(namespace) for namespace in namespaces]
+        generations, missing = self._fill(keys, await self._cache_driver.get_many(keys))
+        if missing:
+            await self._cache_driver.set_many(missing, seconds_for_expire=self._seconds_for_expire)
+
+        return generations
+
+    async def bump(self, namespace: str) -> int:
+        generation = max(await self.get(namespace) + 1, self._initial())
+        await self._cache_driver.set(self._key(namespace), generation, seconds_for_expire=self._seconds_for_expire)
+        return generation
@@ -0,0 +1,263 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import math
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Union
+
+from fastapi_dream_core.cache_driver import serializer
+from fastapi_dream_core.cache_driver.async_cache_driver_abc import AsyncCacheDriverABC
+from fastapi_dream_core.cache_driver.cache_driver_abc import CacheDriverABC
+from fastapi_dream_core.utils import logger
+
+
+async def _call(result):
+    return await result if inspect.isawaitable(result) else result
+
+
+class CachedComputation:
+
+    def __init__(
+            self,
+            func: Callable[..., Awaitable[Any]],
+            cache_driver: Union[CacheDriverABC, AsyncCacheDriverABC],
+            seconds_for_expire: int = 600,
+            stale_seconds: int = 0,
+            early_refresh_beta: float = 1.0,
+            lock_seconds: int = 30,
+            lock_wait_seconds: float = 5,
+            key_builder: Callable[..., str] = None,
+            prefix: str = None
+    ):
+        """
+        Cache of the result of an async function with protection against cache stampede
+            - the concurrent misses of a key in the process wait for only one computation
+            - between processes a lock in the cache driver let only one compute, the others wait the value
+            - before expire the value can be refreshed in background with probability that grow near
+              the expiration (early_refresh_beta), and an expired value is served while it is refreshed
+              in background during stale_seconds
+        The values are stored with fastapi_dream_core.cache_driver.serializer, not pickle, so the result should be
+        of types that it encode (JSON types, datetime, Decimal, UUID, bytes...), tuples are returned as lists
+        :param func: The async function or method, the methods share the values between the instances
+        :param cache_driver: The driver that store the values and locks, sync or async
+        :param seconds_for_expire: Seconds that a value is fresh
+        :param stale_seconds: Seconds after seconds_for_expire that the value is served while refreshed
+        :param early_refresh_beta: Aggressiveness of the early refresh, 0 disable
+        :param lock_seconds: Max seconds of the lock between processes
+        :param lock_wait_seconds: Max seconds waiting the value computed by other process, after compute anyway
+        :param key_builder: Build the key from the args of function, by default a hash of args without the instance
+        :param prefix: The prefix of keys, by default module and name of function
+        """
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(f'cached expected an async function, received {func}')
+
+        self.func = func
+        self.cache_driver = cache_driver
+        self.seconds_for_expire = seconds_for_expire
+        self.stale_seconds = stale_seconds
+        self.early_refresh_beta = early_refresh_beta
+        self.lock_seconds = lock_seconds
+        self.lock_wait_seconds = lock_wait_seconds
+        self.key_builder = key_builder
+        self.prefix = prefix if prefix else f'cached:{func.__module__}.{func.__qualname__}'
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+        functools.update_wrapper(self, func)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        return BoundCachedComputation(self, instance)
+
+    def key(self, *args, **kwargs) -> str:
+        if self.key_builder:
+            return f'{self.prefix}:{self.key_builder(*args, **kwargs)}'
+
+        return self._hash_key(args, kwargs)
+
+    def _hash_key(self, args: tuple, kwargs: dict) -> str:
+        digest = hashlib.sha1(repr((args, sorted(kwargs.items()))).encode()).hexdigest()
+        return f'{self.prefix}:{digest}'
+
+    async def __call__(self, *args, **kwargs):
+        return await self._get(self.key(*args, **kwargs), args, kwargs)
+
+    async def invalidate(self, *args, **kwargs) -> None:
+        await self._invalidate(self.key(*args, **kwargs))
+
+    async def _get(self, key: str, args: tuple, kwargs: dict):
+        entry = await self.__read(key)
+
+        if entry is None:
+            return await self.__single_flight(key, args, kwargs)
+
+        value, delta, fresh_until = entry
+        now = time.time()
+
+        if now >= fresh_until or self.__should_refresh_early(now, delta, fresh_until):
+            self.__refresh_in_background(key, args, kwargs)
+
+        return value
+
+    async def _invalidate(self, key: str) -> None:
+        await _call(self.cache_driver.dump(key))
+
+    def __should_refresh_early(self, now: float, delta: float, fresh_until: float) -> bool:
+        if self.early_refresh_beta <= 0:
+            return False
+
+        return now - delta * self.early_refresh_beta * math.log(1.0 - random.random()) >= fresh_until
+
+    async def __read(self, key: str) -> Optional[tuple]:
+        data = await _call(self.cache_driver.get(key))
+        if data is None:
+            return None
+
+        try:
+            entry = serializer.loads(data)
+        except (ValueError, TypeError):
+            return None
+
+        # [value, delta, fresh_until], anything else was not written by cached
+        if not isinstance(entry, list) or len(entry) != 3:
+            return None
+
+        return tuple(entry)
+
+    def __refresh_in_background(self, key: str, args: tuple, kwargs: dict) -> None:
+        if key in self._in_flight:
+            return
+
+        task = asyncio.ensure_future(self.__single_flight(key, args, kwargs))
+        self._background.add(task)
+        task.add_done_callback(self.__background_done)
+
+    def __background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f'Error in cached - Error in background refresh - Exception = {task.exception()}')
+
+    async def __single_flight(self, key: str, args: tuple, kwargs: dict):
+        future = self._in_flight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+
+        try:
+            value = await self.__compute_with_lock(key, args, kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def __compute_with_lock(self, key: str, args: tuple, kwargs: dict):
+        lock_key = f'{key}:lock'
+        lock_token = uuid.uuid4().hex
+        locked = await _call(self.cache_driver.add(lock_key, lock_token, seconds_for_expire=self.lock_seconds))
+
+        if not locked:
+            entry = await self.__wait_for_other_process(key)
+            if entry is not None:
+                return entry[0]
+
+        try:
+            start_time = time.time()
+            value = await self.func(*args, **kwargs)
+            delta = time.time() - start_time
+
+            fresh_until = time.time() + self.seconds_for_expire
+            data = serializer.dumps([value, delta, fresh_until])
+            await _call(self.cache_driver.set(
+                key, data, seconds_for_expire=self.seconds_for_expire + self.stale_seconds
+            ))
+            return value
+        finally:
+            # The lock can be expired and taken by other process, so it is deleted only if still has our token
+            if locked:
+                await _call(self.cache_driver.dump_if_equal(lock_key, lock_token))
+
+    async def __wait_for_other_process(self, key: str) -> Optional[tuple]:
+        previous = await self.__read(key)
+        deadline = time.monotonic() + self.lock_wait_seconds
+        interval = 0.01
+
+        while time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 0.2)
+
+            entry = await self.__read(key)
+            if entry is not None and (previous is None or entry[2] != previous[2]):
+                return entry
+
+        return None
+
+
+class BoundCachedComputation:
+
+    def __init__(self, computation: CachedComputation, instance: Any):
+        """
+        CachedComputation of a method bound to the instance, the instance is passed to the method and to key_builder,
+        but it is not in the default key, so the instances of the class share the cached values
+        """
+        self.computation = computation
+        self.instance = instance
+        functools.update_wrapper(self, computation.func)
+
+    def key(self, *args, **kwargs) -> str:
+        if self.computation.key_builder:
+            return self.computation.key(self.instance, *args, **kwargs)
+
+        return self.computation._hash_key(args, kwargs)
+
+    async def __call__(self, *args, **kwargs):
+        return await self.computation._get(self.key(*args, **kwargs), (self.instance,) + args, kwargs)
+
+    async def invalidate(self, *args, **kwargs) -> None:
+        await self.computation._invalidate(self.key(*args, **kwargs))
+
+
+def cached(
+        cache_driver: Union[CacheDriverABC, AsyncCacheDriverABC],
+        seconds_for_expire: int = 600,
+        stale_seconds: int = 0,
+        early_refresh_beta: float = 1.0,
+        lock_seconds: int = 30,
+        lock_wait_seconds: float = 5,
+        key_builder: Callable[..., str] = None,
+        prefix: str = None
+) -> Callable[[Callable[..., Awaitable[Any]]], CachedComputation]:
+    """
+    Decorator of async functions that cache the result with stampede protection, see CachedComputation
+
+    @cached(RedisCacheDriver(), seconds_for_expire=60, stale_seconds=30)
+    async def sales_summary(store_id: int) -> dict:
+        ...
+
+    await sales_summary.invalidate(store_id=1)
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> CachedComputation:
+        return CachedComputation(
+            func=func,
+            cache_driver=cache_driver,
+            seconds_for_expire=seconds_for_expire,
+            stale_seconds=stale_seconds,
+            early_refresh_beta=early_refresh_beta,
+            lock_seconds=lock_seconds,
+            lock_wait_seconds=lock_wait_seconds,
+            key_builder=key_builder,
+            prefix=prefix
+        )
+
+    return decorator
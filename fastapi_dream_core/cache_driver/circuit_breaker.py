@@ -0,0 +1,51 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30):
+        """
+        Open the circuit after failure_threshold consecutive failures, while open the calls are skipped
+        without waiting for a timeout, after reset_seconds one call is allowed to test if the backend is back
+        :param failure_threshold: Consecutive failures that open the circuit
+        :param reset_seconds: Seconds that the circuit stay open before a new try
+        """
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._failures = 0
+        self._open_until = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._open_until is not None
+
+    def allow(self) -> bool:
+        """
+        Return True when the call can be made, when the circuit is open only one call is allowed
+        by reset_seconds
+        """
+        if self._open_until is None:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            if self._open_until is not None and now >= self._open_until:
+                self._open_until = now + self._reset_seconds
+                return True
+
+        return False
+
+    def record_success(self) -> None:
+        if self._failures or self._open_until is not None:
+            with self._lock:
+                self._failures = 0
+                self._open_until = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+
+            if self._failures >= self._failure_threshold or self._open_until is not None:
+                self._open_until = time.monotonic() + self._reset_seconds
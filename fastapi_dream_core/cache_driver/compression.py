@@ -0,0 +1,40 @@
+import zlib
+from typing import Optional
+
+COMPRESSED_PREFIX = b'\x00zlib:'
+
+
+def to_bytes(value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+
+    if isinstance(value, str):
+        return value.encode()
+
+    return str(value).encode()
+
+
+def compress(value, min_bytes: Optional[int], level: int = 6):
+    """
+    Compress the value with zlib when it has at least min_bytes, the compressed value is prefixed
+    so values stored without compression are still read
+    :param value: The value received in set
+    :param min_bytes: The min size for compress, compression disabled when None
+    :param level: The zlib level
+    :return: The value to store
+    """
+    if min_bytes is None:
+        return value
+
+    data = to_bytes(value)
+    if len(data) < min_bytes:
+        return data
+
+    return COMPRESSED_PREFIX + zlib.compress(data, level)
+
+
+def decompress(value: Optional[bytes]) -> Optional[bytes]:
+    if value is not None and value.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(value[len(COMPRESSED_PREFIX):])
+
+    return value
@@ -1,45 +1,178 @@
-import dataclasses
+import threading
+import time
+import types
+from collections import OrderedDict
 from typing import Union
 
-import datetime
+from fastapi_dream_core.cache_driver.cache_driver_abc import CacheDriverABC
+from fastapi_dream_core.cache_driver.compression import to_bytes
+from fastapi_dream_core.metrics.instrumentation import observe_cache
 
-from fastapi_dream_core.cache_driver import CacheDriverABC
 
-
-@dataclasses.dataclass
 class CacheData:
-    value: bytes
-    seconds_for_expire: int
-    datetime: datetime
+    __slots__ = ('value', 'expire_at')
+
+    def __init__(self, value: bytes, expire_at: float):
+        self.value = value
+        self.expire_at = expire_at
 
 
 class InMemoryCacheDriver(CacheDriverABC):
 
-    _memory: dict = {}
+    def __init__(
+            self,
+            max_entries: int = 10000,
+            max_bytes: int = None,
+            sweep_interval: float = 60,
+            observe: bool = False
+    ):
+        """
+        In process cache with LRU eviction and expiry by monotonic clock, each instance has its own memory
+        :param max_entries: Max of keys kept, the least recently used is evicted first
+        :param max_bytes: Max of bytes of values kept, without limit when None
+        :param sweep_interval: Seconds between sweeps of expired keys, the sweep run inside set
+        :param observe: Observe get and set in the metrics of cache, disabled by default because the histogram
+                cost more than the get itself, the counters of stats() are always kept
+        """
+        if max_entries < 1:
+            raise ValueError(f'max_entries should be greater than 0, received {max_entries}')
+
+        self._memory: 'OrderedDict[str, CacheData]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sweep_interval = sweep_interval
+        self._next_sweep_at = time.monotonic() + sweep_interval
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.observe = observe
+
+        if observe:
+            # Wrapped by instance, so the drivers without observe do not pay even the call of the wrapper
+            self.get = types.MethodType(observe_cache(count_hits=True)(type(self).get), self)
+            self.set = types.MethodType(observe_cache()(type(self).set), self)
 
     def get(self, key: str) -> Union[bytes, None]:
-        cache_data: CacheData = self._memory.get(key)
+        # The reads of dict are atomic, the lock is only taken to remove an expired key
+        cache_data = self._memory.get(key)
 
-        if not cache_data:
+        if cache_data is None:
+            self.misses += 1
             return None
 
-        if ((cache_data.datetime - datetime.datetime.now()).total_seconds() * -1) > cache_data.seconds_for_expire:
-            del self._memory[key]
+        if cache_data.expire_at <= time.monotonic():
+            with self._lock:
+                if self._memory.get(key) is cache_data:
+                    self.__remove(key)
+                    self.expirations += 1
+
+            self.misses += 1
             return None
 
+        try:
+            self._memory.move_to_end(key)
+        except KeyError:
+            pass
+
+        self.hits += 1
         return cache_data.value
 
     def set(self, key: str, value, seconds_for_expire: int = 600) -> None:
-        self._memory.update({
-            key: CacheData(
-                value=str(value).encode(),
-                seconds_for_expire=seconds_for_expire,
-                datetime=datetime.datetime.now()
-            )
-        })
+        value = to_bytes(value)
+        memory = self._memory
+
+        with self._lock:
+            previous = memory.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.value)
+
+            now = time.monotonic()
+            memory[key] = CacheData(value, now + seconds_for_expire)
+            self._bytes += len(value)
+
+            if now >= self._next_sweep_at:
+                self.__sweep()
+
+            if len(memory) > self._max_entries or (self._max_bytes is not None and self._bytes > self._max_bytes):
+                self.__evict()
+
+    def add(self, key: str, value, seconds_for_expire: int = 600) -> bool:
+        with self._lock:
+            cache_data = self._memory.get(key)
+            if cache_data is not None and cache_data.expire_at > time.monotonic():
+                return False
+
+            self.set(key, value, seconds_for_expire=seconds_for_expire)
+            return True
 
     def dump(self, key: str) -> None:
-        if self._memory.get(key):
-            del self._memory[key]
+        with self._lock:
+            if key in self._memory:
+                self.__remove(key)
 
         return None
+
+    def dump_if_equal(self, key: str, value) -> bool:
+        value = to_bytes(value)
+
+        with self._lock:
+            cache_data = self._memory.get(key)
+            if cache_data is None or cache_data.expire_at <= time.monotonic() or cache_data.value != value:
+                return False
+
+            self.__remove(key)
+            return True
+
+    def sweep(self) -> int:
+        """
+        Remove all expired keys, the set calls already sweep every sweep_interval seconds
+        :return: The count of keys removed
+        """
+        with self._lock:
+            return self.__sweep()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        The counters are incremented without the lock, so with threads they can miss some increments
+        """
+        total = self.hits + self.misses
+        return {
+            'size': len(self._memory),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+    def __remove(self, key: str) -> None:
+        cache_data = self._memory.pop(key)
+        self._bytes -= len(cache_data.value)
+
+    def __evict(self) -> None:
+        memory = self._memory
+
+        while len(memory) > self._max_entries or \
+                (self._max_bytes is not None and self._bytes > self._max_bytes and len(memory) > 1):
+            self.__remove(next(iter(memory)))
+            self.evictions += 1
+
+    def __sweep(self) -> int:
+        now = time.monotonic()
+        self._next_sweep_at = now + self._sweep_interval
+        expired = [key for key, cache_data in self._memory.items() if cache_data.expire_at <= now]
+
+        for key in expired:
+            self.__remove(key)
+
+        self.expirations += len(expired)
+        return len(expired)
@@ -0,0 +1,96 @@
+import threading
+from abc import ABC
+from typing import Callable, List, TYPE_CHECKING
+
+from fastapi_dream_core.utils import logger
+
+if TYPE_CHECKING:
+    import redis
+
+
+class InvalidationChannelABC(ABC):
+
+    def publish(self, message: str) -> None:
+        """Not Implemented"""
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """Not Implemented"""
+
+    def close(self) -> None:
+        """Not Implemented"""
+
+
+class LocalInvalidationChannel(InvalidationChannelABC):
+
+    def __init__(self):
+        """
+        Channel in process, every subscriber receive the messages published, used in tests and single worker apps
+        """
+        self._callbacks: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    def publish(self, message: str) -> None:
+        with self._lock:
+            callbacks = list(self._callbacks)
+
+        for callback in callbacks:
+            callback(message)
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def close(self) -> None:
+        with self._lock:
+            self._callbacks.clear()
+
+
+class RedisInvalidationChannel(InvalidationChannelABC):
+
+    def __init__(self, client: 'redis.Redis', channel: str = 'cache-invalidation', sleep_time: float = 0.01):
+        """
+        Channel over Redis pub/sub, the messages are received in a daemon thread
+        :param client: The redis client, example: RedisCacheDriver().redis
+        :param channel: The name of pub/sub channel
+        :param sleep_time: Seconds that the thread wait for messages in each loop
+        """
+        self._client = client
+        self._channel = channel
+        self._sleep_time = sleep_time
+        self._callbacks: List[Callable[[str], None]] = []
+        self._pubsub = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def publish(self, message: str) -> None:
+        try:
+            self._client.publish(self._channel, message)
+        except Exception as exc:
+            logger.error(f'Error in RedisInvalidationChannel - Error in publish message={message} - Exception = {exc}')
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        with self._lock:
+            self._callbacks.append(callback)
+
+            if self._thread is None:
+                self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                self._pubsub.subscribe(**{self._channel: self.__handle})
+                self._thread = self._pubsub.run_in_thread(sleep_time=self._sleep_time, daemon=True)
+
+    def __handle(self, message: dict) -> None:
+        data = message.get('data')
+        data = data.decode() if isinstance(data, bytes) else str(data)
+
+        for callback in list(self._callbacks):
+            try:
+                callback(data)
+            except Exception as exc:
+                logger.error(f'Error in RedisInvalidationChannel - Error in callback - Exception = {exc}')
+
+    def close(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                self._thread.stop()
+                self._pubsub.close()
+                self._thread = None
+                self._pubsub = None
@@ -0,0 +1,135 @@
+import uuid
+from typing import Union, Dict, Iterable, List
+
+from fastapi_dream_core.cache_driver.cache_driver_abc import CacheDriverABC
+from fastapi_dream_core.cache_driver.in_memory_driver import InMemoryCacheDriver
+from fastapi_dream_core.cache_driver.invalidation_channel import InvalidationChannelABC
+from fastapi_dream_core.metrics.instrumentation import observe_cache
+
+
+class NearCacheDriver(CacheDriverABC):
+
+    def __init__(
+            self,
+            l2: CacheDriverABC,
+            l1: InMemoryCacheDriver = None,
+            l1_seconds_for_expire: int = 5,
+            invalidation_channel: InvalidationChannelABC = None
+    ):
+        """
+        Two tiers cache, the reads are served by the in process L1 and only the misses go to L2,
+        set and dump write in L2 and publish the key so the other workers drop it from their L1
+        :param l2: The shared driver, example: RedisCacheDriver()
+        :param l1: The in process driver, by default InMemoryCacheDriver(max_entries=10000)
+        :param l1_seconds_for_expire: Max seconds that a value is kept in L1, bound the staleness without channel
+        :param invalidation_channel: The channel that broadcast the keys changed to the other workers,
+                example: RedisInvalidationChannel(RedisCacheDriver().redis)
+        """
+        self.l1 = l1 if l1 else InMemoryCacheDriver()
+        self.l2 = l2
+        self.l1_seconds_for_expire = l1_seconds_for_expire
+        self.invalidation_channel = invalidation_channel
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self._origin = uuid.uuid4().hex
+
+        if self.invalidation_channel:
+            self.invalidation_channel.subscribe(self.__on_invalidation)
+
+    def __on_invalidation(self, message: str) -> None:
+        origin, _, key = message.partition(':')
+
+        if origin != self._origin:
+            self.l1.dump(key)
+
+    def __publish(self, key: str) -> None:
+        if self.invalidation_channel:
+            self.invalidation_channel.publish(f'{self._origin}:{key}')
+
+    def __l1_seconds(self, seconds_for_expire: int) -> int:
+        return min(self.l1_seconds_for_expire, seconds_for_expire)
+
+    @observe_cache(count_hits=True)
+    def get(self, key: str) -> Union[bytes, None]:
+        value = self.l1.get(key)
+        if value is not None:
+            self.l1_hits += 1
+            return value
+
+        value = self.l2.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.l2_hits += 1
+        self.l1.set(key, value, seconds_for_expire=self.l1_seconds_for_expire)
+        return value
+
+    @observe_cache()
+    def set(self, key: str, value, seconds_for_expire: int = 600) -> None:
+        self.l2.set(key, value, seconds_for_expire=seconds_for_expire)
+        self.l1.set(key, value, seconds_for_expire=self.__l1_seconds(seconds_for_expire))
+        self.__publish(key)
+
+    def add(self, key: str, value, seconds_for_expire: int = 600) -> bool:
+        return self.l2.add(key, value, seconds_for_expire=seconds_for_expire)
+
+    def dump(self, key: str) -> None:
+        self.l2.dump(key)
+        self.l1.dump(key)
+        self.__publish(key)
+
+    def dump_if_equal(self, key: str, value) -> bool:
+        deleted = self.l2.dump_if_equal(key, value)
+        if deleted:
+            self.l1.dump(key)
+            self.__publish(key)
+
+        return deleted
+
+    @observe_cache(count_hits=True)
+    def get_many(self, keys: Iterable[str]) -> List[Union[bytes, None]]:
+        keys = list(keys)
+        values = [self.l1.get(key) for key in keys]
+        missing = [index for index, value in enumerate(values) if value is None]
+        self.l1_hits += len(keys) - len(missing)
+
+        if missing:
+            for index, value in zip(missing, self.l2.get_many([keys[index] for index in missing])):
+                if value is None:
+                    self.misses += 1
+                    continue
+
+                self.l2_hits += 1
+                values[index] = value
+                self.l1.set(keys[index], value, seconds_for_expire=self.l1_seconds_for_expire)
+
+        return values
+
+    @observe_cache()
+    def set_many(self, mapping: Dict[str, object], seconds_for_expire: int = 600) -> None:
+        self.l2.set_many(mapping, seconds_for_expire=seconds_for_expire)
+
+        for key, value in mapping.items():
+            self.l1.set(key, value, seconds_for_expire=self.__l1_seconds(seconds_for_expire))
+            self.__publish(key)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        self.l2.delete_many(keys)
+
+        for key in keys:
+            self.l1.dump(key)
+            self.__publish(key)
+
+    def stats(self) -> dict:
+        total = self.l1_hits + self.l2_hits + self.misses
+        return {
+            'l1_hits': self.l1_hits,
+            'l2_hits': self.l2_hits,
+            'misses': self.misses,
+            'l1_hit_ratio': self.l1_hits / total if total else 0.0,
+            'hit_ratio': (self.l1_hits + self.l2_hits) / total if total else 0.0,
+            'l1': self.l1.stats()
+        }
@@ -1,42 +1,172 @@
 import redis
 
-from typing import Union
+from typing import Union, Dict, Iterable, List
 
 from fastapi_dream_core.cache_driver import CacheDriverABC
+from fastapi_dream_core.cache_driver.circuit_breaker import CircuitBreaker
+from fastapi_dream_core.cache_driver.compression import compress, decompress
 from fastapi_dream_core.environments import CacheEnvironments
 from fastapi_dream_core.utils import logger
+from fastapi_dream_core.metrics.instrumentation import observe_cache
+
+# Delete KEYS[1] only when its value is ARGV[1], atomic because Redis run the script without interleave commands
+COMPARE_AND_DELETE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
 
 
 class RedisCacheDriver(CacheDriverABC):
 
-    def __init__(self):
-        host: str = CacheEnvironments.REDIS_HOST
-        port: int = CacheEnvironments.REDIS_PORT
-        password: str = CacheEnvironments.REDIS_PASSWORD
+    def __init__(
+            self,
+            client: redis.Redis = None,
+            compress_min_bytes: int = None,
+            circuit_breaker: CircuitBreaker = None
+    ):
+        """
+        Cache driver of Redis, the client use a connection pool shared by all calls of the driver
+        :param client: The redis client, by default created from CacheEnvironments, example: fakeredis.FakeRedis()
+        :param compress_min_bytes: Values with at least this size are compressed with zlib, disabled when None
+        :param circuit_breaker: Skip the calls while Redis is failing, by default CircuitBreaker()
+        """
+        if client is None:
+            password: str = CacheEnvironments.REDIS_PASSWORD
+            client = redis.Redis(connection_pool=redis.ConnectionPool(
+                **CacheEnvironments().get_connection_options(),
+                connection_class=redis.SSLConnection if password is not None else redis.Connection
+            ))
+
+        self.redis = client
+        self.compress_min_bytes = compress_min_bytes
+        self.circuit_breaker = circuit_breaker if circuit_breaker else CircuitBreaker()
 
-        is_ssl = password is not None
-        self.redis = redis.Redis(
-            host=host,
-            port=port,
-            password=password,
-            ssl=is_ssl
-        )
+    def __failure(self, message: str, exc: Exception) -> None:
+        self.circuit_breaker.record_failure()
+        logger.error(f'Error in RedisCacheDriver - Error in {message} - Exception = {exc}')
 
+    @observe_cache(count_hits=True)
     def get(self, key: str) -> Union[bytes, None]:
+        if not self.circuit_breaker.allow():
+            return None
+
         try:
-            return self.redis.get(name=key)
+            value = self.redis.get(name=key)
         except Exception as exc:
-            logger.error(f'Error in RedisCacheDriver - Error in get value for key={key} - Exception = {exc}')
+            self.__failure(f'get value for key={key}', exc)
             return None
 
+        self.circuit_breaker.record_success()
+        return decompress(value)
+
+    @observe_cache()
     def set(self, key: str, value, seconds_for_expire: int = 600):
+        if not self.circuit_breaker.allow():
+            return
+
+        try:
+            self.redis.set(name=key, value=compress(value, self.compress_min_bytes), ex=seconds_for_expire)
+        except Exception as exc:
+            self.__failure(f'set key={key}', exc)
+            return
+
+        self.circuit_breaker.record_success()
+
+    @observe_cache()
+    def add(self, key: str, value, seconds_for_expire: int = 600) -> bool:
+        """
+        SET NX, when Redis is failing return True so the caller go on without the lock
+        """
+        if not self.circuit_breaker.allow():
+            return True
+
         try:
-            self.redis.set(name=key, value=value, ex=seconds_for_expire)
+            added = self.redis.set(
+                name=key, value=compress(value, self.compress_min_bytes), ex=seconds_for_expire, nx=True
+            )
         except Exception as exc:
-            logger.error(f'Error in RedisCacheDriver - Error in set key={key} - Exception = {exc}')
+            self.__failure(f'add key={key}', exc)
+            return True
+
+        self.circuit_breaker.record_success()
+        return bool(added)
 
+    @observe_cache()
     def dump(self, key: str):
+        if not self.circuit_breaker.allow():
+            return
+
         try:
             self.redis.delete(key)
         except Exception as exc:
-            logger.error(f'Error in RedisCacheDriver - Error in dump value for key={key} - Exception = {exc}')
+            self.__failure(f'dump value for key={key}', exc)
+            return
+
+        self.circuit_breaker.record_success()
+
+    @observe_cache()
+    def dump_if_equal(self, key: str, value) -> bool:
+        """
+        GET and DEL in one Lua script, so a lock that expired and was taken by other worker is not deleted
+        """
+        if not self.circuit_breaker.allow():
+            return False
+
+        try:
+            deleted = self.redis.eval(
+                COMPARE_AND_DELETE_SCRIPT, 1, key, compress(value, self.compress_min_bytes)
+            )
+        except Exception as exc:
+            self.__failure(f'dump_if_equal for key={key}', exc)
+            return False
+
+        self.circuit_breaker.record_success()
+        return bool(deleted)
+
+    @observe_cache(count_hits=True)
+    def get_many(self, keys: Iterable[str]) -> List[Union[bytes, None]]:
+        keys = list(keys)
+        if not keys or not self.circuit_breaker.allow():
+            return [None] * len(keys)
+
+        try:
+            values = self.redis.mget(keys)
+        except Exception as exc:
+            self.__failure(f'get_many values for {len(keys)} keys', exc)
+            return [None] * len(keys)
+
+        self.circuit_breaker.record_success()
+        return [decompress(value) for value in values]
+
+    @observe_cache()
+    def set_many(self, mapping: Dict[str, object], seconds_for_expire: int = 600) -> None:
+        if not mapping or not self.circuit_breaker.allow():
+            return
+
+        try:
+            with self.redis.pipeline(transaction=False) as pipeline:
+                for key, value in mapping.items():
+                    pipeline.set(name=key, value=compress(value, self.compress_min_bytes), ex=seconds_for_expire)
+
+                pipeline.execute()
+        except Exception as exc:
+            self.__failure(f'set_many for {len(mapping)} keys', exc)
+            return
+
+        self.circuit_breaker.record_success()
+
+    @observe_cache()
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys or not self.circuit_breaker.allow():
+            return
+
+        try:
+            self.redis.delete(*keys)
+        except Exception as exc:
+            self.__failure(f'delete_many for {len(keys)} keys', exc)
+            return
+
+        self.circuit_breaker.record_success()
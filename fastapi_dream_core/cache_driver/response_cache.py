@@ -0,0 +1,266 @@
+import functools
+import hashlib
+import inspect
+from typing import Any, Callable, Iterable, List, Optional, Union
+
+from fastapi import Request
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import serialize_response
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+
+from fastapi_dream_core.cache_driver import serializer
+from fastapi_dream_core.cache_driver.async_cache_driver_abc import AsyncCacheDriverABC
+from fastapi_dream_core.cache_driver.cache_driver_abc import CacheDriverABC
+from fastapi_dream_core.cache_driver.cache_generation import AsyncCacheGeneration, CacheGeneration
+from fastapi_dream_core.utils.json_response import FastJSONResponse
+
+REQUEST_PARAMETER = 'response_cache_request'
+RESPONSE_PARAMETER = 'response_cache_response'
+
+# Headers that are not stored, the length is computed again and the cache headers are set by ResponseCache
+NOT_STORED_HEADERS = ('content-length', 'etag', 'cache-control', 'vary')
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == '*':
+        return True
+
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return etag in tags or f'W/{etag}' in tags
+
+
+async def _run(func: Callable, *args, **kwargs) -> Any:
+    """
+    Await the methods of async drivers and run the methods of sync drivers in the thread pool,
+    so a remote cache never block the event loop
+    """
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+class ResponseCache:
+
+    def __init__(
+            self,
+            cache_driver: Union[CacheDriverABC, AsyncCacheDriverABC],
+            generation: Union[CacheGeneration, AsyncCacheGeneration] = None,
+            prefix: str = 'response'
+    ):
+        """
+        Cache of the serialized responses of GET routes with ETag, the tags of a response are part of the key
+        by generation, so invalidate a tag make all responses with it miss
+        :param cache_driver: The driver that store the responses, shared by all workers when is a remote cache,
+                an AsyncCacheDriverABC is awaited and a CacheDriverABC run in the thread pool
+        :param generation: The generation counters of tags, by default in the same cache_driver
+        :param prefix: The prefix of keys
+        """
+        self.cache_driver = cache_driver
+        if generation is None:
+            is_async = isinstance(cache_driver, AsyncCacheDriverABC)
+            generation = AsyncCacheGeneration(cache_driver) if is_async else CacheGeneration(cache_driver)
+
+        self.generation = generation
+        self.prefix = prefix
+
+    def __tags(self, tags: Iterable[str], request: Request) -> List[str]:
+        return [tag.format(**request.path_params) for tag in tags]
+
+    async def key(self, request: Request, tags: Iterable[str] = (), vary: Iterable[str] = ()) -> str:
+        """
+        The key of response by path, query params, the values of headers in vary and the generations of tags,
+        the generations are read with one get_many
+        """
+        query = sorted(request.query_params.multi_items())
+        headers = [request.headers.get(header, '') for header in vary]
+        namespaces = [f'{self.prefix}:{tag}' for tag in self.__tags(tags, request)]
+        generations = await _run(self.generation.get_many, namespaces) if namespaces else []
+
+        digest = hashlib.sha1(repr((request.url.path, query, headers, generations)).encode()).hexdigest()
+        return f'{self.prefix}:{digest}'
+
+    async def invalidate(self, *tags: str) -> None:
+        """
+        Invalidate the responses with these tags, example: await response_cache.invalidate('users', 'user:1')
+        """
+        for tag in tags:
+            await _run(self.generation.bump, f'{self.prefix}:{tag}')
+
+    async def __read(self, key: str) -> Optional[dict]:
+        data = await _run(self.cache_driver.get, key)
+        if data is None:
+            return None
+
+        try:
+            return serializer.loads(data)
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    async def __serialize(request: Request, result: Any, sub_response: Response, is_coroutine: bool) -> Response:
+        """
+        Build the response like FastAPI: the result is validated and filtered with the response_model of route,
+        so the fields that are not in the response_model are never stored, and the headers and status code set
+        in the Response parameter are kept
+        """
+        route = request.scope.get('route')
+        if route is None:
+            response = FastJSONResponse(content=result)
+        else:
+            content = await serialize_response(
+                field=route.response_field,
+                response_content=result,
+                include=route.response_model_include,
+                exclude=route.response_model_exclude,
+                by_alias=route.response_model_by_alias,
+                exclude_unset=route.response_model_exclude_unset,
+                exclude_defaults=route.response_model_exclude_defaults,
+                exclude_none=route.response_model_exclude_none,
+                is_coroutine=is_coroutine
+            )
+            response_class = route.response_class
+            if isinstance(response_class, DefaultPlaceholder):
+                response_class = response_class.value
+
+            response = response_class(content, status_code=route.status_code or 200)
+
+        response.headers.raw.extend(sub_response.headers.raw)
+        if sub_response.status_code:
+            response.status_code = sub_response.status_code
+
+        return response
+
+    @staticmethod
+    def __entry(response: Response) -> Optional[dict]:
+        """
+        The response to store, None when it is not cacheable: status not 200, without body (streaming)
+        or with cookies, that are of one client
+        """
+        body = getattr(response, 'body', None)
+        if response.status_code != 200 or body is None or 'set-cookie' in response.headers:
+            return None
+
+        return {
+            'etag': f'"{hashlib.sha1(body).hexdigest()}"',
+            'headers': [
+                [name, value] for name, value in response.headers.items() if name not in NOT_STORED_HEADERS
+            ],
+            'body': body
+        }
+
+    @staticmethod
+    def __not_modified(entry: dict, request: Request, headers: dict, background=None) -> Optional[Response]:
+        if not _etag_matches(request.headers.get('if-none-match'), entry['etag']):
+            return None
+
+        return Response(status_code=304, headers={**headers, 'ETag': entry['etag']}, background=background)
+
+    @staticmethod
+    def __response(entry: dict, headers: dict) -> Response:
+        response = Response(content=entry['body'])
+        del response.headers['content-type']
+
+        for name, value in entry['headers']:
+            response.headers.append(name, value)
+
+        response.headers.update({**headers, 'ETag': entry['etag']})
+        return response
+
+    def cached(
+            self,
+            seconds_for_expire: int = 60,
+            tags: Iterable[str] = (),
+            vary: Iterable[str] = (),
+            cache_control: str = None
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Decorator of GET routes, the response is stored serialized and a request with If-None-Match of
+        the ETag stored is answered with 304 without call the route. The result of route is validated and
+        serialized with the response_model of route like FastAPI do, the headers and the background tasks of
+        route are kept, and only responses 200 without cookies are stored
+
+            @router.get('/users/{user_id}', response_model=UserSchema)
+            @response_cache.cached(seconds_for_expire=60, tags=['users', 'user:{user_id}'], vary=['authorization'])
+            async def get_user(user_id: int):
+                ...
+
+            await response_cache.invalidate('user:1')
+
+        :param seconds_for_expire: Seconds that the response is stored
+        :param tags: The tags of response, formatted with the path params
+        :param vary: The headers that are part of the key, example: ['authorization', 'accept-language']
+        :param cache_control: The Cache-Control header, by default max-age=seconds_for_expire,
+                use private when the response depends on the user
+        """
+        tags = tuple(tags)
+        vary = tuple(header.lower() for header in vary)
+        headers = {'Cache-Control': cache_control if cache_control else f'max-age={seconds_for_expire}'}
+        if vary:
+            headers['Vary'] = ', '.join(vary)
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            signature = inspect.signature(func)
+            is_coroutine = inspect.iscoroutinefunction(func)
+            request_parameter = next(
+                (name for name, parameter in signature.parameters.items() if parameter.annotation is Request), None
+            )
+            response_parameter = next(
+                (name for name, parameter in signature.parameters.items() if parameter.annotation is Response), None
+            )
+
+            async def call(*args, **kwargs):
+                if is_coroutine:
+                    return await func(*args, **kwargs)
+
+                return await run_in_threadpool(func, *args, **kwargs)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request = kwargs[request_parameter] if request_parameter else kwargs.pop(REQUEST_PARAMETER)
+                sub_response = kwargs[response_parameter] if response_parameter else kwargs.pop(RESPONSE_PARAMETER)
+
+                if request.method != 'GET':
+                    return await call(*args, **kwargs)
+
+                key = await self.key(request, tags=tags, vary=vary)
+                entry = await self.__read(key)
+                if entry is not None:
+                    return self.__not_modified(entry, request, headers) or self.__response(entry, headers)
+
+                result = await call(*args, **kwargs)
+                response = result if isinstance(result, Response) else \
+                    await self.__serialize(request, result, sub_response, is_coroutine)
+
+                entry = self.__entry(response)
+                if entry is None:
+                    return response
+
+                await _run(self.cache_driver.set, key, serializer.dumps(entry), seconds_for_expire=seconds_for_expire)
+
+                # The response of route is returned, so its background tasks run also when the answer is 304
+                not_modified = self.__not_modified(entry, request, headers, background=response.background)
+                if not_modified is not None:
+                    return not_modified
+
+                response.headers.update({**headers, 'ETag': entry['etag']})
+                return response
+
+            parameters = list(signature.parameters.values())
+            if request_parameter is None:
+                parameters.append(
+                    inspect.Parameter(REQUEST_PARAMETER, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+                )
+            if response_parameter is None:
+                parameters.append(
+                    inspect.Parameter(RESPONSE_PARAMETER, inspect.Parameter.KEYWORD_ONLY, annotation=Response)
+                )
+            wrapper.__signature__ = signature.replace(parameters=parameters)
+
+            return wrapper
+
+        return decorator
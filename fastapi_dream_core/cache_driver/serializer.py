@@ -0,0 +1,61 @@
+import base64
+import datetime
+import decimal
+import enum
+import json
+import uuid
+from typing import Any, Callable, Dict, Tuple, Type
+
+TYPE_KEY = '__cache_type__'
+VALUE_KEY = 'value'
+
+# name: (type, encode, decode), datetime is before date because datetime is a subclass of date
+TYPES: Dict[str, Tuple[Type, Callable[[Any], Any], Callable[[Any], Any]]] = {
+    'datetime': (datetime.datetime, datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+    'date': (datetime.date, datetime.date.isoformat, datetime.date.fromisoformat),
+    'time': (datetime.time, datetime.time.isoformat, datetime.time.fromisoformat),
+    'timedelta': (
+        datetime.timedelta, datetime.timedelta.total_seconds, lambda value: datetime.timedelta(seconds=value)
+    ),
+    'decimal': (decimal.Decimal, str, decimal.Decimal),
+    'uuid': (uuid.UUID, str, uuid.UUID),
+    'bytes': (bytes, lambda value: base64.b64encode(value).decode(), base64.b64decode),
+}
+
+
+class _Encoder(json.JSONEncoder):
+
+    def default(self, value: Any) -> Any:
+        if isinstance(value, enum.Enum):
+            return value.value
+
+        for name, (value_type, encode, _) in TYPES.items():
+            if isinstance(value, value_type):
+                return {TYPE_KEY: name, VALUE_KEY: encode(value)}
+
+        if isinstance(value, (set, frozenset)):
+            return list(value)
+
+        return super(_Encoder, self).default(value)
+
+
+def _decode_object(data: dict) -> Any:
+    name = data.get(TYPE_KEY)
+    if name is None or name not in TYPES or len(data) != 2:
+        return data
+
+    return TYPES[name][2](data[VALUE_KEY])
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize values of columns to JSON, the types that JSON do not have (datetime, Decimal, UUID, bytes...)
+    are tagged so they are restored by loads. Unlike pickle, loads only build these types, so a value written
+    in a shared cache by someone else can not execute code in the application.
+    The tuples are restored as lists and the Enums as their values
+    """
+    return json.dumps(value, cls=_Encoder, separators=(',', ':')).encode()
+
+
+def loads(data: bytes) -> Any:
+    return json.loads(data, object_hook=_decode_object)
@@ -1,7 +1,8 @@
-from typing import TypeVar
+from typing import TypeVar, List, Type, Union
 
 from pydantic import BaseModel
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+Projection = Union[List[str], Type[BaseModel], None]
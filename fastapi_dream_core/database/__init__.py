@@ -1 +1,13 @@
-from .database_sqlmodel import DatabaseSQLModel
+from typing import TYPE_CHECKING
+
+from fastapi_dream_core.lazy_imports import lazy_attributes
+
+# Imported on first access, so sqlmodel is not imported by the modules that only use the helpers of package
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'DatabaseSQLModel': '.database_sqlmodel',
+    'AsyncDatabaseSQLModel': '.async_database_sqlmodel',
+})
+
+if TYPE_CHECKING:
+    from .database_sqlmodel import DatabaseSQLModel
+    from .async_database_sqlmodel import AsyncDatabaseSQLModel
@@ -0,0 +1,57 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from fastapi_dream_core.utils import logger
+
+
+def _postgresql_key(name: str) -> int:
+    # pg advisory locks are keyed by a bigint
+    return int(hashlib.sha1(name.encode()).hexdigest()[:15], 16)
+
+
+@contextmanager
+def advisory_lock(engine: Engine, name: str, timeout_seconds: float = 600) -> Iterator[bool]:
+    """
+    Lock of database shared by all nodes, held by a dedicated connection while the context is open,
+    MySQL use GET_LOCK and PostgreSQL pg_try_advisory_lock, the other dialects are not locked
+    :param engine: A sync engine
+    :param name: The name of lock
+    :param timeout_seconds: Max seconds waiting the lock
+    :return: True when the lock was acquired
+    """
+    dialect = engine.dialect.name
+
+    if dialect not in ('mysql', 'postgresql'):
+        logger.warning(f'advisory_lock is not supported by {dialect}, running without lock')
+        yield True
+        return
+
+    with engine.connect() as connection:
+        if dialect == 'mysql':
+            acquired = connection.execute(
+                text('SELECT GET_LOCK(:name, :timeout)'), {'name': name, 'timeout': int(timeout_seconds)}
+            ).scalar() == 1
+        else:
+            key = _postgresql_key(name)
+            deadline = time.monotonic() + timeout_seconds
+            acquired = False
+
+            while True:
+                acquired = connection.execute(text('SELECT pg_try_advisory_lock(:key)'), {'key': key}).scalar()
+                if acquired or time.monotonic() >= deadline:
+                    break
+
+                time.sleep(1)
+
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired and dialect == 'mysql':
+                connection.execute(text('SELECT RELEASE_LOCK(:name)'), {'name': name})
+            elif acquired:
+                connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': _postgresql_key(name)})
@@ -1,31 +1,147 @@
+import functools
+import inspect
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, List, Optional
 
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import create_engine, Session
 
 from fastapi_dream_core.application_dependencies.application_dependencies_abc import ApplicationDependenciesABC
+from fastapi_dream_core.database.pool_metrics import PoolMetrics
+from fastapi_dream_core.database.replica_router import Replica, ReplicaRouter, ReplicaStrategy
+from fastapi_dream_core.database.unit_of_work import begin_unit_of_work, end_unit_of_work
 from fastapi_dream_core.utils import logger
 
 
+def engine_options(
+        pool_size: int = None,
+        max_overflow: int = None,
+        pool_recycle: int = None,
+        pool_pre_ping: bool = False,
+        pool_timeout: float = None,
+        query_cache_size: int = None
+) -> dict:
+    """
+    Create the kwargs of create_engine with only the options informed, so the defaults of the pool
+    used by the dialect are kept, example: sqlite do not accept pool_size
+    """
+    options = {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_recycle': pool_recycle,
+        'pool_timeout': pool_timeout,
+        'query_cache_size': query_cache_size
+    }
+    options = {name: value for name, value in options.items() if value is not None}
+
+    if pool_pre_ping:
+        options['pool_pre_ping'] = True
+
+    return options
+
+
 class DatabaseSQLModel(ApplicationDependenciesABC):
 
-    def __init__(self, db_url: str, echo_queries: bool = False) -> None:
-        self._engine = create_engine(db_url, echo=echo_queries)
+    def __init__(
+            self,
+            db_url: str,
+            echo_queries: bool = False,
+            pool_size: int = None,
+            max_overflow: int = None,
+            pool_recycle: int = None,
+            pool_pre_ping: bool = False,
+            pool_timeout: float = None,
+            query_cache_size: int = None,
+            replica_urls: List[str] = None,
+            replica_strategy: ReplicaStrategy = ReplicaStrategy.ROUND_ROBIN,
+            replica_retry_seconds: float = 30
+    ) -> None:
+        """
+        :param db_url: The url of database
+        :param echo_queries: When True the engine log all queries
+        :param pool_size: The number of connections kept open in the pool
+        :param max_overflow: The number of connections allowed beyond pool_size
+        :param pool_recycle: Seconds after which a connection is recycled
+        :param pool_pre_ping: When True test the connection before each checkout
+        :param pool_timeout: Seconds waiting for a connection before raise an error
+        :param query_cache_size: The size of the cache of compiled statements
+        :param replica_urls: The urls of read replicas used by read_session, same pool options of primary
+        :param replica_strategy: ROUND_ROBIN or LEAST_BUSY
+        :param replica_retry_seconds: Seconds that a failed replica is out of rotation
+        """
+        options = engine_options(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            pool_timeout=pool_timeout,
+            query_cache_size=query_cache_size
+        )
+
+        self._engine = create_engine(db_url, echo=echo_queries, **options)
+        self.pool_metrics = PoolMetrics(self._engine)
+
+        replicas = []
+        for replica_url in (replica_urls if replica_urls else []):
+            engine = create_engine(replica_url, echo=echo_queries, **options)
+            replicas.append(Replica(engine=engine, sync_engine=engine))
+
+        self._replica_router = ReplicaRouter(replicas=replicas, strategy=replica_strategy)
+        self._replica_retry_seconds = replica_retry_seconds
+        self._read_your_writes: ContextVar[bool] = ContextVar(f'read_your_writes_{id(self)}', default=False)
+        self._unit_of_work: ContextVar[Optional[Session]] = ContextVar(f'unit_of_work_{id(self)}', default=None)
 
     def readiness(self) -> bool:
-        with Session(self._engine) as session:
-            try:
-                database_status = session.connection().connection.is_valid
-                logger.debug(f"DatabaseSQLModel.readiness = {database_status}")
-                return True
+        replicas = self._replica_router.replicas
+        if replicas:
+            # The replicas are probed concurrently, so the readiness wait the slowest and not the sum
+            with ThreadPoolExecutor(max_workers=len(replicas), thread_name_prefix='replica-probe') as executor:
+                list(executor.map(self.__probe_replica, replicas))
 
-            except Exception:
-                traceback.print_exc()
-                return False
+        try:
+            with self._engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+
+            logger.debug("DatabaseSQLModel.readiness = True")
+            return True
+
+        except Exception:
+            traceback.print_exc()
+            return False
+
+    def details(self) -> Optional[dict]:
+        details = {'pool': self.pool_metrics.snapshot()}
+
+        if self._replica_router.replicas:
+            details['replicas'] = [replica.details() for replica in self._replica_router.replicas]
+
+        return details
+
+    def __probe_replica(self, replica: Replica) -> None:
+        try:
+            with replica.engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+
+            replica.mark_healthy()
+
+        except SQLAlchemyError:
+            logger.warning(f"DatabaseSQLModel replica {replica.url} is not ready")
+            replica.mark_unhealthy(self._replica_retry_seconds)
+
+    @staticmethod
+    def __checkout(session: Session, pool_metrics: PoolMetrics) -> None:
+        start_time = time.perf_counter()
+        session.connection()
+        pool_metrics.observe_checkout(time.perf_counter() - start_time)
 
     @contextmanager
-    def session(self) -> Session:
-        with Session(self._engine) as session:
+    def __session_scope(self, session: Session) -> Session:
+        with session:
             try:
                 yield session
             except Exception:
@@ -35,5 +151,110 @@ class DatabaseSQLModel(ApplicationDependenciesABC):
             finally:
                 session.close()
 
+    @contextmanager
+    def session(self) -> Session:
+        shared_session = self._unit_of_work.get()
+        if shared_session is not None:
+            yield shared_session
+            return
+
+        with self.__session_scope(Session(self._engine)) as session:
+            self.__checkout(session, self.pool_metrics)
+            yield session
+
+    @contextmanager
+    def read_session(self) -> Session:
+        """
+        Session for reads, opened in a replica when there is replicas and the context is not in read_your_writes,
+        a replica that fail in connect is taken out of rotation and the next one is used, the primary is the last
+        """
+        if self._read_your_writes.get() or self._unit_of_work.get() is not None:
+            with self.session() as session:
+                yield session
+            return
+
+        for replica in self._replica_router.candidates():
+            session = Session(replica.engine)
+
+            try:
+                self.__checkout(session, replica.pool_metrics)
+            except SQLAlchemyError:
+                session.close()
+                logger.warning(f"DatabaseSQLModel replica {replica.url} failed, removed from rotation")
+                replica.mark_unhealthy(self._replica_retry_seconds)
+                continue
+
+            replica.mark_healthy()
+            with self.__session_scope(session):
+                yield session
+            return
+
+        with self.session() as session:
+            yield session
+
+    @contextmanager
+    def read_your_writes(self):
+        """
+        Inside this context read_session use the primary, for reads that must see the writes just made
+        """
+        token = self._read_your_writes.set(True)
+        try:
+            yield
+        finally:
+            self._read_your_writes.reset(token)
+
+    @contextmanager
+    def unit_of_work(self) -> Session:
+        """
+        Inside this context session and read_session return the same session, so the repositories share one
+        connection and one transaction, their commits become flushes and the commit is made once at the end,
+        a nested unit_of_work join the current one
+
+            with database.unit_of_work():
+                user = await user_repository.create(user_in)
+                await account_repository.create(AccountCreate(user_id=user.id))
+        """
+        shared_session = self._unit_of_work.get()
+        if shared_session is not None:
+            yield shared_session
+            return
+
+        with self.__session_scope(Session(self._engine, expire_on_commit=False)) as session:
+            active_token = begin_unit_of_work(session)
+            token = self._unit_of_work.set(session)
+            try:
+                self.__checkout(session, self.pool_metrics)
+                yield session
+                session.commit()
+            finally:
+                self._unit_of_work.reset(token)
+                end_unit_of_work(session, active_token)
+
+    def transactional(self, endpoint: Callable) -> Callable:
+        """
+        Decorator of endpoints that run the endpoint in a unit_of_work, the commit is made before FastAPI send
+        the response, so when the commit fail the client receive the error and not a success.
+        A dependency with yield do not work here, in FastAPI its code after yield run after the response is sent
+
+            @router.post('/orders')
+            @database.transactional
+            async def create_order(order_in: OrderCreate):
+                ...
+        """
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def async_wrapper(*args, **kwargs):
+                with self.unit_of_work():
+                    return await endpoint(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            with self.unit_of_work():
+                return endpoint(*args, **kwargs)
+
+        return wrapper
+
     def __str__(self):
         return "DatabaseSQLModel"
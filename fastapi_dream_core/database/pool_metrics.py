@@ -0,0 +1,61 @@
+import bisect
+from typing import Any, Dict, Optional
+
+from sqlalchemy.engine import Engine
+
+
+class PoolMetrics:
+    LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, engine: Engine):
+        """
+        Live state of the pool of engine and the histogram of checkout latency
+        :param engine: The sync engine, for async engines use AsyncEngine.sync_engine
+        """
+        self._engine = engine
+        self.checkouts = 0
+        self.checkout_wait_seconds = 0.0
+        self.checkout_max_seconds = 0.0
+        self._latency_buckets = [0] * (len(self.LATENCY_BUCKETS) + 1)
+
+    def observe_checkout(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.checkout_wait_seconds += seconds
+        self._latency_buckets[bisect.bisect_left(self.LATENCY_BUCKETS, seconds)] += 1
+
+        if seconds > self.checkout_max_seconds:
+            self.checkout_max_seconds = seconds
+
+    def latency_histogram(self) -> Dict[str, int]:
+        """
+        Cumulative count of checkouts by upper bound in seconds
+        :return: A dict like {'0.001': 10, '0.005': 12, ..., '+Inf': 15}
+        """
+        histogram = {}
+        cumulative = 0
+
+        for bound, count in zip(self.LATENCY_BUCKETS + (float('inf'),), self._latency_buckets):
+            cumulative += count
+            histogram['+Inf' if bound == float('inf') else str(bound)] = cumulative
+
+        return histogram
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self._engine.pool
+
+        return {
+            'pool': type(pool).__name__,
+            'size': self.__pool_value(pool, 'size'),
+            'checked_in': self.__pool_value(pool, 'checkedin'),
+            'checked_out': self.__pool_value(pool, 'checkedout'),
+            'overflow': self.__pool_value(pool, 'overflow'),
+            'checkouts': self.checkouts,
+            'checkout_wait_seconds': round(self.checkout_wait_seconds, 6),
+            'checkout_max_seconds': round(self.checkout_max_seconds, 6),
+            'checkout_latency_histogram': self.latency_histogram()
+        }
+
+    @staticmethod
+    def __pool_value(pool, name: str) -> Optional[int]:
+        method = getattr(pool, name, None)
+        return method() if callable(method) else None
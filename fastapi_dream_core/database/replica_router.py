@@ -0,0 +1,77 @@
+import itertools
+import time
+from enum import Enum
+from typing import Any, Dict, List
+
+from sqlalchemy.engine import Engine
+
+from fastapi_dream_core.database.pool_metrics import PoolMetrics
+
+
+class ReplicaStrategy(str, Enum):
+    ROUND_ROBIN = 'round_robin'
+    LEAST_BUSY = 'least_busy'
+
+
+class Replica:
+
+    def __init__(self, engine: Any, sync_engine: Engine):
+        """
+        :param engine: The engine used to open sessions, Engine or AsyncEngine
+        :param sync_engine: The sync engine, used by pool statistics
+        """
+        self.engine = engine
+        self.pool_metrics = PoolMetrics(sync_engine)
+        self.healthy = True
+        self.retry_at = 0.0
+        self._sync_engine = sync_engine
+
+    @property
+    def url(self) -> str:
+        # repr of URL hide the password
+        return repr(self._sync_engine.url)
+
+    def busy(self) -> int:
+        checked_out = getattr(self._sync_engine.pool, 'checkedout', None)
+        return checked_out() if callable(checked_out) else 0
+
+    def mark_unhealthy(self, retry_seconds: float) -> None:
+        self.healthy = False
+        self.retry_at = time.monotonic() + retry_seconds
+
+    def mark_healthy(self) -> None:
+        self.healthy = True
+        self.retry_at = 0.0
+
+    def details(self) -> Dict[str, Any]:
+        return {'url': self.url, 'healthy': self.healthy, 'pool': self.pool_metrics.snapshot()}
+
+
+class ReplicaRouter:
+
+    def __init__(self, replicas: List[Replica], strategy: ReplicaStrategy = ReplicaStrategy.ROUND_ROBIN):
+        """
+        Choose the replicas for read sessions, a replica marked unhealthy is out of rotation until retry_at
+        and then is tried again after the healthy ones
+        :param replicas: The replicas
+        :param strategy: ROUND_ROBIN or LEAST_BUSY (less connections checked out)
+        """
+        self.replicas = replicas
+        self.strategy = strategy
+        self._counter = itertools.count()
+
+    def candidates(self) -> List[Replica]:
+        if not self.replicas:
+            return []
+
+        if self.strategy == ReplicaStrategy.LEAST_BUSY:
+            ordered = sorted(self.replicas, key=lambda replica: replica.busy())
+        else:
+            start = next(self._counter) % len(self.replicas)
+            ordered = self.replicas[start:] + self.replicas[:start]
+
+        now = time.monotonic()
+        healthy = [replica for replica in ordered if replica.healthy]
+        retry = [replica for replica in ordered if not replica.healthy and replica.retry_at <= now]
+
+        return healthy + retry
@@ -0,0 +1,63 @@
+import inspect
+from contextvars import ContextVar, Token
+from typing import Awaitable, Callable, List, Union
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+UNIT_OF_WORK = 'unit_of_work'
+AFTER_UNIT_OF_WORK = 'after_unit_of_work'
+
+_active: ContextVar[bool] = ContextVar('unit_of_work_active', default=False)
+
+
+def _info(session: Union[Session, AsyncSession]) -> dict:
+    return getattr(session, 'sync_session', session).info
+
+
+def begin_unit_of_work(session: Union[Session, AsyncSession]) -> Token:
+    _info(session)[UNIT_OF_WORK] = True
+    return _active.set(True)
+
+
+def end_unit_of_work(session: Union[Session, AsyncSession], token: Token) -> List[Awaitable]:
+    """
+    Called after the commit or the rollback of the unit of work, run the callbacks registered by after_unit_of_work
+    :return: The awaitables returned by async callbacks, awaited by the async unit of work
+    """
+    _active.reset(token)
+
+    pending = []
+    for callback in _info(session).pop(AFTER_UNIT_OF_WORK, []):
+        result = callback()
+        if inspect.isawaitable(result):
+            pending.append(result)
+
+    return pending
+
+
+def unit_of_work_active() -> bool:
+    """
+    True inside a unit of work of any database, the repositories skip the query cache because the reads
+    can see writes not committed yet
+    """
+    return _active.get()
+
+
+def in_unit_of_work(session: Union[Session, AsyncSession]) -> bool:
+    """
+    True when the session is shared by a unit of work, so the commit is made by the unit of work at the end
+    """
+    return _info(session).get(UNIT_OF_WORK, False)
+
+
+def after_unit_of_work(session: Union[Session, AsyncSession], callback: Callable[[], Union[None, Awaitable]]) -> None:
+    """
+    Register a callback called once when the unit of work of session end, after the commit or the rollback,
+    example: the invalidation of the query cache of repository, an async callback is awaited only by the async
+    unit of work
+    """
+    callbacks = _info(session).setdefault(AFTER_UNIT_OF_WORK, [])
+    if callback not in callbacks:
+        callbacks.append(callback)
+
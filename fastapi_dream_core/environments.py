@@ -31,6 +31,23 @@ class CacheEnvironments:
     REDIS_HOST = os.getenv('REDIS_HOST', default='localhost')
     REDIS_PORT = os.getenv('REDIS_PORT', default=6379)
     REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', default=None)
+    REDIS_MAX_CONNECTIONS = os.getenv('REDIS_MAX_CONNECTIONS', default=None)
+    REDIS_SOCKET_TIMEOUT = os.getenv('REDIS_SOCKET_TIMEOUT', default=None)
+
+    def get_connection_options(self) -> dict:
+        """
+        Return the kwargs of the connection pool for the redis drivers
+        """
+        socket_timeout = float(self.REDIS_SOCKET_TIMEOUT) if self.REDIS_SOCKET_TIMEOUT else None
+
+        return {
+            'host': self.REDIS_HOST,
+            'port': int(self.REDIS_PORT),
+            'password': self.REDIS_PASSWORD,
+            'max_connections': int(self.REDIS_MAX_CONNECTIONS) if self.REDIS_MAX_CONNECTIONS else None,
+            'socket_timeout': socket_timeout,
+            'socket_connect_timeout': socket_timeout
+        }
 
 
 class DatabaseEnvironments:
@@ -42,9 +59,30 @@ class DatabaseEnvironments:
     DB_NAME = os.getenv('DB_NAME', default='')
     DB_PORT = os.getenv('DB_PORT', default=3306)
 
+    DB_POOL_SIZE = os.getenv('DB_POOL_SIZE', default=None)
+    DB_MAX_OVERFLOW = os.getenv('DB_MAX_OVERFLOW', default=None)
+    DB_POOL_RECYCLE = os.getenv('DB_POOL_RECYCLE', default=None)
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', default='false')
+    DB_POOL_TIMEOUT = os.getenv('DB_POOL_TIMEOUT', default=None)
+    DB_QUERY_CACHE_SIZE = os.getenv('DB_QUERY_CACHE_SIZE', default=None)
+
     def get_db_url(self):
         if self.DB_URL:
             return self.DB_URL
 
         return f"mysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    def get_pool_options(self) -> dict:
+        """
+        Return the kwargs of pool for DatabaseSQLModel, only the variables informed
+        """
+        options = {
+            'pool_size': int(self.DB_POOL_SIZE) if self.DB_POOL_SIZE else None,
+            'max_overflow': int(self.DB_MAX_OVERFLOW) if self.DB_MAX_OVERFLOW else None,
+            'pool_recycle': int(self.DB_POOL_RECYCLE) if self.DB_POOL_RECYCLE else None,
+            'pool_pre_ping': str(self.DB_POOL_PRE_PING).lower() in ('1', 'true', 'yes'),
+            'pool_timeout': float(self.DB_POOL_TIMEOUT) if self.DB_POOL_TIMEOUT else None,
+            'query_cache_size': int(self.DB_QUERY_CACHE_SIZE) if self.DB_QUERY_CACHE_SIZE else None,
+        }
+
+        return {name: value for name, value in options.items() if value is not None}
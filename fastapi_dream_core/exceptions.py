@@ -13,5 +13,23 @@ class EntityNotFound(HTTPException):
         )
 
 
+class InvalidCursor(HTTPException):
+
+    def __init__(self):
+        super(InvalidCursor, self).__init__(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail='Invalid cursor!'
+        )
+
+
+class InvalidFilter(HTTPException):
+
+    def __init__(self, detail: str = 'Invalid filter!'):
+        super(InvalidFilter, self).__init__(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=detail
+        )
+
+
 class InternalErrorSchema(BaseModel):
     detail: str = "Internal error."
@@ -1,33 +1,51 @@
-from typing import List
+from typing import List, Type, TYPE_CHECKING
 
 from fastapi import FastAPI, APIRouter
+from fastapi.routing import APIRoute
+from fastapi.responses import JSONResponse, Response
 from starlette.middleware.cors import CORSMiddleware
-from dependency_injector.containers import Container
 
 from fastapi_dream_core.application_dependencies.application_dependencies_abc import ApplicationDependenciesABC
 from fastapi_dream_core.exceptions import InternalErrorSchema
 from fastapi_dream_core.middleware import DevelopMiddleware
 from fastapi_dream_core.middleware.app_middleware import AppMiddleware
+from fastapi_dream_core.middleware.metrics_middleware import MetricsMiddleware
+from fastapi_dream_core.metrics.pool_collector import add_pool_collector
 from fastapi_dream_core.routes.health.health_router import health_router
+from fastapi_dream_core.routes.metrics.metrics_router import metrics_router
 from fastapi_dream_core.routes.migrations.run_migrations_router import run_migrations_router
 from fastapi_dream_core.helpers.readiness import Readiness
+from fastapi_dream_core.helpers.migration_runner import migration_runner
 from fastapi_dream_core.environments import AppBaseEnvironments
+from fastapi_dream_core.utils import configure_logger
+from fastapi_dream_core.utils.json_response import use_fast_json
+
+if TYPE_CHECKING:
+    from dependency_injector.containers import Container
 
 
 def fast_api_create_app(
         app_router: APIRouter,
         version: str = '0.1.0',
-        container: Container = None,
+        container: 'Container' = None,
         dependencies: List[ApplicationDependenciesABC] = None,
         migration_route_include_in_app: bool = True,
+        readiness_timeout_seconds: float = None,
+        readiness_cache_seconds: float = None,
+        metrics_include_in_app: bool = True,
+        migration_run_on_startup: bool = False,
+        default_response_class: Type[Response] = JSONResponse,
 ) -> FastAPI:
+    configure_logger()
+
     # Create FastAPI
     app = FastAPI(
         title=AppBaseEnvironments.APP_TITLE,
         version=version,
         openapi_url=f"{AppBaseEnvironments.BASE_PATH}/openapi.json",
         docs_url=f"{AppBaseEnvironments.BASE_PATH}/docs",
-        redoc_url=f"{AppBaseEnvironments.BASE_PATH}/redoc"
+        redoc_url=f"{AppBaseEnvironments.BASE_PATH}/redoc",
+        default_response_class=default_response_class
     )
 
     # Allow CORS
@@ -39,23 +57,37 @@ def fast_api_create_app(
         allow_headers=['*'],
     )
 
-    # Add DevelopMiddleware
-    app.add_middleware(
-        DevelopMiddleware,
-        is_environment_dev=AppBaseEnvironments().is_dev_environment()
-    )
+    # Add DevelopMiddleware, only in DEV so the other environments do not pay for it
+    if AppBaseEnvironments().is_dev_environment():
+        app.add_middleware(
+            DevelopMiddleware,
+            is_environment_dev=True
+        )
 
     # Add AppMiddleware
     app.add_middleware(
         AppMiddleware
     )
 
+    # Add MetricsMiddleware, outside of AppMiddleware so the errors 500 are observed
+    if metrics_include_in_app:
+        app.add_middleware(
+            MetricsMiddleware
+        )
+
     app_router.include_router(
         router=health_router,
         prefix='/health',
         tags=['health']
     )
 
+    if metrics_include_in_app:
+        app_router.include_router(
+            router=metrics_router,
+            prefix='/health',
+            tags=['health']
+        )
+
     if migration_route_include_in_app:
         app_router.include_router(
             router=run_migrations_router,
@@ -74,6 +106,11 @@ def fast_api_create_app(
         }
     )
 
+    # Serialize without jsonable_encoder the routes that use FastJSONResponse, example: default_response_class
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            use_fast_json(route)
+
     # Create redirect from '/' from '..../docs'
     if AppBaseEnvironments().is_dev_environment():
         # Add redirect to docs
@@ -89,7 +126,16 @@ def fast_api_create_app(
 
     # Register dependencies
     readiness_service = Readiness()
+    readiness_service.configure(timeout_seconds=readiness_timeout_seconds, cache_seconds=readiness_cache_seconds)
     for dependency in (dependencies if dependencies else []):
         readiness_service.add_dependency(dependency)
 
+        if metrics_include_in_app and hasattr(dependency, 'pool_metrics'):
+            add_pool_collector(str(dependency), dependency.pool_metrics)
+
+    # Run migrations in background at startup, the readiness is not ok until they finish with success
+    if migration_run_on_startup:
+        readiness_service.add_dependency(migration_runner)
+        app.add_event_handler('startup', migration_runner.start)
+
     return app
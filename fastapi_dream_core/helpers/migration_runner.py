@@ -0,0 +1,153 @@
+import asyncio
+from collections import deque
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_dream_core.application_dependencies.application_dependencies_abc import ApplicationDependenciesABC
+from fastapi_dream_core.environments import DatabaseEnvironments
+from fastapi_dream_core.routes.migrations.run_migrations_schemas import RunMigrationsSchema, MigrationStatusEnum, \
+    MIGRATION_SUCCESS, MIGRATION_ERROR, MIGRATION_RUNNING, MIGRATION_IDLE
+from fastapi_dream_core.utils import logger
+
+MESSAGES = {
+    MigrationStatusEnum.IDLE: MIGRATION_IDLE,
+    MigrationStatusEnum.RUNNING: MIGRATION_RUNNING,
+    MigrationStatusEnum.SUCCESS: MIGRATION_SUCCESS,
+    MigrationStatusEnum.ERROR: MIGRATION_ERROR,
+}
+
+ASYNC_DRIVERS = ('aiomysql', 'asyncmy', 'asyncpg', 'aiosqlite')
+
+
+class MigrationRunner(ApplicationDependenciesABC):
+
+    def __init__(
+            self,
+            command: str = 'alembic upgrade head',
+            lock_url: str = None,
+            lock_name: str = 'fastapi_dream_core_migrations',
+            lock_timeout_seconds: float = 600,
+            output_lines: int = 200
+    ):
+        """
+        Run the migrations in background with an async subprocess, only one node run at a time because the
+        command is run holding an advisory lock of database, the other nodes wait the lock and run after,
+        so the command must be idempotent like alembic upgrade head
+        :param command: The command of migrations
+        :param lock_url: The url of database of lock, by default DatabaseEnvironments().get_db_url()
+        :param lock_name: The name of lock
+        :param lock_timeout_seconds: Max seconds waiting the lock
+        :param output_lines: The last lines of output kept for the status
+        """
+        self.command = command
+        self.lock_url = lock_url
+        self.lock_name = lock_name
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.status = MigrationStatusEnum.IDLE
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.return_code: Optional[int] = None
+        self._output = deque(maxlen=output_lines)
+        self._task: Optional[asyncio.Task] = None
+
+    def schema(self) -> RunMigrationsSchema:
+        return RunMigrationsSchema(
+            message=MESSAGES[self.status],
+            status=self.status,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            return_code=self.return_code,
+            output=list(self._output)
+        )
+
+    async def start(self) -> RunMigrationsSchema:
+        """
+        Start the migrations in background, when they are already running return the current status
+        """
+        if self._task is None or self._task.done():
+            self.status = MigrationStatusEnum.RUNNING
+            self.started_at = datetime.utcnow()
+            self.finished_at = None
+            self.return_code = None
+            self._output.clear()
+            self._task = asyncio.ensure_future(self.__run())
+
+        return self.schema()
+
+    async def wait(self) -> RunMigrationsSchema:
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+        return self.schema()
+
+    def readiness(self) -> bool:
+        return self.status == MigrationStatusEnum.SUCCESS
+
+    def details(self) -> Optional[dict]:
+        return {'status': self.status.value, 'return_code': self.return_code}
+
+    def __lock_engine(self):
+        # sqlalchemy is imported only when the migrations run
+        from sqlalchemy import create_engine
+        from sqlalchemy.engine import make_url
+        from sqlalchemy.pool import NullPool
+
+        url = make_url(self.lock_url if self.lock_url else DatabaseEnvironments().get_db_url())
+
+        # The lock is taken with a sync connection, so the async drivers are replaced by the default driver
+        if url.get_driver_name() in ASYNC_DRIVERS:
+            url = url.set(drivername=url.get_backend_name())
+
+        return create_engine(url, poolclass=NullPool)
+
+    async def __run(self) -> None:
+        from fastapi_dream_core.database.advisory_lock import advisory_lock
+
+        lock = ExitStack()
+        process = None
+
+        try:
+            engine = await run_in_threadpool(self.__lock_engine)
+            acquired = await run_in_threadpool(
+                lock.enter_context, advisory_lock(engine, self.lock_name, self.lock_timeout_seconds)
+            )
+            if not acquired:
+                raise TimeoutError(f'lock {self.lock_name} not acquired in {self.lock_timeout_seconds}s')
+
+            process = await asyncio.create_subprocess_shell(
+                self.command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+            )
+
+            async for line in process.stdout:
+                line = line.decode(errors='replace').rstrip()
+                self._output.append(line)
+                logger.info(f'MigrationRunner - {line}')
+
+            self.return_code = await process.wait()
+            self.status = MigrationStatusEnum.SUCCESS if self.return_code == 0 else MigrationStatusEnum.ERROR
+
+        except Exception as exc:
+            logger.error(f'Error in MigrationRunner - Error in run migrations - Exception = {exc}')
+            self._output.append(str(exc))
+            self.status = MigrationStatusEnum.ERROR
+
+        finally:
+            # The command is never left running without the lock, also when the task is cancelled
+            if process is not None and process.returncode is None:
+                process.kill()
+                self.return_code = await process.wait()
+
+            if self.status == MigrationStatusEnum.RUNNING:
+                self.status = MigrationStatusEnum.ERROR
+
+            await run_in_threadpool(lock.close)
+            self.finished_at = datetime.utcnow()
+
+    def __str__(self):
+        return "MigrationRunner"
+
+
+migration_runner = MigrationRunner()
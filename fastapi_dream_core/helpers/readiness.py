@@ -1,7 +1,12 @@
-from typing import List
+import asyncio
+import inspect
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from fastapi_dream_core.application_dependencies.application_dependencies_abc import ApplicationDependenciesABC
 from fastapi_dream_core.routes.health.health_schemas import DependencyHealthCheckSchema
+from fastapi_dream_core.utils import logger
 from fastapi_dream_core.utils.singleton_meta import SingletonMeta
 
 
@@ -11,19 +16,105 @@ class ApplicationDependencyException(Exception):
 
 class Readiness(metaclass=SingletonMeta):
 
-    __dependencies: List[ApplicationDependenciesABC] = []
+    def __init__(self, timeout_seconds: float = 5, cache_seconds: float = 0, max_workers: int = 4):
+        """
+        Check the readiness of dependencies concurrently, the sync readiness run in a thread pool so a hung
+        dependency do not block the event loop. A thread can not be stopped, so while the readiness of
+        a dependency that timed out is still running it is not submitted again and the dependency is not
+        ready, a hung dependency hold at most one thread of the pool
+        :param timeout_seconds: Max seconds of the readiness of each dependency, after it is not ready
+        :param cache_seconds: Seconds that the result is reused, so frequent probes do not hit the dependencies
+        :param max_workers: The threads of the pool of sync readiness
+        """
+        self.timeout_seconds = timeout_seconds
+        self.cache_seconds = cache_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='readiness')
+        self._running: Dict[int, Future] = {}
+        self.__dependencies: List[ApplicationDependenciesABC] = []
+        self._cached: Optional[List[DependencyHealthCheckSchema]] = None
+        self._cached_until = 0.0
+        self._in_flight: Optional[asyncio.Future] = None
+
+    def configure(self, timeout_seconds: float = None, cache_seconds: float = None) -> None:
+        if timeout_seconds is not None:
+            self.timeout_seconds = timeout_seconds
+
+        if cache_seconds is not None:
+            self.cache_seconds = cache_seconds
+
+        self._cached = None
 
     def add_dependency(self, dependency: ApplicationDependenciesABC):
         if not isinstance(dependency, ApplicationDependenciesABC):
             raise ApplicationDependencyException(f"Readiness.add_dependency expected ApplicationDependenciesABC")
 
         self.__dependencies.append(dependency)
+        self._cached = None
+
+    async def ready(self) -> List[DependencyHealthCheckSchema]:
+        """
+        The health of all dependencies, the concurrent calls wait the same check
+        """
+        if self._cached is not None and time.monotonic() < self._cached_until:
+            return self._cached
+
+        if self._in_flight is not None and not self._in_flight.done():
+            return await asyncio.shield(self._in_flight)
+
+        self._in_flight = asyncio.ensure_future(self.__check_all())
+        return await asyncio.shield(self._in_flight)
+
+    async def __check_all(self) -> List[DependencyHealthCheckSchema]:
+        dependencies_health = await asyncio.gather(*(self.__check(dependency) for dependency in self.__dependencies))
+
+        self._cached = list(dependencies_health)
+        self._cached_until = time.monotonic() + self.cache_seconds
+        return self._cached
+
+    def __submit(self, dependency: ApplicationDependenciesABC) -> Optional[Future]:
+        """
+        Submit the sync readiness to the thread pool, None when the previous readiness is still running
+        """
+        running = self._running.get(id(dependency))
+        if running is not None and not running.done():
+            return None
+
+        self._running[id(dependency)] = self._executor.submit(dependency.readiness)
+        return self._running[id(dependency)]
+
+    async def __check(self, dependency: ApplicationDependenciesABC) -> DependencyHealthCheckSchema:
+        start_time = time.perf_counter()
+
+        try:
+            if inspect.iscoroutinefunction(dependency.readiness):
+                ready = await asyncio.wait_for(dependency.readiness(), timeout=self.timeout_seconds)
+            else:
+                future = self.__submit(dependency)
+                if future is None:
+                    logger.warning(f"Readiness of {dependency} is still running since a previous check")
+                    ready = False
+                else:
+                    ready = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_seconds)
+
+        except asyncio.TimeoutError:
+            logger.warning(f"Readiness of {dependency} timed out after {self.timeout_seconds}s")
+            ready = False
+
+        except Exception as exc:
+            logger.error(f'Error in Readiness - Error in readiness of {dependency} - Exception = {exc}')
+            ready = False
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+
+        try:
+            details = dependency.details()
+        except Exception as exc:
+            logger.error(f'Error in Readiness - Error in details of {dependency} - Exception = {exc}')
+            details = None
 
-    def ready(self) -> List[DependencyHealthCheckSchema]:
-        return [
-            DependencyHealthCheckSchema(
-                name=str(dependency),
-                ready=dependency.readiness()
-            )
-            for dependency in self.__dependencies
-        ]
+        return DependencyHealthCheckSchema(
+            name=str(dependency),
+            ready=bool(ready),
+            latency_ms=round(latency_ms, 3),
+            details=details
+        )
@@ -0,0 +1,29 @@
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_attributes(package: str, attributes: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build the module __getattr__ and __dir__ of a package whose attributes are imported on first access,
+    so the optional backends, example: redis, are imported only when used
+
+        __getattr__, __dir__ = lazy_attributes(__name__, {'RedisCacheDriver': '.redis_cache_driver'})
+
+    :param package: The __name__ of package
+    :param attributes: The relative module of each attribute
+    """
+    module_globals = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = attributes.get(name)
+        if module is None:
+            raise AttributeError(f'module {package!r} has no attribute {name!r}')
+
+        value = getattr(importlib.import_module(module, package), name)
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(module_globals) | set(attributes))
+
+    return __getattr__, __dir__
@@ -0,0 +1 @@
+from .metrics_registry import MetricsRegistry, Counter, Gauge, Histogram
@@ -0,0 +1,98 @@
+import functools
+import inspect
+import time
+from typing import Callable
+
+from fastapi_dream_core.metrics.metrics_registry import MetricsRegistry
+
+REPOSITORY_QUERY_SECONDS = MetricsRegistry().histogram(
+    'repository_query_duration_seconds',
+    'Duration of repository methods by model and method',
+    ('model', 'method')
+)
+REPOSITORY_ERRORS = MetricsRegistry().counter(
+    'repository_errors_total',
+    'Repository methods that raised an exception by model and method',
+    ('model', 'method')
+)
+
+CACHE_OPERATION_SECONDS = MetricsRegistry().histogram(
+    'cache_operation_duration_seconds',
+    'Duration of cache driver operations by driver and operation',
+    ('driver', 'operation')
+)
+CACHE_HITS = MetricsRegistry().counter('cache_hits_total', 'Keys found in cache by driver', ('driver',))
+CACHE_MISSES = MetricsRegistry().counter('cache_misses_total', 'Keys not found in cache by driver', ('driver',))
+
+
+def observe_repository(func: Callable) -> Callable:
+    """
+    Decorator of async methods of repositories, observe the duration and the errors by model and method
+    """
+    method = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        model = self.model.__name__
+        start_time = time.perf_counter()
+
+        try:
+            return await func(self, *args, **kwargs)
+        except Exception:
+            REPOSITORY_ERRORS.labels(model, method).inc()
+            raise
+        finally:
+            REPOSITORY_QUERY_SECONDS.labels(model, method).observe(time.perf_counter() - start_time)
+
+    return wrapper
+
+
+def _count_hits(driver: str, result) -> None:
+    if isinstance(result, list):
+        hits = sum(1 for value in result if value is not None)
+        CACHE_HITS.labels(driver).inc(hits)
+        CACHE_MISSES.labels(driver).inc(len(result) - hits)
+    elif result is None:
+        CACHE_MISSES.labels(driver).inc()
+    else:
+        CACHE_HITS.labels(driver).inc()
+
+
+def observe_cache(count_hits: bool = False) -> Callable[[Callable], Callable]:
+    """
+    Decorator of methods of cache drivers, sync or async, observe the duration by driver and operation
+    :param count_hits: When True the result is counted as hits and misses, for get and get_many
+    """
+    def decorator(func: Callable) -> Callable:
+        operation = func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                start_time = time.perf_counter()
+                result = await func(self, *args, **kwargs)
+                driver = type(self).__name__
+                CACHE_OPERATION_SECONDS.labels(driver, operation).observe(time.perf_counter() - start_time)
+
+                if count_hits:
+                    _count_hits(driver, result)
+
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            start_time = time.perf_counter()
+            result = func(self, *args, **kwargs)
+            driver = type(self).__name__
+            CACHE_OPERATION_SECONDS.labels(driver, operation).observe(time.perf_counter() - start_time)
+
+            if count_hits:
+                _count_hits(driver, result)
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,214 @@
+import bisect
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from fastapi_dream_core.utils.singleton_meta import SingletonMeta
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class _CounterValue:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class _GaugeValue(_CounterValue):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramValue:
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metric(ABC):
+    TYPE = 'untyped'
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        """
+        A metric with a value by combination of labels, the values are plain attributes updated without locks,
+        the GIL keep each update consistent and a concurrent update lost is acceptable for metrics
+        :param name: The name in the exposition, example: http_requests_total
+        :param description: The HELP text
+        :param label_names: The names of labels, example: ('method', 'route')
+        """
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    @abstractmethod
+    def _new_value(self):
+        """Not Implemented"""
+
+    def labels(self, *label_values: str):
+        """
+        The child of these label values, created on the first call and cached by the tuple of label values,
+        so the next calls cost one lookup of dict. Each tuple is kept until the process end and rendered
+        in each scrape, so do not use labels with unbounded values like ids or raw paths
+        :param label_values: The values in the order of label_names, example: labels('GET', '/users')
+        """
+        value = self._values.get(label_values)
+        if value is None:
+            if len(label_values) != len(self.label_names):
+                raise ValueError(f'{self.name} expected the labels {self.label_names}, received {label_values}')
+
+            value = self._values.setdefault(label_values, self._new_value())
+
+        return value
+
+    def _samples(self) -> Iterator[str]:
+        for label_values, value in list(self._values.items()):
+            yield f'{self.name}{_labels_text(self.label_names, label_values)} {_format_value(value.value)}'
+
+    def render(self) -> List[str]:
+        return [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} {self.TYPE}', *self._samples()]
+
+
+class Counter(Metric):
+    TYPE = 'counter'
+
+    def _new_value(self) -> _CounterValue:
+        return _CounterValue()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    TYPE = 'gauge'
+
+    def _new_value(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(Metric):
+    TYPE = 'histogram'
+
+    def __init__(
+            self,
+            name: str,
+            description: str,
+            label_names: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super(Histogram, self).__init__(name=name, description=description, label_names=label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_value(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterator[str]:
+        bucket_label_names = self.label_names + ('le',)
+
+        for label_values, value in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), list(value.counts)):
+                cumulative += count
+                labels = _labels_text(bucket_label_names, label_values + (_format_value(bound),))
+                yield f'{self.name}_bucket{labels} {cumulative}'
+
+            labels = _labels_text(self.label_names, label_values)
+            yield f'{self.name}_sum{labels} {_format_value(value.sum)}'
+            yield f'{self.name}_count{labels} {cumulative}'
+
+
+class MetricsRegistry(metaclass=SingletonMeta):
+
+    def __init__(self):
+        """
+        The metrics of application rendered in the Prometheus text exposition format
+        """
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def __get_or_create(self, metric_class, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics.setdefault(name, metric_class(name, *args, **kwargs))
+
+        if not isinstance(metric, metric_class):
+            raise ValueError(f'metric {name} already registered as {metric.TYPE}')
+
+        return metric
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.__get_or_create(Counter, name, description, label_names)
+
+    def gauge(self, name: str, description: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self.__get_or_create(Gauge, name, description, label_names)
+
+    def histogram(
+            self,
+            name: str,
+            description: str,
+            label_names: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.__get_or_create(Histogram, name, description, label_names, buckets)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """
+        Add a callback called before each render, to update gauges read from other objects, example: pool stats
+        """
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in list(self._collectors):
+            collector()
+
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,39 @@
+from typing import Dict, TYPE_CHECKING
+
+from fastapi_dream_core.metrics.metrics_registry import MetricsRegistry
+
+if TYPE_CHECKING:
+    from fastapi_dream_core.database.pool_metrics import PoolMetrics
+
+POOL_GAUGES = {
+    'size': MetricsRegistry().gauge('db_pool_size', 'Connections kept in the pool', ('database',)),
+    'checked_in': MetricsRegistry().gauge('db_pool_checked_in', 'Idle connections in the pool', ('database',)),
+    'checked_out': MetricsRegistry().gauge('db_pool_checked_out', 'Connections in use', ('database',)),
+    'overflow': MetricsRegistry().gauge('db_pool_overflow', 'Connections beyond the pool size', ('database',)),
+    'checkouts': MetricsRegistry().gauge('db_pool_checkouts', 'Checkouts since the start', ('database',)),
+    'checkout_wait_seconds': MetricsRegistry().gauge(
+        'db_pool_checkout_wait_seconds', 'Seconds waiting for checkouts since the start', ('database',)
+    ),
+}
+
+_pools: Dict[str, 'PoolMetrics'] = {}
+
+
+def _collect_pools() -> None:
+    for database, pool_metrics in list(_pools.items()):
+        snapshot = pool_metrics.snapshot()
+
+        for name, gauge in POOL_GAUGES.items():
+            value = snapshot.get(name)
+            if value is not None:
+                gauge.labels(database).set(value)
+
+
+def add_pool_collector(database: str, pool_metrics: 'PoolMetrics') -> None:
+    """
+    Export the pool stats of a database as gauges, read from PoolMetrics in each render
+    :param database: The label of database, example: str(DatabaseSQLModel)
+    :param pool_metrics: The PoolMetrics of the engine
+    """
+    _pools[database] = pool_metrics
+    MetricsRegistry().add_collector(_collect_pools)
@@ -1,28 +1,67 @@
-import traceback
+import uuid
 from http import HTTPStatus
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
 
 from fastapi_dream_core.exceptions import InternalErrorSchema
 from fastapi_dream_core.utils import logger
+from fastapi_dream_core.utils.logger import request_id
 
+REQUEST_ID_HEADER = 'X-Request-ID'
 
-class AppMiddleware(BaseHTTPMiddleware):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
 
-    async def dispatch(self, request: Request, call_next):
+class AppMiddleware:
+    def __init__(self, app: ASGIApp):
+        """
+        ASGI middleware that convert unhandled errors in a response 500 with InternalErrorSchema,
+        the response is not wrapped, so streaming responses are sent as produced. The request id of header
+        X-Request-ID, or a new one, is in the logs of request and in the header of response
+        :param app: The next ASGI app
+        """
+        self.app = app
+        self._request_id_header = REQUEST_ID_HEADER.lower().encode()
+
+    def __request_id(self, scope: Scope) -> str:
+        for name, value in scope['headers']:
+            if name == self._request_id_header:
+                return value.decode('latin-1')[:128]
+
+        return uuid.uuid4().hex
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        current_request_id = self.__request_id(scope)
+        token = request_id.set(current_request_id)
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message['type'] == 'http.response.start':
+                response_started = True
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = current_request_id
+
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
 
         except Exception:
-            logger.error(traceback.format_exc())
+            # The traceback is formatted by the thread of logger, and the repeated errors are rate limited
+            logger.exception('Unhandled error in %s %s', scope['method'], scope['path'])
+
+            if response_started:
+                raise
 
             response = JSONResponse(
                 status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
                 content=InternalErrorSchema().dict()
             )
-            return response
+            await response(scope, receive, send_wrapper)
+
+        finally:
+            request_id.reset(token)
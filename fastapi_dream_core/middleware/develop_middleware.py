@@ -1,26 +1,37 @@
 import time
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
 
 from fastapi_dream_core.utils import logger
 
 
-class DevelopMiddleware(BaseHTTPMiddleware):
-    def __init__(self, is_environment_dev: bool = False, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+class DevelopMiddleware:
+    def __init__(self, app: ASGIApp, is_environment_dev: bool = False):
+        """
+        ASGI middleware that log the process time and add the header X-Process-Time,
+        fast_api_create_app only install it in DEV
+        :param app: The next ASGI app
+        :param is_environment_dev: When False the requests are passed without any work
+        """
+        self.app = app
         self.is_environment_dev = is_environment_dev
 
-    async def dispatch(self, request: Request, call_next):
-        if not self.is_environment_dev:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.is_environment_dev or scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
         start_time = time.perf_counter()
 
-        response = await call_next(request)
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                process_time = time.perf_counter() - start_time
+                logger.info("Request completed in {0:.5f}ms".format(process_time))
 
-        process_time = time.perf_counter() - start_time
-        logger.info("Request completed in {0:.5f}ms".format(process_time))
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(process_time)
 
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
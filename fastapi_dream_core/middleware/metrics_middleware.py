@@ -0,0 +1,85 @@
+import time
+from typing import Dict, Optional
+
+from starlette.routing import Mount
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from fastapi_dream_core.metrics.metrics_registry import MetricsRegistry
+
+UNMATCHED_ROUTE = 'unmatched'
+
+REQUEST_SECONDS = MetricsRegistry().histogram(
+    'http_request_duration_seconds',
+    'Duration of HTTP requests by method, route template and status',
+    ('method', 'route', 'status')
+)
+REQUESTS_IN_PROGRESS = MetricsRegistry().gauge(
+    'http_requests_in_progress',
+    'HTTP requests in progress by method',
+    ('method',)
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        """
+        ASGI middleware that observe the duration of requests by route template, example: /users/{user_id},
+        so the paths with ids do not create a series by request, and the requests in progress
+        :param app: The next ASGI app
+        """
+        self.app = app
+        self._templates: Optional[Dict[object, str]] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        status_code = 500
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            REQUEST_SECONDS.labels(method, self.__route_template(scope), str(status_code)).observe(
+                time.perf_counter() - start_time
+            )
+
+    def __route_template(self, scope: Scope) -> str:
+        route = scope.get('route')
+        if route is not None and hasattr(route, 'path_format'):
+            return route.path_format
+
+        endpoint = scope.get('endpoint')
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+
+        if self._templates is None or endpoint not in self._templates:
+            templates = self.__endpoint_templates(getattr(scope.get('app'), 'routes', []))
+            templates.setdefault(endpoint, UNMATCHED_ROUTE)
+            self._templates = templates
+
+        return self._templates[endpoint]
+
+    def __endpoint_templates(self, routes, prefix: str = '') -> Dict[object, str]:
+        templates = {}
+
+        for route in routes:
+            if isinstance(route, Mount):
+                templates.update(self.__endpoint_templates(route.routes, prefix + route.path))
+            elif hasattr(route, 'endpoint') and hasattr(route, 'path_format'):
+                templates.setdefault(route.endpoint, prefix + route.path_format)
+
+        return templates
@@ -1 +1 @@
-from .pagination import Page, PageQuery
+from .pagination import Page, PageQuery, TotalCountMode, CursorPage, CursorPageQuery
@@ -1,18 +1,30 @@
+import base64
+import binascii
+import json
 from abc import ABC, abstractmethod
+from enum import Enum
 from functools import wraps
-from typing import TypeVar, Generic, Sequence, Any, List, ClassVar, Type, cast, Dict, Mapping
+from typing import TypeVar, Generic, Sequence, Any, List, ClassVar, Type, cast, Dict, Mapping, Optional
 from collections import ChainMap
 
 from fastapi import Query
 from pydantic import BaseModel, conint, create_model
 from pydantic.generics import GenericModel
 
+from fastapi_dream_core.exceptions import InvalidCursor
+
 T = TypeVar("T")
 C = TypeVar("C")
 
 TAbstractPage = TypeVar("TAbstractPage", bound="AbstractPage")
 
 
+class TotalCountMode(str, Enum):
+    EXACT = 'exact'
+    CACHED = 'cached'
+    ESTIMATED = 'estimated'
+
+
 class PageQuery(BaseModel):
     page: int = Query(1, ge=1, description="Page number")
     size: int = Query(100, ge=1, description="Page size")
@@ -21,6 +33,30 @@ class PageQuery(BaseModel):
         return (self.page - 1) * self.size
 
 
+class CursorPageQuery(BaseModel):
+    cursor: Optional[str] = Query(None, description="Cursor of next or previous page, empty for first page")
+    size: int = Query(100, ge=1, description="Page size")
+    include_total: bool = Query(False, description="When true count the total of items")
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    data = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(data)
+    except (binascii.Error, ValueError):
+        raise InvalidCursor()
+
+    if not isinstance(payload, dict):
+        raise InvalidCursor()
+
+    return payload
+
+
 def _create_params(cls: Type[PageQuery], fields: Dict[str, Any]) -> Mapping[str, Any]:
     if not issubclass(cls, BaseModel):
         raise ValueError(f"{cls.__name__} must be subclass of BaseModel")
@@ -81,3 +117,28 @@ class Page(AbstractPage, Generic[T]):
             page=page_query.page,
             size=page_query.size
         )
+
+
+class CursorPage(AbstractPage, Generic[T]):
+    size: conint(ge=1)
+    total: Optional[conint(ge=0)] = None
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    items: Sequence[T]
+
+    @classmethod
+    def create(
+            cls,
+            items: Sequence[T],
+            total: Optional[int],
+            cursor_query: CursorPageQuery,
+            next_cursor: Optional[str] = None,
+            previous_cursor: Optional[str] = None
+    ):
+        return cls(
+            total=total,
+            items=items,
+            size=cursor_query.size,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor
+        )
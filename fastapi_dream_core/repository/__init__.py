@@ -1,2 +1,22 @@
-from .base_repository_abc import BaseRepositoryABC
-from .base_repository import BaseRepository
+from typing import TYPE_CHECKING
+
+from fastapi_dream_core.lazy_imports import lazy_attributes
+
+# Imported on first access, so sqlmodel is imported only when a repository is used
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'BaseRepositoryABC': '.base_repository_abc',
+    'BaseRepository': '.base_repository',
+    'AsyncBaseRepository': '.async_base_repository',
+    'RepositoryQueryCache': '.query_cache',
+    'AsyncRepositoryQueryCache': '.query_cache',
+    'query_filters': '.filters',
+    'LoadStrategy': '.loaders',
+})
+
+if TYPE_CHECKING:
+    from .base_repository_abc import BaseRepositoryABC
+    from .base_repository import BaseRepository
+    from .async_base_repository import AsyncBaseRepository
+    from .query_cache import RepositoryQueryCache, AsyncRepositoryQueryCache
+    from .filters import query_filters
+    from .loaders import LoadStrategy
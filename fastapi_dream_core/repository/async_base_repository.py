@@ -0,0 +1,447 @@
+from abc import ABC
+from typing import Generic, Any, Optional, Dict, Union, List, Tuple, Callable, AsyncIterator
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from fastapi_dream_core.pagination import PageQuery, Page, TotalCountMode, CursorPageQuery, CursorPage
+from fastapi_dream_core.constants import ModelType, CreateSchemaType, UpdateSchemaType, Projection
+from fastapi_dream_core.database.unit_of_work import in_unit_of_work, after_unit_of_work
+from fastapi_dream_core.metrics.instrumentation import observe_repository
+from fastapi_dream_core.repository.base_repository_abc import BaseRepositoryABC
+from fastapi_dream_core.repository.base_repository_mixin import BaseRepositoryMixin
+from fastapi_dream_core.repository.bulk import supports_insert_returning
+from fastapi_dream_core.repository.keyset_pagination import KeysetPagination
+from fastapi_dream_core.repository.loaders import LoadStrategy
+from fastapi_dream_core.repository.total_count import supports_window_functions
+
+
+class AsyncBaseRepository(
+    Generic[ModelType, CreateSchemaType, UpdateSchemaType], BaseRepositoryMixin, BaseRepositoryABC, ABC
+):
+    """
+    Repository over an AsyncSession, example: AsyncBaseRepository(async_database.session, UserModel),
+    the parameters of constructor are described in BaseRepositoryMixin
+    """
+
+    @observe_repository
+    async def find_one_by_filters(
+            self,
+            filters: Dict[str, Any] = None,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> Union[ModelType, dict, None]:
+        """
+        This method make query using params, filters
+        :param filters:
+        :param projection: Select only these fields and return a dict instead of the Model,
+                a list of fields or a schema, example ['id', 'name'], UserListSchema
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository
+        :return: The object ModelType | dict | None
+        """
+        columns = self._projection_columns(projection)
+        loaders = self._loaders(loaders)
+        filters = self._sanitize_filters(filters)
+        cache_key = await self.__cache_key('find_one_by_filters', loaders, filters=filters, columns=columns)
+        hit, values = await self.__cache_get(cache_key)
+        if hit:
+            return self._load_item(values, columns)
+
+        async with self.read_session_factory() as session:
+            query = self._find_statement(filters, loaders, columns)
+            item = self._to_item(self._unique(await session.exec(query), loaders).first(), columns)
+
+            await self.__cache_set(cache_key, lambda: self._dump_item(item, columns))
+            return item
+
+    @observe_repository
+    async def find_by_filters_paginated(
+            self,
+            page_query: PageQuery = PageQuery(),
+            filters: dict = None,
+            order: str = 'id',
+            desc: bool = False,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> Page:
+        """
+        This method make query using params, filters, order and desc applied
+        :param page_query: The obj Params (page and size)
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :param order: The field for ordering select in database
+        :param desc: When False the select is using ASC, when True the select is using DESC
+        :param projection: Select only these fields and the items are dicts instead of Models,
+                a list of fields or a schema, example ['id', 'name'], UserListSchema
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository
+        :return: The object PaginationResult(items and count)
+                items: The data of select
+                count: with count of items for the filters
+        """
+        if not isinstance(page_query, PageQuery):
+            raise ValueError(f'page_query should be a PageQuery obj, received {type(page_query)}')
+
+        columns = self._projection_columns(projection)
+        loaders = self._loaders(loaders)
+        filters = self._sanitize_filters(filters)
+        cache_key = await self.__cache_key(
+            'find_by_filters_paginated', loaders, filters=filters, order=order, desc=desc,
+            page=page_query.page, size=page_query.size, columns=columns
+        )
+        hit, values = await self.__cache_get(cache_key)
+        if hit:
+            rows, count = values
+            return Page.create(items=self._load_items(rows, columns), total=count, page_query=page_query)
+
+        async with self.read_session_factory() as session:
+            if self.count_mode == TotalCountMode.EXACT and supports_window_functions(self._dialect(session)):
+                query = self._page_statement(page_query, filters, loaders, columns, order, desc, with_total=True)
+
+                rows = self._unique(await session.exec(query), loaders).all()
+                if rows:
+                    items, count = self._page_items_with_total(rows, columns)
+                else:
+                    items = []
+                    count = await self.__count_in_session(session, filters=filters) if page_query.get_offset() else 0
+
+            else:
+                query = self._page_statement(page_query, filters, loaders, columns, order, desc)
+
+                items = self._to_items(self._unique(await session.exec(query), loaders).all(), columns)
+                count = await self.__resolve_total(session, filters=filters)
+
+            await self.__cache_set(cache_key, lambda: (self._dump_items(items, columns), count))
+            return Page.create(
+                items=items,
+                total=count,
+                page_query=page_query
+            )
+
+    @observe_repository
+    async def find_by_filters_cursor_paginated(
+            self,
+            cursor_query: CursorPageQuery = CursorPageQuery(),
+            filters: dict = None,
+            order: str = 'id',
+            desc: bool = False,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> CursorPage:
+        """
+        This method make a keyset query using cursor, filters, order and desc applied, the latency of deep pages
+        is the same of first page when the database have an index on (order, primary key)
+        :param cursor_query: The obj CursorPageQuery (cursor, size and include_total)
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :param order: The field for ordering select in database, the primary key is used as tiebreaker
+        :param desc: When False the select is using ASC, when True the select is using DESC
+        :param projection: Select only these fields and the items are dicts instead of Models,
+                a list of fields or a schema, example ['id', 'name'], UserListSchema
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository
+        :return: The object CursorPage(items, next_cursor, previous_cursor and total when include_total)
+        """
+        keyset = KeysetPagination(model=self.model, cursor_query=cursor_query, order=order, desc=desc)
+        columns = self._projection_columns(projection)
+        keyset_columns = self._keyset_columns(keyset, columns)
+        loaders = self._loaders(loaders)
+
+        filters = self._sanitize_filters(filters)
+        cache_key = await self.__cache_key(
+            'find_by_filters_cursor_paginated', loaders, filters=filters, order=order, desc=desc,
+            cursor=cursor_query.cursor, size=cursor_query.size, include_total=cursor_query.include_total,
+            columns=columns
+        )
+        hit, values = await self.__cache_get(cache_key)
+        if hit:
+            rows, total = values
+            return keyset.create_page(rows=self._load_items(rows, keyset_columns), total=total, columns=columns)
+
+        async with self.read_session_factory() as session:
+            query = self._keyset_statement(keyset, filters, loaders, columns)
+
+            rows = self._to_items(self._unique(await session.exec(query), loaders).all(), keyset_columns)
+            total = await self.__count_in_session(session, filters=filters) if cursor_query.include_total else None
+
+            await self.__cache_set(cache_key, lambda: (self._dump_items(rows, keyset_columns), total))
+            return keyset.create_page(rows=rows, total=total, columns=columns)
+
+    @observe_repository
+    async def find_all_by_filters(
+            self,
+            filters: dict = None,
+            order: str = 'id',
+            desc: bool = False,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> List[Union[ModelType, dict]]:
+        """
+        This method make query using params, filters, order and desc applied
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :param order: The field for ordering select in database
+        :param desc: When False the select is using ASC, when True the select is using DESC
+        :param projection: Select only these fields and return dicts instead of Models,
+                a list of fields or a schema, example ['id', 'name'], UserListSchema
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository
+        :return: Return a list of Models, or of dicts when projection
+        """
+        columns = self._projection_columns(projection)
+        loaders = self._loaders(loaders)
+        filters = self._sanitize_filters(filters)
+        cache_key = await self.__cache_key(
+            'find_all_by_filters', loaders, filters=filters, order=order, desc=desc, columns=columns
+        )
+        hit, values = await self.__cache_get(cache_key)
+        if hit:
+            return self._load_items(values, columns)
+
+        async with self.read_session_factory() as session:
+            query = self._find_statement(filters, loaders, columns, order, desc)
+
+            items = self._to_items(self._unique(await session.exec(query), loaders).all(), columns)
+            await self.__cache_set(cache_key, lambda: self._dump_items(items, columns))
+            return items
+
+    async def stream_by_filters(
+            self,
+            filters: dict = None,
+            order: str = 'id',
+            desc: bool = False,
+            columns: List[str] = None,
+            batch_size: int = 1000,
+            batches: bool = False,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> AsyncIterator[Any]:
+        """
+        This method iterate the query using a server side cursor, the rows are fetched by batch_size
+        so the memory is bounded, the session is open until the iterator is exhausted or closed
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :param order: The field for ordering select in database
+        :param desc: When False the select is using ASC, when True the select is using DESC
+        :param columns: Only these columns are selected and Rows are yielded instead of Models,
+                example ['id', 'name']
+        :param batch_size: The number of rows fetched from the cursor each time
+        :param batches: When True yield lists of batch_size rows instead of one row
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository,
+                JOINED is not supported with a server side cursor, use SELECTIN
+        :return: AsyncIterator of Models, Rows or lists of them
+        """
+        query = self._find_statement(self._sanitize_filters(filters), self._loaders(loaders), columns, order, desc)
+
+        async with self.read_session_factory() as session:
+            result = await session.stream(query.execution_options(yield_per=batch_size))
+            result = result if columns else result.scalars()
+
+            async for partition in result.partitions(batch_size):
+                if batches:
+                    yield partition
+                else:
+                    for row in partition:
+                        yield row
+
+    async def __cache_key(self, method: str, loaders: Dict[str, LoadStrategy] = None, **params) -> Optional[str]:
+        if not self._use_query_cache(loaders):
+            return None
+
+        return await self.query_cache.key(self.model, method, **params)
+
+    async def __cache_get(self, cache_key: Optional[str]) -> Tuple[bool, Any]:
+        return (await self.query_cache.get(cache_key)) if cache_key else (False, None)
+
+    async def __cache_set(self, cache_key: Optional[str], dump: Callable[[], Any]) -> None:
+        if cache_key:
+            await self.query_cache.set(cache_key, dump())
+
+    async def __invalidate_cache(self) -> None:
+        if self.query_cache:
+            await self.query_cache.invalidate(self.model)
+
+    async def __commit(self, session: AsyncSession) -> None:
+        """
+        Commit and invalidate the query cache, inside a unit of work only flush, the commit and the
+        invalidation are made at the end of the unit of work
+        """
+        if in_unit_of_work(session):
+            await session.flush()
+            after_unit_of_work(session, self.__invalidate_cache)
+            return
+
+        await session.commit()
+        await self.__invalidate_cache()
+
+    async def __count_in_session(self, session: AsyncSession, filters: dict) -> Optional[int]:
+        return (await session.exec(self._count_statement(filters))).first()
+
+    async def __resolve_total(self, session: AsyncSession, filters: dict) -> int:
+        """
+        Resolve the total of find_by_filters_paginated in the same session of the page query using count_mode
+        :param session: The session of page query
+        :param filters: A dict with sanitized filters
+        :return: int
+        """
+        if self.count_mode == TotalCountMode.EXACT:
+            return await self.__count_in_session(session, filters=filters)
+
+        statement = self._estimated_count_statement(self._dialect(session), filters)
+        if statement is not None:
+            estimated = (await session.execute(statement)).scalar()
+
+            if estimated is not None and estimated >= 0:
+                return int(estimated)
+
+        count = self._count_cache.get(filters)
+        if count is None:
+            count = await self.__count_in_session(session, filters=filters)
+            self._count_cache.set(filters, count)
+
+        return count
+
+    @observe_repository
+    async def count_by_filters(
+            self,
+            filters: dict = None
+    ) -> int:
+        """
+        This method count items with filters
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :return: Return int that represent the count of query
+        """
+        filters = self._sanitize_filters(filters)
+        cache_key = await self.__cache_key('count_by_filters', filters=filters)
+        hit, count = await self.__cache_get(cache_key)
+        if hit:
+            return count
+
+        async with self.read_session_factory() as session:
+            count = await self.__count_in_session(session, filters=filters)
+
+        await self.__cache_set(cache_key, lambda: count)
+        return count
+
+    @observe_repository
+    async def create(self, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
+        """
+        This method create object in database
+        :param obj_in: The BaseModel with field and data or dict of data
+        :return: The Model created
+        """
+        new_obj = self._new_model(obj_in)
+
+        async with self.session_factory() as session:
+            session.add(new_obj)
+            await self.__commit(session)
+            await session.refresh(new_obj)
+            return new_obj
+
+    @observe_repository
+    async def update(
+        self,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """
+        This method update the model in database
+        :param db_obj: The Model in a database
+        :param obj_in: The BaseModel with field and data
+        :return: The Model updated
+        """
+        db_obj = self._apply_update(db_obj, obj_in)
+
+        async with self.session_factory() as session:
+            session.add(db_obj)
+            await self.__commit(session)
+            await session.refresh(db_obj)
+            return db_obj
+
+    @observe_repository
+    async def create_many(
+            self,
+            objs_in: List[Union[CreateSchemaType, Dict[str, Any]]],
+            chunk_size: int = 1000,
+            return_primary_keys: bool = False
+    ) -> Optional[List[Any]]:
+        """
+        This method create many objects in database with one INSERT by chunk and one commit
+        :param objs_in: A list of BaseModel with field and data or dict of data
+        :param chunk_size: The max of rows by INSERT, the rows are grouped by the columns with value
+        :param return_primary_keys: When True use RETURNING to return the primary keys, only when supported
+        :return: The list of primary keys created in the order of objs_in when return_primary_keys and supported,
+                None otherwise
+        """
+        rows = self._insert_rows(objs_in)
+        primary_keys = [None] * len(rows)
+
+        async with self.session_factory() as session:
+            returning = return_primary_keys and supports_insert_returning(self._dialect(session))
+
+            for indexes, statement, params in self._insert_statements(rows, chunk_size, returning):
+                result = await session.execute(statement, params)
+                if returning:
+                    for index, primary_key in zip(indexes, self._returned_primary_keys(result)):
+                        primary_keys[index] = primary_key
+
+            await self.__commit(session)
+
+        return primary_keys if returning else None
+
+    @observe_repository
+    async def update_many(
+            self,
+            obj_in: Union[UpdateSchemaType, Dict[str, Any]] = None,
+            filters: dict = None,
+            db_objs: List[ModelType] = None,
+            chunk_size: int = 1000
+    ) -> int:
+        """
+        This method update many rows in database with one commit
+            by filters: one UPDATE ... WHERE with the values of obj_in
+            by db_objs: the values of obj_in are applied in the Models and one UPDATE by primary key
+                        is executed with executemany by chunk
+        :param obj_in: The BaseModel with field and data or dict of data
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :param db_objs: The Models in a database
+        :param chunk_size: The max of rows by executemany when db_objs is used
+        :return: The count of rows updated
+        """
+        update_data = self._update_data(obj_in)
+
+        if db_objs is not None:
+            rowcount = 0
+
+            async with self.session_factory() as session:
+                for statement, params in self._update_by_primary_key_statements(db_objs, update_data, chunk_size):
+                    rowcount += (await session.execute(statement, params)).rowcount
+
+                await self.__commit(session)
+
+            return rowcount
+
+        statement = self._update_by_filters_statement(update_data, filters)
+        if statement is None:
+            return 0
+
+        async with self.session_factory() as session:
+            result = await session.execute(statement)
+            await self.__commit(session)
+            return result.rowcount
+
+    @observe_repository
+    async def delete_by_filters(self, filters: dict) -> int:
+        """
+        This method delete items in database with one DELETE ... WHERE
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}, at least one valid filter is required
+        :return: The count of rows deleted
+        """
+        statement = self._delete_by_filters_statement(filters)
+
+        async with self.session_factory() as session:
+            result = await session.execute(statement)
+            await self.__commit(session)
+            return result.rowcount
+
+    @observe_repository
+    async def delete(self, obj: ModelType):
+        """
+        This method delete item in database
+        :param obj: The Model that will be deleted
+        :return: The result of commit
+        """
+        async with self.session_factory() as session:
+            await session.delete(obj)
+            await self.__commit(session)
@@ -1,63 +1,67 @@
 from abc import ABC
-from contextlib import AbstractContextManager
-from typing import Generic, Type, Any, Optional, Dict, Union, List, Callable
+from typing import Generic, Any, Optional, Dict, Union, List, Tuple, Callable, Iterator
 
-from fastapi.encoders import jsonable_encoder
-from sqlmodel import Session, select, desc as descending, func
+from sqlmodel import Session
 
-from fastapi_dream_core.pagination import PageQuery, Page
-from fastapi_dream_core.constants import ModelType, CreateSchemaType, UpdateSchemaType
+from fastapi_dream_core.pagination import PageQuery, Page, TotalCountMode, CursorPageQuery, CursorPage
+from fastapi_dream_core.constants import ModelType, CreateSchemaType, UpdateSchemaType, Projection
+from fastapi_dream_core.database.unit_of_work import in_unit_of_work, after_unit_of_work
+from fastapi_dream_core.metrics.instrumentation import observe_repository
 from fastapi_dream_core.repository.base_repository_abc import BaseRepositoryABC
+from fastapi_dream_core.repository.base_repository_mixin import BaseRepositoryMixin
+from fastapi_dream_core.repository.bulk import supports_insert_returning
+from fastapi_dream_core.repository.keyset_pagination import KeysetPagination
+from fastapi_dream_core.repository.loaders import LoadStrategy
+from fastapi_dream_core.repository.total_count import supports_window_functions
 
 
-class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], BaseRepositoryABC, ABC):
+class BaseRepository(
+    Generic[ModelType, CreateSchemaType, UpdateSchemaType], BaseRepositoryMixin, BaseRepositoryABC, ABC
+):
+    """
+    Repository over a sync Session, example: BaseRepository(database.session, UserModel), the parameters
+    of constructor are described in BaseRepositoryMixin
+    """
 
-    def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]], model: Type[ModelType]):
-        '''
-        The constructor received the session and the model of repository
-        :param session: The session of SQLModel or sqlalchemy
-        :param model: The model of repository, example: UserModel, ItemModel
-        '''
-        self.session_factory = session_factory
-        self.model = model
-
-    async def __sanitize_filters_from_model(self, filters: dict) -> dict:
-        """
-        This method received the filters for query and check if field have in model passed in constructor
-        and if do not exists in model remove
-        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
-        :return: return the filters dict with only correct filters
-        """
-        if not isinstance(filters, dict):
-            raise ValueError(f'filters should be a dict, received {type(filters)}')
-
-        keys = list(filters.keys())
-        for key in keys:
-            try:
-                getattr(self.model, key)
-            except AttributeError:
-                del filters[key]
-
-        return filters
-
-    async def find_one_by_filters(self, filters: Dict[str, Any] = None) -> Optional[ModelType]:
+    @observe_repository
+    async def find_one_by_filters(
+            self,
+            filters: Dict[str, Any] = None,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> Union[ModelType, dict, None]:
         """
         This method make query using params, filters
         :param filters:
-        :return: The object ModelType | None
+        :param projection: Select only these fields and return a dict instead of the Model,
+                a list of fields or a schema, example ['id', 'name'], UserListSchema
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository
+        :return: The object ModelType | dict | None
         """
-        with self.session_factory() as session:
-            filters = await self.__sanitize_filters_from_model(filters=filters) if filters else {}
-            query = select(self.model).filter_by(**filters)
+        columns = self._projection_columns(projection)
+        loaders = self._loaders(loaders)
+        filters = self._sanitize_filters(filters)
+        cache_key = self.__cache_key('find_one_by_filters', loaders, filters=filters, columns=columns)
+        hit, values = self.__cache_get(cache_key)
+        if hit:
+            return self._load_item(values, columns)
 
-            return session.exec(query).first()
+        with self.read_session_factory() as session:
+            query = self._find_statement(filters, loaders, columns)
+            item = self._to_item(self._unique(session.exec(query), loaders).first(), columns)
 
+            self.__cache_set(cache_key, lambda: self._dump_item(item, columns))
+            return item
+
+    @observe_repository
     async def find_by_filters_paginated(
             self,
             page_query: PageQuery = PageQuery(),
             filters: dict = None,
             order: str = 'id',
-            desc: bool = False
+            desc: bool = False,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
     ) -> Page:
         """
         This method make query using params, filters, order and desc applied
@@ -65,6 +69,9 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], Bas
         :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
         :param order: The field for ordering select in database
         :param desc: When False the select is using ASC, when True the select is using DESC
+        :param projection: Select only these fields and the items are dicts instead of Models,
+                a list of fields or a schema, example ['id', 'name'], UserListSchema
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository
         :return: The object PaginationResult(items and count)
                 items: The data of select
                 count: with count of items for the filters
@@ -72,57 +79,220 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], Bas
         if not isinstance(page_query, PageQuery):
             raise ValueError(f'page_query should be a PageQuery obj, received {type(page_query)}')
 
-        with self.session_factory() as session:
-            filters = await self.__sanitize_filters_from_model(filters=filters) if filters else {}
+        columns = self._projection_columns(projection)
+        loaders = self._loaders(loaders)
+        filters = self._sanitize_filters(filters)
+        cache_key = self.__cache_key(
+            'find_by_filters_paginated', loaders, filters=filters, order=order, desc=desc,
+            page=page_query.page, size=page_query.size, columns=columns
+        )
+        hit, values = self.__cache_get(cache_key)
+        if hit:
+            rows, count = values
+            return Page.create(items=self._load_items(rows, columns), total=count, page_query=page_query)
 
-            query = select(self.model).filter_by(**filters)
+        with self.read_session_factory() as session:
+            if self.count_mode == TotalCountMode.EXACT and supports_window_functions(self._dialect(session)):
+                query = self._page_statement(page_query, filters, loaders, columns, order, desc, with_total=True)
 
-            if hasattr(self.model, order):
-                query = query.order_by(descending(order)) if desc else query.order_by(order)
+                rows = self._unique(session.exec(query), loaders).all()
+                if rows:
+                    items, count = self._page_items_with_total(rows, columns)
+                else:
+                    items = []
+                    count = self.__count_in_session(session, filters=filters) if page_query.get_offset() else 0
 
-            query = query.offset(page_query.get_offset()).limit(page_query.size)
-            count = await self.__count_by_filters_query(filters=filters)
+            else:
+                query = self._page_statement(page_query, filters, loaders, columns, order, desc)
 
+                items = self._to_items(self._unique(session.exec(query), loaders).all(), columns)
+                count = self.__resolve_total(session, filters=filters)
+
+            self.__cache_set(cache_key, lambda: (self._dump_items(items, columns), count))
             return Page.create(
-                items=session.exec(query).all(),
+                items=items,
                 total=count,
                 page_query=page_query
             )
 
+    @observe_repository
+    async def find_by_filters_cursor_paginated(
+            self,
+            cursor_query: CursorPageQuery = CursorPageQuery(),
+            filters: dict = None,
+            order: str = 'id',
+            desc: bool = False,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> CursorPage:
+        """
+        This method make a keyset query using cursor, filters, order and desc applied, the latency of deep pages
+        is the same of first page when the database have an index on (order, primary key)
+        :param cursor_query: The obj CursorPageQuery (cursor, size and include_total)
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :param order: The field for ordering select in database, the primary key is used as tiebreaker
+        :param desc: When False the select is using ASC, when True the select is using DESC
+        :param projection: Select only these fields and the items are dicts instead of Models,
+                a list of fields or a schema, example ['id', 'name'], UserListSchema
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository
+        :return: The object CursorPage(items, next_cursor, previous_cursor and total when include_total)
+        """
+        keyset = KeysetPagination(model=self.model, cursor_query=cursor_query, order=order, desc=desc)
+        columns = self._projection_columns(projection)
+        keyset_columns = self._keyset_columns(keyset, columns)
+        loaders = self._loaders(loaders)
+
+        filters = self._sanitize_filters(filters)
+        cache_key = self.__cache_key(
+            'find_by_filters_cursor_paginated', loaders, filters=filters, order=order, desc=desc,
+            cursor=cursor_query.cursor, size=cursor_query.size, include_total=cursor_query.include_total,
+            columns=columns
+        )
+        hit, values = self.__cache_get(cache_key)
+        if hit:
+            rows, total = values
+            return keyset.create_page(rows=self._load_items(rows, keyset_columns), total=total, columns=columns)
+
+        with self.read_session_factory() as session:
+            query = self._keyset_statement(keyset, filters, loaders, columns)
+
+            rows = self._to_items(self._unique(session.exec(query), loaders).all(), keyset_columns)
+            total = self.__count_in_session(session, filters=filters) if cursor_query.include_total else None
+
+            self.__cache_set(cache_key, lambda: (self._dump_items(rows, keyset_columns), total))
+            return keyset.create_page(rows=rows, total=total, columns=columns)
+
+    @observe_repository
     async def find_all_by_filters(
             self,
             filters: dict = None,
             order: str = 'id',
-            desc: bool = False
-    ) -> List[ModelType]:
+            desc: bool = False,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> List[Union[ModelType, dict]]:
         """
         This method make query using params, filters, order and desc applied
         :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
         :param order: The field for ordering select in database
         :param desc: When False the select is using ASC, when True the select is using DESC
-        :return: Return a list of Models
+        :param projection: Select only these fields and return dicts instead of Models,
+                a list of fields or a schema, example ['id', 'name'], UserListSchema
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository
+        :return: Return a list of Models, or of dicts when projection
         """
-        with self.session_factory() as session:
-            filters = await self.__sanitize_filters_from_model(filters=filters) if filters else {}
-            query = select(self.model).filter_by(**filters)
+        columns = self._projection_columns(projection)
+        loaders = self._loaders(loaders)
+        filters = self._sanitize_filters(filters)
+        cache_key = self.__cache_key(
+            'find_all_by_filters', loaders, filters=filters, order=order, desc=desc, columns=columns
+        )
+        hit, values = self.__cache_get(cache_key)
+        if hit:
+            return self._load_items(values, columns)
 
-            if hasattr(self.model, order):
-                query = query.order_by(descending(order)) if desc else query.order_by(order)
+        with self.read_session_factory() as session:
+            query = self._find_statement(filters, loaders, columns, order, desc)
 
-            return session.exec(query).all()
+            items = self._to_items(self._unique(session.exec(query), loaders).all(), columns)
+            self.__cache_set(cache_key, lambda: self._dump_items(items, columns))
+            return items
 
-    async def __count_by_filters_query(self, filters: dict) -> Optional[int]:
+    def iter_by_filters(
+            self,
+            filters: dict = None,
+            order: str = 'id',
+            desc: bool = False,
+            columns: List[str] = None,
+            batch_size: int = 1000,
+            batches: bool = False,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> Iterator[Any]:
         """
-        Rerturn count of query
-        :param filters:
+        This method iterate the query using a server side cursor, the rows are fetched by batch_size
+        so the memory is bounded, the session is open until the iterator is exhausted or closed.
+        It is a sync iterator, StreamingResponse iterate it in the threadpool without block the event loop
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :param order: The field for ordering select in database
+        :param desc: When False the select is using ASC, when True the select is using DESC
+        :param columns: Only these columns are selected and Rows are yielded instead of Models,
+                example ['id', 'name']
+        :param batch_size: The number of rows fetched from the cursor each time
+        :param batches: When True yield lists of batch_size rows instead of one row
+        :param loaders: The loading strategy of relationships by name, merged over the loaders of repository,
+                JOINED is not supported with a server side cursor, use SELECTIN
+        :return: Iterator of Models, Rows or lists of them
+        """
+        query = self._find_statement(self._sanitize_filters(filters), self._loaders(loaders), columns, order, desc)
+
+        with self.read_session_factory() as session:
+            result = session.execute(query.execution_options(stream_results=True, yield_per=batch_size))
+            result = result if columns else result.scalars()
+
+            for partition in result.partitions(batch_size):
+                if batches:
+                    yield partition
+                else:
+                    yield from partition
+
+    def __cache_key(self, method: str, loaders: Dict[str, LoadStrategy] = None, **params) -> Optional[str]:
+        if not self._use_query_cache(loaders):
+            return None
+
+        return self.query_cache.key(self.model, method, **params)
+
+    def __cache_get(self, cache_key: Optional[str]) -> Tuple[bool, Any]:
+        return self.query_cache.get(cache_key) if cache_key else (False, None)
+
+    def __cache_set(self, cache_key: Optional[str], dump: Callable[[], Any]) -> None:
+        if cache_key:
+            self.query_cache.set(cache_key, dump())
+
+    def __invalidate_cache(self) -> None:
+        if self.query_cache:
+            self.query_cache.invalidate(self.model)
+
+    def __commit(self, session: Session) -> None:
+        """
+        Commit and invalidate the query cache, inside a unit of work only flush, the commit and the
+        invalidation are made at the end of the unit of work
+        """
+        if in_unit_of_work(session):
+            session.flush()
+            after_unit_of_work(session, self.__invalidate_cache)
+            return
+
+        session.commit()
+        self.__invalidate_cache()
+
+    def __count_in_session(self, session: Session, filters: dict) -> Optional[int]:
+        return session.exec(self._count_statement(filters)).first()
+
+    def __resolve_total(self, session: Session, filters: dict) -> int:
+        """
+        Resolve the total of find_by_filters_paginated in the same session of the page query using count_mode
+        :param session: The session of page query
+        :param filters: A dict with sanitized filters
         :return: int
         """
-        with self.session_factory() as session:
-            query = select([func.count()]).select_from(self.model).filter_by(**filters)
+        if self.count_mode == TotalCountMode.EXACT:
+            return self.__count_in_session(session, filters=filters)
+
+        statement = self._estimated_count_statement(self._dialect(session), filters)
+        if statement is not None:
+            estimated = session.execute(statement).scalar()
 
-            result = session.exec(query)
-            return result.first()
+            if estimated is not None and estimated >= 0:
+                return int(estimated)
 
+        count = self._count_cache.get(filters)
+        if count is None:
+            count = self.__count_in_session(session, filters=filters)
+            self._count_cache.set(filters, count)
+
+        return count
+
+    @observe_repository
     async def count_by_filters(
             self,
             filters: dict = None
@@ -132,32 +302,34 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], Bas
         :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
         :return: Return int that represent the count of query
         """
-        filters = await self.__sanitize_filters_from_model(filters=filters) if filters else {}
-        return await self.__count_by_filters_query(filters=filters)
+        filters = self._sanitize_filters(filters)
+        cache_key = self.__cache_key('count_by_filters', filters=filters)
+        hit, count = self.__cache_get(cache_key)
+        if hit:
+            return count
+
+        with self.read_session_factory() as session:
+            count = self.__count_in_session(session, filters=filters)
 
+        self.__cache_set(cache_key, lambda: count)
+        return count
+
+    @observe_repository
     async def create(self, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
         """
         This method create object in database
         :param obj_in: The BaseModel with field and data or dict of data
         :return: The Model created
         """
-        if isinstance(obj_in, dict):
-            new_obj = self.model()
-
-            for field in obj_in:
-                if field in obj_in:
-                    setattr(new_obj, field, obj_in[field])
-
-        else:
-            payload = jsonable_encoder(obj_in)
-            new_obj = self.model(**payload)
+        new_obj = self._new_model(obj_in)
 
         with self.session_factory() as session:
             session.add(new_obj)
-            session.commit()
+            self.__commit(session)
             session.refresh(new_obj)
             return new_obj
 
+    @observe_repository
     async def update(
         self,
         db_obj: ModelType,
@@ -169,22 +341,101 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], Bas
         :param obj_in: The BaseModel with field and data
         :return: The Model updated
         """
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        db_obj = self._apply_update(db_obj, obj_in)
 
         with self.session_factory() as session:
             session.add(db_obj)
-            session.commit()
+            self.__commit(session)
             session.refresh(db_obj)
             return db_obj
 
+    @observe_repository
+    async def create_many(
+            self,
+            objs_in: List[Union[CreateSchemaType, Dict[str, Any]]],
+            chunk_size: int = 1000,
+            return_primary_keys: bool = False
+    ) -> Optional[List[Any]]:
+        """
+        This method create many objects in database with one INSERT by chunk and one commit
+        :param objs_in: A list of BaseModel with field and data or dict of data
+        :param chunk_size: The max of rows by INSERT, the rows are grouped by the columns with value
+        :param return_primary_keys: When True use RETURNING to return the primary keys, only when supported
+        :return: The list of primary keys created in the order of objs_in when return_primary_keys and supported,
+                None otherwise
+        """
+        rows = self._insert_rows(objs_in)
+        primary_keys = [None] * len(rows)
+
+        with self.session_factory() as session:
+            returning = return_primary_keys and supports_insert_returning(self._dialect(session))
+
+            for indexes, statement, params in self._insert_statements(rows, chunk_size, returning):
+                result = session.execute(statement, params)
+                if returning:
+                    for index, primary_key in zip(indexes, self._returned_primary_keys(result)):
+                        primary_keys[index] = primary_key
+
+            self.__commit(session)
+
+        return primary_keys if returning else None
+
+    @observe_repository
+    async def update_many(
+            self,
+            obj_in: Union[UpdateSchemaType, Dict[str, Any]] = None,
+            filters: dict = None,
+            db_objs: List[ModelType] = None,
+            chunk_size: int = 1000
+    ) -> int:
+        """
+        This method update many rows in database with one commit
+            by filters: one UPDATE ... WHERE with the values of obj_in
+            by db_objs: the values of obj_in are applied in the Models and one UPDATE by primary key
+                        is executed with executemany by chunk
+        :param obj_in: The BaseModel with field and data or dict of data
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :param db_objs: The Models in a database
+        :param chunk_size: The max of rows by executemany when db_objs is used
+        :return: The count of rows updated
+        """
+        update_data = self._update_data(obj_in)
+
+        if db_objs is not None:
+            rowcount = 0
+
+            with self.session_factory() as session:
+                for statement, params in self._update_by_primary_key_statements(db_objs, update_data, chunk_size):
+                    rowcount += session.execute(statement, params).rowcount
+
+                self.__commit(session)
+
+            return rowcount
+
+        statement = self._update_by_filters_statement(update_data, filters)
+        if statement is None:
+            return 0
+
+        with self.session_factory() as session:
+            result = session.execute(statement)
+            self.__commit(session)
+            return result.rowcount
+
+    @observe_repository
+    async def delete_by_filters(self, filters: dict) -> int:
+        """
+        This method delete items in database with one DELETE ... WHERE
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}, at least one valid filter is required
+        :return: The count of rows deleted
+        """
+        statement = self._delete_by_filters_statement(filters)
+
+        with self.session_factory() as session:
+            result = session.execute(statement)
+            self.__commit(session)
+            return result.rowcount
+
+    @observe_repository
     async def delete(self, obj: ModelType):
         """
         This method delete item in database
@@ -193,4 +444,4 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType], Bas
         """
         with self.session_factory() as session:
             session.delete(obj)
-            session.commit()
+            self.__commit(session)
@@ -1,13 +1,19 @@
 from abc import ABC
 from typing import Any, Optional, Dict, Union, List
 
-from fastapi_dream_core.pagination import PageQuery, Page
-from fastapi_dream_core.constants import ModelType, CreateSchemaType, UpdateSchemaType
+from fastapi_dream_core.pagination import PageQuery, Page, CursorPageQuery, CursorPage
+from fastapi_dream_core.constants import ModelType, CreateSchemaType, UpdateSchemaType, Projection
+from fastapi_dream_core.repository.loaders import LoadStrategy
 
 
 class BaseRepositoryABC(ABC):
 
-    async def find_one_by_filters(self, filters: Dict[str, Any] = None) -> Optional[ModelType]:
+    async def find_one_by_filters(
+            self,
+            filters: Dict[str, Any] = None,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> Union[ModelType, dict, None]:
         """Not Implemented"""
 
     async def find_by_filters_paginated(
@@ -15,16 +21,34 @@ class BaseRepositoryABC(ABC):
             page_query: PageQuery = PageQuery(),
             filters: dict = None,
             order: str = 'id',
-            desc: bool = False
+            desc: bool = False,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
     ) -> Page:
         """Not Implemented"""
 
+    async def find_by_filters_cursor_paginated(
+            self,
+            cursor_query: CursorPageQuery = CursorPageQuery(),
+            filters: dict = None,
+            order: str = 'id',
+            desc: bool = False,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> CursorPage:
+        """Not Implemented"""
+
     async def find_all_by_filters(
             self,
             filters: dict = None,
             order: str = 'id',
-            desc: bool = False
-    ) -> List[ModelType]:
+            desc: bool = False,
+            projection: Projection = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ) -> List[Union[ModelType, dict]]:
+        """Not Implemented"""
+
+    async def count_by_filters(self, filters: dict = None) -> int:
         """Not Implemented"""
 
     async def create(self, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
@@ -37,5 +61,25 @@ class BaseRepositoryABC(ABC):
     ) -> ModelType:
         """Not Implemented"""
 
+    async def create_many(
+            self,
+            objs_in: List[Union[CreateSchemaType, Dict[str, Any]]],
+            chunk_size: int = 1000,
+            return_primary_keys: bool = False
+    ) -> Optional[List[Any]]:
+        """Not Implemented"""
+
+    async def update_many(
+            self,
+            obj_in: Union[UpdateSchemaType, Dict[str, Any]] = None,
+            filters: dict = None,
+            db_objs: List[ModelType] = None,
+            chunk_size: int = 1000
+    ) -> int:
+        """Not Implemented"""
+
+    async def delete_by_filters(self, filters: dict) -> int:
+        """Not Implemented"""
+
     async def delete(self, obj: ModelType):
         """Not Implemented"""
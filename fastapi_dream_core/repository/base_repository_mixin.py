@@ -0,0 +1,350 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from sqlalchemy import insert, update, delete, select as sa_select
+from sqlalchemy.engine import Dialect
+from sqlmodel import select, desc as descending, func
+
+from fastapi_dream_core.constants import ModelType, CreateSchemaType, UpdateSchemaType, Projection
+from fastapi_dream_core.database.unit_of_work import unit_of_work_active
+from fastapi_dream_core.pagination import PageQuery, TotalCountMode
+from fastapi_dream_core.repository.bulk import chunked, grouped_chunks, model_rows, update_by_primary_key_statement, \
+    update_params
+from fastapi_dream_core.repository.filters import sanitize_filters, filter_conditions
+from fastapi_dream_core.repository.keyset_pagination import KeysetPagination
+from fastapi_dream_core.repository.loaders import LoadStrategy, loader_options, merge_loaders, has_eager_loaders, \
+    has_joined_loaders
+from fastapi_dream_core.repository.total_count import TotalCountCache, estimated_count_statement
+from fastapi_dream_core.repository.query_cache import RepositoryQueryCache, AsyncRepositoryQueryCache
+
+
+class BaseRepositoryMixin:
+    """
+    The statements, the query cache and the conversion of rows shared by BaseRepository and AsyncBaseRepository,
+    the repositories only open the sessions and execute the statements built here
+    """
+
+    def __init__(
+            self,
+            session_factory: Callable[..., Any],
+            model: Type[ModelType],
+            count_mode: TotalCountMode = TotalCountMode.EXACT,
+            count_cache_seconds: int = 60,
+            read_session_factory: Callable[..., Any] = None,
+            query_cache: Union[RepositoryQueryCache, AsyncRepositoryQueryCache] = None,
+            loaders: Dict[str, LoadStrategy] = None
+    ):
+        '''
+        The constructor received the session factory and the model of repository
+        :param session_factory: The factory of sessions, example: DatabaseSQLModel.session,
+                AsyncDatabaseSQLModel.session for AsyncBaseRepository
+        :param model: The model of repository, example: UserModel, ItemModel
+        :param count_mode: How find_by_filters_paginated resolve the total
+                EXACT: COUNT(*) OVER() in the page query, or a COUNT(*) in the same session
+                CACHED: exact count reused for count_cache_seconds by filters
+                ESTIMATED: table statistics when there is no filters, CACHED otherwise
+        :param count_cache_seconds: Seconds that a total is reused in CACHED and ESTIMATED modes
+        :param read_session_factory: The factory of sessions used by find_* and count_by_filters,
+                example: DatabaseSQLModel.read_session, the session_factory when not informed
+        :param query_cache: Cache of find_* and count_by_filters results, invalidated by create/update/delete
+                of the model, example: RepositoryQueryCache(RedisCacheDriver()), without cache when not informed,
+                AsyncRepositoryQueryCache(AsyncRedisCacheDriver()) for AsyncBaseRepository
+        :param loaders: The default loading strategy of relationships in find_* by relationship name, '*' for all,
+                example: {'items': LoadStrategy.SELECTIN, '*': LoadStrategy.RAISE}
+        '''
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory if read_session_factory else session_factory
+        self.model = model
+        self.count_mode = count_mode
+        self._count_cache = TotalCountCache(seconds_for_expire=count_cache_seconds)
+        self.query_cache = query_cache
+        self.loaders = loaders if loaders else {}
+
+    def _sanitize_filters(self, filters: Optional[dict]) -> dict:
+        """
+        This method received the filters for query and return only the filters of columns of model
+        passed in constructor, the keys can have an operator, example: {'age__gte': 18, 'status__in': ['A']},
+        see fastapi_dream_core.repository.filters
+        :param filters: A dict with filters, example {'id': 1, 'name': 'foo'}
+        :return: return the filters dict with only correct filters
+        """
+        return sanitize_filters(self.model, filters) if filters else {}
+
+    def _conditions(self, filters: dict) -> list:
+        return filter_conditions(self.model, filters)
+
+    def _loaders(self, loaders: Optional[Dict[str, LoadStrategy]]) -> Dict[str, LoadStrategy]:
+        return merge_loaders(self.loaders, loaders)
+
+    @staticmethod
+    def _dialect(session) -> Dialect:
+        # AsyncSession keep the bind in the sync_session
+        return getattr(session, 'sync_session', session).get_bind().dialect
+
+    # Query cache
+
+    def _use_query_cache(self, loaders: Dict[str, LoadStrategy] = None) -> bool:
+        """
+        False without cache, with eager loaders, the cache do not keep relationships, or inside a unit of work,
+        the reads can see writes not committed yet
+        """
+        return bool(self.query_cache) and not (loaders and has_eager_loaders(loaders)) and not unit_of_work_active()
+
+    def _dump_items(self, items: List[Any], columns: Optional[List[str]]) -> List[Any]:
+        return items if columns else self.query_cache.dump_items(self.model, items)
+
+    def _load_items(self, rows: List[Any], columns: Optional[List[str]]) -> List[Any]:
+        return rows if columns else self.query_cache.load_items(self.model, rows)
+
+    def _dump_item(self, item: Any, columns: Optional[List[str]]) -> Any:
+        return item if columns else self.query_cache.dump_item(self.model, item)
+
+    def _load_item(self, values: Any, columns: Optional[List[str]]) -> Any:
+        return values if columns else self.query_cache.load_item(self.model, values)
+
+    # Reads
+
+    def _select_columns(self, columns: Optional[List[str]], *extra_columns):
+        """
+        Build the select of model or only of columns, the columns are validated against the model
+        """
+        if not columns:
+            return select(self.model, *extra_columns) if extra_columns else select(self.model)
+
+        unknown = [column for column in columns if column not in self.model.__table__.columns]
+        if unknown:
+            raise ValueError(f'columns {unknown} do not exist in {self.model.__name__}')
+
+        return sa_select(*[getattr(self.model, column) for column in columns], *extra_columns)
+
+    def _projection_columns(self, projection: Projection) -> Optional[List[str]]:
+        """
+        Return the columns of projection, the fields of a schema that are not columns of model are ignored,
+        a projection without columns raise ValueError instead of select the whole model
+        """
+        if projection is None:
+            return None
+
+        if isinstance(projection, type) and issubclass(projection, BaseModel):
+            table_columns = self.model.__table__.columns
+            columns = [field for field in projection.__fields__ if field in table_columns]
+        else:
+            columns = list(projection)
+
+        if not columns:
+            raise ValueError(f'projection {projection} has no columns of {self.model.__name__}')
+
+        return columns
+
+    @staticmethod
+    def _to_items(rows: List[Any], columns: Optional[List[str]]) -> List[Any]:
+        if not columns:
+            return rows
+
+        return [dict(zip(columns, row)) for row in rows]
+
+    @staticmethod
+    def _to_item(row: Any, columns: Optional[List[str]]) -> Any:
+        if not columns or row is None:
+            return row
+
+        return dict(zip(columns, row))
+
+    def _apply_loaders(self, query, loaders: Dict[str, LoadStrategy], columns: Optional[List[str]] = None):
+        if not loaders or columns:
+            return query
+
+        return query.options(*loader_options(self.model, loaders))
+
+    @staticmethod
+    def _unique(result, loaders: Dict[str, LoadStrategy]):
+        """
+        The joined eager loads of collections repeat the parent in rows, so the result must be unique
+        """
+        return result.unique() if loaders and has_joined_loaders(loaders) else result
+
+    def _apply_order(self, query, order: Optional[str], desc: bool):
+        if order and hasattr(self.model, order):
+            query = query.order_by(descending(order)) if desc else query.order_by(order)
+
+        return query
+
+    def _find_statement(
+            self,
+            filters: dict,
+            loaders: Dict[str, LoadStrategy],
+            columns: Optional[List[str]] = None,
+            order: Optional[str] = None,
+            desc: bool = False,
+            extra_columns: tuple = ()
+    ):
+        """
+        The select of find_* with filters, loaders and order, of the model or only of columns
+        """
+        query = self._select_columns(columns, *extra_columns).where(*self._conditions(filters))
+        query = self._apply_loaders(query=query, loaders=loaders, columns=columns)
+        return self._apply_order(query=query, order=order, desc=desc)
+
+    def _page_statement(
+            self,
+            page_query: PageQuery,
+            filters: dict,
+            loaders: Dict[str, LoadStrategy],
+            columns: Optional[List[str]],
+            order: str,
+            desc: bool,
+            with_total: bool = False
+    ):
+        """
+        The select of a page, with_total add COUNT(*) OVER() as last column of rows
+        """
+        extra_columns = (func.count().over(),) if with_total else ()
+        query = self._find_statement(filters, loaders, columns, order, desc, extra_columns)
+        return query.offset(page_query.get_offset()).limit(page_query.size)
+
+    def _page_items_with_total(self, rows: List[Any], columns: Optional[List[str]]) -> Tuple[List[Any], int]:
+        """
+        Split the rows of _page_statement with_total in items and total
+        """
+        items = self._to_items(rows, columns) if columns else [row[0] for row in rows]
+        return items, rows[0][-1]
+
+    @staticmethod
+    def _keyset_columns(keyset: KeysetPagination, columns: Optional[List[str]]) -> Optional[List[str]]:
+        """
+        The columns selected by a keyset page with projection, the columns of cursor are added when they
+        are not in projection
+        """
+        if not columns:
+            return None
+
+        return columns + [name for name in keyset.key_names if name not in columns]
+
+    def _keyset_statement(
+            self,
+            keyset: KeysetPagination,
+            filters: dict,
+            loaders: Dict[str, LoadStrategy],
+            columns: Optional[List[str]] = None
+    ):
+        query = self._select_columns(self._keyset_columns(keyset, columns)).where(*self._conditions(filters))
+        return self._apply_loaders(query=keyset.apply(query), loaders=loaders, columns=columns)
+
+    def _count_statement(self, filters: dict):
+        return select([func.count()]).select_from(self.model).where(*self._conditions(filters))
+
+    def _estimated_count_statement(self, dialect: Dialect, filters: dict):
+        """
+        The statement of table statistics used by TotalCountMode.ESTIMATED without filters, None otherwise
+        """
+        if self.count_mode != TotalCountMode.ESTIMATED or filters:
+            return None
+
+        return estimated_count_statement(dialect, self.model.__table__.name)
+
+    # Writes
+
+    def _new_model(self, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
+        if isinstance(obj_in, dict):
+            new_obj = self.model()
+
+            for field in obj_in:
+                setattr(new_obj, field, obj_in[field])
+
+            return new_obj
+
+        return self.model(**jsonable_encoder(obj_in))
+
+    @staticmethod
+    def _update_data(obj_in: Union[UpdateSchemaType, Dict[str, Any], None]) -> Dict[str, Any]:
+        if obj_in is None:
+            return {}
+
+        if isinstance(obj_in, dict):
+            return obj_in
+
+        return obj_in.dict(exclude_unset=True)
+
+    def _apply_update(self, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType:
+        obj_data = jsonable_encoder(db_obj)
+        update_data = self._update_data(obj_in)
+
+        for field in obj_data:
+            if field in update_data:
+                setattr(db_obj, field, update_data[field])
+
+        return db_obj
+
+    def _insert_rows(self, objs_in: List[Union[CreateSchemaType, Dict[str, Any]]]) -> List[dict]:
+        return model_rows(self.model, objs_in)
+
+    def _insert_statements(
+            self,
+            rows: List[dict],
+            chunk_size: int,
+            returning: bool
+    ) -> Iterator[Tuple[List[int], Any, Optional[List[dict]]]]:
+        """
+        The INSERT by chunk of rows with the same columns as (indexes of rows, statement, params), with RETURNING
+        of the primary keys the rows are in the statement, otherwise they are the params of executemany
+        """
+        table = self.model.__table__
+
+        for indexes, chunk in grouped_chunks(rows, chunk_size):
+            if returning:
+                yield indexes, insert(table).values(chunk).returning(*table.primary_key.columns), None
+            else:
+                yield indexes, insert(table), chunk
+
+    def _returned_primary_keys(self, result) -> List[Any]:
+        if len(self.model.__table__.primary_key.columns) == 1:
+            return [row[0] for row in result]
+
+        return [tuple(row) for row in result]
+
+    def _update_by_primary_key_statements(
+            self,
+            db_objs: List[ModelType],
+            update_data: Dict[str, Any],
+            chunk_size: int
+    ) -> Iterator[Tuple[Any, List[dict]]]:
+        """
+        Apply update_data in the Models and return the UPDATE by primary key with the params of each chunk
+        """
+        columns = self.model.__table__.columns.keys()
+
+        for db_obj in db_objs:
+            for field in update_data:
+                if field in columns:
+                    setattr(db_obj, field, update_data[field])
+
+        statement = update_by_primary_key_statement(self.model)
+        for chunk in chunked(list(db_objs), chunk_size):
+            yield statement, [update_params(self.model, db_obj) for db_obj in chunk]
+
+    def _update_by_filters_statement(self, update_data: Dict[str, Any], filters: Optional[dict]):
+        """
+        The UPDATE ... WHERE of update_many, None when there is no value to update
+        """
+        if filters is None:
+            raise ValueError('update_many expected filters or db_objs')
+
+        values = {field: value for field, value in update_data.items() if hasattr(self.model, field)}
+        if not values:
+            return None
+
+        filters = self._sanitize_filters(filters)
+        if not filters:
+            raise ValueError('update_many expected at least one valid filter')
+
+        statement = update(self.model).where(*self._conditions(filters)).values(**values)
+        return statement.execution_options(synchronize_session=False)
+
+    def _delete_by_filters_statement(self, filters: dict):
+        filters = self._sanitize_filters(filters)
+        if not filters:
+            raise ValueError('delete_by_filters expected at least one valid filter')
+
+        statement = delete(self.model).where(*self._conditions(filters))
+        return statement.execution_options(synchronize_session=False)
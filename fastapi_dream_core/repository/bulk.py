@@ -0,0 +1,110 @@
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Type, Union
+
+from pydantic import BaseModel
+from sqlalchemy import bindparam, update
+from sqlalchemy.engine import Dialect
+
+from fastapi_dream_core.constants import ModelType
+
+PRIMARY_KEY_PARAM_PREFIX = '_pk_'
+VALUE_PARAM_PREFIX = '_value_'
+
+
+def chunked(rows: List[Any], chunk_size: int) -> Iterator[List[Any]]:
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size should be greater than 0, received {chunk_size}')
+
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
+
+def supports_insert_returning(dialect: Dialect) -> bool:
+    """
+    Check if the dialect support INSERT ... RETURNING with many VALUES
+    :param dialect: The dialect of engine bound to the session
+    :return: True when RETURNING can be used
+    """
+    return bool(getattr(dialect, 'insert_returning', getattr(dialect, 'full_returning', False)))
+
+
+def to_model(model: Type[ModelType], obj_in: Union[ModelType, BaseModel, Dict[str, Any]]) -> ModelType:
+    if isinstance(obj_in, model):
+        return obj_in
+
+    if isinstance(obj_in, dict):
+        return model(**obj_in)
+
+    return model(**obj_in.dict())
+
+
+def model_rows(model: Type[ModelType], objs_in: Iterable[Union[ModelType, BaseModel, Dict[str, Any]]]) -> List[dict]:
+    """
+    Convert the objects in rows for INSERT, like the ORM a None is not written in the primary keys and in the columns
+    with default or server_default, so autoincrement and the defaults of database are used
+    :param model: The model of repository
+    :param objs_in: The Models, BaseModels or dicts of data
+    :return: A list of dict by column, the rows can have different columns, see grouped_chunks
+    """
+    columns = list(model.__table__.columns)
+    rows = []
+
+    for obj_in in objs_in:
+        obj = to_model(model, obj_in)
+        row = {}
+
+        for column in columns:
+            value = getattr(obj, column.key, None)
+            has_default = column.primary_key or column.default is not None or column.server_default is not None
+            if value is None and has_default:
+                continue
+
+            row[column.key] = value
+
+        rows.append(row)
+
+    return rows
+
+
+def grouped_chunks(rows: List[dict], chunk_size: int) -> Iterator[Tuple[List[int], List[dict]]]:
+    """
+    Group the rows by their columns in chunks, one INSERT ... VALUES or one executemany need the same columns
+    in all rows, the indexes of rows in the list are returned with each chunk
+    :param rows: The rows of model_rows
+    :param chunk_size: The max of rows by chunk
+    :return: Iterator of (indexes, rows)
+    """
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    for index, row in enumerate(rows):
+        groups.setdefault(tuple(row), []).append(index)
+
+    for indexes in groups.values():
+        for chunk in chunked(indexes, chunk_size):
+            yield chunk, [rows[index] for index in chunk]
+
+
+def update_by_primary_key_statement(model: Type[ModelType]):
+    """
+    Create the UPDATE of all columns by primary key used with executemany, params are created by update_params
+    :param model: The model of repository
+    :return: The statement
+    """
+    table = model.__table__
+    statement = update(table)
+
+    for column in table.primary_key.columns:
+        statement = statement.where(column == bindparam(PRIMARY_KEY_PARAM_PREFIX + column.key))
+
+    return statement.values({
+        column.key: bindparam(VALUE_PARAM_PREFIX + column.key)
+        for column in table.columns if not column.primary_key
+    })
+
+
+def update_params(model: Type[ModelType], db_obj: ModelType) -> dict:
+    params = {}
+
+    for column in model.__table__.columns:
+        prefix = PRIMARY_KEY_PARAM_PREFIX if column.primary_key else VALUE_PARAM_PREFIX
+        params[prefix + column.key] = getattr(db_obj, column.key, None)
+
+    return params
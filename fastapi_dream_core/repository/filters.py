@@ -0,0 +1,185 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
+
+from fastapi import Request
+
+from fastapi_dream_core.constants import ModelType
+from fastapi_dream_core.exceptions import InvalidFilter
+
+LOOKUP_SEPARATOR = '__'
+
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    'eq': lambda column, value: column == value,
+    'ne': lambda column, value: column != value,
+    'gt': lambda column, value: column > value,
+    'gte': lambda column, value: column >= value,
+    'lt': lambda column, value: column < value,
+    'lte': lambda column, value: column <= value,
+    'in': lambda column, value: column.in_(value),
+    'not_in': lambda column, value: column.not_in(value),
+    'like': lambda column, value: column.like(value),
+    'ilike': lambda column, value: column.ilike(value),
+    'startswith': lambda column, value: column.startswith(value, autoescape=True),
+    'endswith': lambda column, value: column.endswith(value, autoescape=True),
+    'contains': lambda column, value: column.contains(value, autoescape=True),
+    'isnull': lambda column, value: column.is_(None) if value else column.is_not(None),
+}
+
+LIST_OPERATORS = ('in', 'not_in')
+TEXT_OPERATORS = ('like', 'ilike', 'startswith', 'endswith', 'contains')
+TRUE_VALUES = ('1', 'true', 'yes')
+
+RESERVED_QUERY_PARAMS = ('page', 'size', 'cursor', 'include_total', 'order', 'desc')
+
+
+@lru_cache(maxsize=None)
+def model_columns(model: Type[ModelType]) -> Dict[str, Any]:
+    """
+    The columns of model by name, built once by model
+    """
+    return {name: getattr(model, name) for name in model.__table__.columns.keys()}
+
+
+def parse_filter_key(model: Type[ModelType], key: str) -> Tuple[str, str]:
+    """
+    Split the key of filter in column and operator, example: 'age__gte' -> ('age', 'gte'), 'age' -> ('age', 'eq')
+    :raise KeyError: When the column do not exists in model
+    :raise InvalidFilter: When the operator do not exists
+    """
+    columns = model_columns(model)
+    if key in columns:
+        return key, 'eq'
+
+    name, separator, operator = key.rpartition(LOOKUP_SEPARATOR)
+    if not separator or name not in columns:
+        raise KeyError(key)
+
+    if operator not in OPERATORS:
+        raise InvalidFilter(f'Invalid filter operator {operator} in {key}!')
+
+    return name, operator
+
+
+def sanitize_filters(model: Type[ModelType], filters: dict) -> dict:
+    """
+    Return the filters with only the keys of columns of model, the unknown columns are removed and
+    an unknown operator raise InvalidFilter
+    :param model: The model of repository
+    :param filters: A dict with filters, example {'id': 1, 'age__gte': 18, 'status__in': ['A', 'B']}
+    :return: dict
+    """
+    if not isinstance(filters, dict):
+        raise ValueError(f'filters should be a dict, received {type(filters)}')
+
+    sanitized = {}
+    for key, value in filters.items():
+        try:
+            parse_filter_key(model, key)
+        except KeyError:
+            continue
+
+        sanitized[key] = value
+
+    return sanitized
+
+
+def filter_conditions(model: Type[ModelType], filters: dict) -> List[Any]:
+    """
+    Compile sanitized filters to SQL conditions
+    :param model: The model of repository
+    :param filters: A dict with filters returned by sanitize_filters
+    :return: The list of conditions for query.where(*conditions)
+    """
+    columns = model_columns(model)
+    conditions = []
+
+    for key, value in filters.items():
+        name, operator = parse_filter_key(model, key)
+        value = _coerce(model, name, operator, value)
+        conditions.append(OPERATORS[operator](columns[name], value))
+
+    return conditions
+
+
+def _coerce(model: Type[ModelType], name: str, operator: str, value: Any) -> Any:
+    if operator == 'isnull':
+        return value.lower() in TRUE_VALUES if isinstance(value, str) else bool(value)
+
+    if operator in LIST_OPERATORS:
+        if isinstance(value, str):
+            value = value.split(',')
+
+        if not isinstance(value, (list, tuple, set, frozenset)):
+            raise InvalidFilter(f'Invalid filter {name}__{operator}, expected a list!')
+
+        return [_validate(model, name, item) for item in value]
+
+    if operator in TEXT_OPERATORS:
+        return value
+
+    return _validate(model, name, value)
+
+
+def _validate(model: Type[ModelType], name: str, value: Any) -> Any:
+    """
+    Coerce the values received as text, example from query params, to the type of field of model
+    """
+    field = model.__fields__.get(name)
+    if field is None or value is None or not isinstance(value, str):
+        return value
+
+    value, error = field.validate(value, {}, loc=name)
+    if error:
+        raise InvalidFilter(f'Invalid value for filter {name}!')
+
+    return value
+
+
+def query_filters(
+        allowed: Dict[str, Iterable[str]],
+        extra_params: Iterable[str] = ()
+) -> Callable[[Request], dict]:
+    """
+    Build a FastAPI dependency that return the query params as filters, only the fields and operators
+    of allowed are accepted, example: /users?age__gte=18&status__in=A,B&deleted_at__isnull=true.
+    The params with the shape field__operator and the fields of allowed are filters, a filter not allowed
+    raise InvalidFilter. The other params, like the params of pagination or of the endpoint, are not filters
+
+        user_filters = query_filters({'age': ('eq', 'gte', 'lte'), 'status': ('in',), 'deleted_at': ('isnull',)})
+
+        async def list_users(page_query: PageQuery = Depends(), filters: dict = Depends(user_filters)):
+            return await repository.find_by_filters_paginated(page_query=page_query, filters=filters)
+
+    :param allowed: The operators allowed by field, the filter without operator, example ?age=18, is 'eq'
+    :param extra_params: The params of endpoint that are never filters, also with the shape field__operator
+    :return: The dependency
+    """
+    allowed = {name: frozenset(operators) for name, operators in allowed.items()}
+    ignored = frozenset(RESERVED_QUERY_PARAMS).union(extra_params)
+
+    for name, operators in allowed.items():
+        unknown = operators.difference(OPERATORS)
+        if unknown:
+            raise ValueError(f'Unknown filter operators {sorted(unknown)} for {name}')
+
+    def dependency(request: Request) -> dict:
+        filters = {}
+        for key, value in request.query_params.items():
+            if key in ignored:
+                continue
+
+            if key in allowed:
+                name, operator = key, 'eq'
+            elif LOOKUP_SEPARATOR in key:
+                name, _, operator = key.rpartition(LOOKUP_SEPARATOR)
+            else:
+                continue
+
+            if operator not in allowed.get(name, ()):
+                raise InvalidFilter(f'Filter {key} is not allowed!')
+
+            filters[key] = value
+
+        return filters
+
+    return dependency
@@ -0,0 +1,178 @@
+from typing import Any, List, Optional, Sequence, Tuple, Type, Union
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, or_, case, false
+
+from fastapi_dream_core.constants import ModelType
+from fastapi_dream_core.exceptions import InvalidCursor
+from fastapi_dream_core.pagination import CursorPage, CursorPageQuery
+from fastapi_dream_core.pagination.pagination import encode_cursor, decode_cursor
+
+
+class KeysetPagination:
+
+    def __init__(self, model: Type[ModelType], cursor_query: CursorPageQuery, order: str = 'id', desc: bool = False):
+        """
+        Seek pagination by the order column with all columns of primary key as tiebreaker, the cost of any page
+        is the same when the database have an index on (order, primary key).
+        The NULLs of a nullable order column are after all values in ASC and before them in DESC
+        :param model: The model of repository
+        :param cursor_query: The obj CursorPageQuery (cursor, size and include_total)
+        :param order: The field for ordering select in database, the primary key when do not exists in model
+        :param desc: When False the select is using ASC, when True the select is using DESC
+        """
+        if not isinstance(cursor_query, CursorPageQuery):
+            raise ValueError(f'cursor_query should be a CursorPageQuery obj, received {type(cursor_query)}')
+
+        primary_key_names = [column.key for column in model.__table__.primary_key.columns]
+
+        self._model = model
+        self._cursor_query = cursor_query
+        self._desc = desc
+        self._primary_key_names = primary_key_names
+        self._order_name = order if hasattr(model, order) else primary_key_names[0]
+        self._key_names = [self._order_name] + [name for name in primary_key_names if name != self._order_name]
+        self._cursor = decode_cursor(cursor_query.cursor) if cursor_query.cursor else None
+
+        if self._cursor and (self._cursor.get('o') != self._order_name or self._cursor.get('d') != desc):
+            raise InvalidCursor()
+
+        self._backwards = bool(self._cursor.get('p')) if self._cursor else False
+
+    @property
+    def key_names(self) -> List[str]:
+        """
+        The order column and the primary key columns, the values of cursor
+        """
+        return list(self._key_names)
+
+    def __keys(self) -> List[Tuple[Any, bool]]:
+        """
+        The columns of seek, the order column and the primary key columns, with True when the column is nullable
+        """
+        table_columns = self._model.__table__.columns
+        return [(getattr(self._model, name), table_columns[name].nullable) for name in self._key_names]
+
+    def apply(self, query):
+        """
+        Apply the seek condition, the ordering and the limit (size + 1 to know if there is more items) in query
+        :param query: The select of model with filters applied
+        :return: The select
+        """
+        keys = self.__keys()
+        ascending = self._desc == self._backwards
+
+        if self._cursor:
+            values = self.__cursor_values()
+            query = query.where(self.__seek_condition(keys, values, ascending))
+
+        order_by = []
+        for column, nullable in keys:
+            if nullable:
+                # Portable NULLS LAST in ASC and NULLS FIRST in DESC, not all databases support the syntax
+                is_null = case((column.is_(None), 1), else_=0)
+                order_by.append(is_null if ascending else is_null.desc())
+
+            order_by.append(column if ascending else column.desc())
+
+        return query.order_by(*order_by).limit(self._cursor_query.size + 1)
+
+    @staticmethod
+    def __seek_condition(keys: List[Tuple[Any, bool]], values: List[Any], ascending: bool):
+        """
+        The rows after the cursor in the order of keys, compared column by column:
+        (k1 after v1) OR (k1 = v1 AND k2 after v2) OR ...
+        """
+        conditions = []
+        equal = []
+
+        for (column, nullable), value in zip(keys, values):
+            conditions.append(and_(*equal, KeysetPagination.__after(column, nullable, value, ascending)))
+            equal.append(column.is_(None) if value is None else column == value)
+
+        return or_(*conditions)
+
+    @staticmethod
+    def __after(column, nullable: bool, value: Any, ascending: bool):
+        if ascending:
+            if value is None:
+                return false()
+
+            return or_(column > value, column.is_(None)) if nullable else column > value
+
+        if value is None:
+            return column.is_not(None)
+
+        return column < value
+
+    def create_page(
+            self,
+            rows: Sequence[Union[ModelType, dict]],
+            total: Optional[int] = None,
+            columns: Optional[List[str]] = None
+    ) -> CursorPage:
+        """
+        Create the CursorPage with next and previous cursors from rows returned by the query of apply
+        :param rows: The rows of select, Models or dicts with the columns of key_names
+        :param total: The total of items when include_total
+        :param columns: The columns of projection, the items are dicts with only these columns
+        :return: CursorPage
+        """
+        items = list(rows[:self._cursor_query.size])
+        has_more = len(rows) > self._cursor_query.size
+
+        if self._backwards:
+            items.reverse()
+
+        next_cursor = None
+        previous_cursor = None
+
+        if items:
+            if self._backwards or has_more:
+                next_cursor = self.__item_cursor(items[-1], backwards=False)
+
+            if (self._backwards and has_more) or (not self._backwards and self._cursor):
+                previous_cursor = self.__item_cursor(items[0], backwards=True)
+
+        if columns:
+            items = [{column: item[column] for column in columns} for item in items]
+
+        return CursorPage.create(
+            items=items,
+            total=total,
+            cursor_query=self._cursor_query,
+            next_cursor=next_cursor,
+            previous_cursor=previous_cursor
+        )
+
+    @staticmethod
+    def __value(item: Union[ModelType, dict], name: str) -> Any:
+        return item[name] if isinstance(item, dict) else getattr(item, name)
+
+    def __item_cursor(self, item: Union[ModelType, dict], backwards: bool) -> str:
+        return encode_cursor({
+            'o': self._order_name,
+            'd': self._desc,
+            'v': jsonable_encoder(self.__value(item, self._order_name)),
+            'k': [jsonable_encoder(self.__value(item, name)) for name in self._key_names[1:]],
+            'p': backwards
+        })
+
+    def __cursor_values(self) -> List[Any]:
+        primary_key_values = self._cursor.get('k')
+        if not isinstance(primary_key_values, list) or len(primary_key_values) != len(self._key_names) - 1:
+            raise InvalidCursor()
+
+        raw_values = [self._cursor.get('v')] + primary_key_values
+        return [self.__cursor_value(name, value) for name, value in zip(self._key_names, raw_values)]
+
+    def __cursor_value(self, name: str, value: Any) -> Any:
+        field = self._model.__fields__.get(name)
+        if field is None or value is None:
+            return value
+
+        value, error = field.validate(value, {}, loc=name)
+        if error:
+            raise InvalidCursor()
+
+        return value
@@ -0,0 +1,72 @@
+from enum import Enum
+from typing import Dict, List, Optional, Type
+
+from sqlalchemy.orm import selectinload, joinedload, subqueryload, raiseload, lazyload, noload, RelationshipProperty
+
+from fastapi_dream_core.constants import ModelType
+
+ALL_RELATIONSHIPS = '*'
+
+
+class LoadStrategy(str, Enum):
+    SELECTIN = 'selectin'
+    JOINED = 'joined'
+    SUBQUERY = 'subquery'
+    RAISE = 'raise'
+    LAZY = 'lazy'
+    NOLOAD = 'noload'
+
+
+LOADERS = {
+    LoadStrategy.SELECTIN: selectinload,
+    LoadStrategy.JOINED: joinedload,
+    LoadStrategy.SUBQUERY: subqueryload,
+    LoadStrategy.RAISE: raiseload,
+    LoadStrategy.LAZY: lazyload,
+    LoadStrategy.NOLOAD: noload,
+}
+
+EAGER_STRATEGIES = (LoadStrategy.SELECTIN, LoadStrategy.JOINED, LoadStrategy.SUBQUERY)
+
+
+def merge_loaders(
+        default_loaders: Optional[Dict[str, LoadStrategy]],
+        loaders: Optional[Dict[str, LoadStrategy]]
+) -> Dict[str, LoadStrategy]:
+    merged = dict(default_loaders) if default_loaders else {}
+    merged.update(loaders if loaders else {})
+    return merged
+
+
+def loader_options(model: Type[ModelType], loaders: Dict[str, LoadStrategy]) -> List:
+    """
+    Build the loader options of query by relationship name, '*' apply the strategy to the relationships
+    that are not informed, example: {'items': LoadStrategy.SELECTIN, '*': LoadStrategy.RAISE}
+    :param model: The model of repository
+    :param loaders: The strategy by relationship name
+    :return: The options for query.options(*options)
+    """
+    options = []
+
+    for name, strategy in loaders.items():
+        loader = LOADERS[LoadStrategy(strategy)]
+
+        if name == ALL_RELATIONSHIPS:
+            options.append(loader('*'))
+            continue
+
+        attribute = getattr(model, name, None)
+        if not isinstance(getattr(attribute, 'property', None), RelationshipProperty):
+            raise ValueError(f'relationship {name} do not exist in {model.__name__}')
+
+        options.append(loader(attribute))
+
+    return options
+
+
+def has_eager_loaders(loaders: Dict[str, LoadStrategy]) -> bool:
+    return any(LoadStrategy(strategy) in EAGER_STRATEGIES for strategy in loaders.values())
+
+
+def has_joined_loaders(loaders: Dict[str, LoadStrategy]) -> bool:
+    return any(LoadStrategy(strategy) == LoadStrategy.JOINED for strategy in loaders.values())
@@ -0,0 +1,167 @@
+import hashlib
+from typing import Any, Iterable, List, Optional, Tuple, Type
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from fastapi_dream_core.cache_driver import serializer
+from fastapi_dream_core.cache_driver.async_cache_driver_abc import AsyncCacheDriverABC
+from fastapi_dream_core.cache_driver.cache_driver_abc import CacheDriverABC
+from fastapi_dream_core.cache_driver.cache_generation import CacheGeneration, AsyncCacheGeneration
+from fastapi_dream_core.constants import ModelType
+
+
+class BaseQueryCache:
+
+    def __init__(self, seconds_for_expire: int = 60, prefix: str = 'repository'):
+        """
+        The keys, the serialization and the stats shared by RepositoryQueryCache and AsyncRepositoryQueryCache.
+        The results are stored as JSON of the values of columns, see fastapi_dream_core.cache_driver.serializer
+        """
+        self.seconds_for_expire = seconds_for_expire
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def namespace(model: Type[ModelType]) -> str:
+        return model.__table__.name
+
+    def _key(self, model: Type[ModelType], generation: int, method: str, params: dict) -> str:
+        normalized = tuple(
+            (name, tuple(sorted((key, repr(item)) for key, item in value.items()))
+             if isinstance(value, dict) else repr(value))
+            for name, value in sorted(params.items())
+        )
+        digest = hashlib.sha1(repr(normalized).encode()).hexdigest()
+
+        return f'{self.prefix}:{self.namespace(model)}:{generation}:{method}:{digest}'
+
+    def _decode(self, data: Optional[bytes]) -> Tuple[bool, Any]:
+        if data is not None:
+            try:
+                value = serializer.loads(data)
+            except (ValueError, TypeError):
+                value = None
+            else:
+                self.hits += 1
+                return True, value
+
+        self.misses += 1
+        return False, None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0
+        }
+
+    @staticmethod
+    def dump_item(model: Type[ModelType], item: Optional[ModelType]) -> Optional[tuple]:
+        """
+        Serialize a Model as a tuple of the values of columns, without the names of columns
+        """
+        if item is None:
+            return None
+
+        return tuple(getattr(item, column) for column in model.__table__.columns.keys())
+
+    @staticmethod
+    def load_item(model: Type[ModelType], values: Optional[Iterable[Any]]) -> Optional[ModelType]:
+        """
+        Build the Model from the values of dump_item as a detached instance, like a Model loaded by a session
+        already closed, so update and delete of repository work with it
+        """
+        if values is None:
+            return None
+
+        item = model(**dict(zip(model.__table__.columns.keys(), values)))
+        make_transient_to_detached(item)
+        return item
+
+    @classmethod
+    def dump_items(cls, model: Type[ModelType], items: Iterable[ModelType]) -> List[tuple]:
+        return [cls.dump_item(model, item) for item in items]
+
+    @classmethod
+    def load_items(cls, model: Type[ModelType], rows: Iterable[Iterable[Any]]) -> List[ModelType]:
+        return [cls.load_item(model, values) for values in rows]
+
+
+class RepositoryQueryCache(BaseQueryCache):
+
+    def __init__(
+            self,
+            cache_driver: CacheDriverABC,
+            seconds_for_expire: int = 60,
+            generation: CacheGeneration = None,
+            prefix: str = 'repository'
+    ):
+        """
+        Cache of repository reads, the keys have the generation of the model so create/update/delete
+        of the model bump the generation and all results of the model are invalidated without scan keys
+        :param cache_driver: The driver that store the results, example: RedisCacheDriver()
+        :param seconds_for_expire: Seconds that a result is kept in cache
+        :param generation: The generation counters of models, by default stored in the same cache_driver
+        :param prefix: The prefix of keys in cache
+        """
+        super(RepositoryQueryCache, self).__init__(seconds_for_expire=seconds_for_expire, prefix=prefix)
+        self.cache_driver = cache_driver
+        self.generation = generation if generation else CacheGeneration(cache_driver=cache_driver)
+
+    def key(self, model: Type[ModelType], method: str, **params) -> str:
+        """
+        Build the key of a read, the params are normalized so the order of filters do not change the key
+        :param model: The model of repository
+        :param method: The name of read method, example: find_one_by_filters
+        :param params: The filters, order, desc and page of the read
+        :return: str
+        """
+        return self._key(model, self.generation.get(self.namespace(model)), method, params)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Return (True, value) when the key is in cache and (False, None) otherwise
+        """
+        return self._decode(self.cache_driver.get(key))
+
+    def set(self, key: str, value: Any) -> None:
+        self.cache_driver.set(key, serializer.dumps(value), seconds_for_expire=self.seconds_for_expire)
+
+    def invalidate(self, model: Type[ModelType]) -> None:
+        self.generation.bump(self.namespace(model))
+
+
+class AsyncRepositoryQueryCache(BaseQueryCache):
+
+    def __init__(
+            self,
+            cache_driver: AsyncCacheDriverABC,
+            seconds_for_expire: int = 60,
+            generation: AsyncCacheGeneration = None,
+            prefix: str = 'repository'
+    ):
+        """
+        RepositoryQueryCache of AsyncBaseRepository, the driver is awaited so a remote cache do not block
+        the event loop, example: AsyncRepositoryQueryCache(AsyncRedisCacheDriver())
+        :param cache_driver: The async driver that store the results
+        :param seconds_for_expire: Seconds that a result is kept in cache
+        :param generation: The generation counters of models, by default stored in the same cache_driver
+        :param prefix: The prefix of keys in cache
+        """
+        super(AsyncRepositoryQueryCache, self).__init__(seconds_for_expire=seconds_for_expire, prefix=prefix)
+        self.cache_driver = cache_driver
+        self.generation = generation if generation else AsyncCacheGeneration(cache_driver=cache_driver)
+
+    async def key(self, model: Type[ModelType], method: str, **params) -> str:
+        return self._key(model, await self.generation.get(self.namespace(model)), method, params)
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        return self._decode(await self.cache_driver.get(key))
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.cache_driver.set(key, serializer.dumps(value), seconds_for_expire=self.seconds_for_expire)
+
+    async def invalidate(self, model: Type[ModelType]) -> None:
+        await self.generation.bump(self.namespace(model))
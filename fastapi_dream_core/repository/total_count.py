@@ -0,0 +1,90 @@
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql.elements import TextClause
+
+
+def supports_window_functions(dialect: Dialect) -> bool:
+    """
+    Check if the dialect support `COUNT(*) OVER()`, used to run the page and the total in one statement
+    :param dialect: The dialect of engine bound to the session
+    :return: True when the database support window functions
+    """
+    if dialect.name in ('postgresql', 'mssql', 'oracle'):
+        return True
+
+    if dialect.name == 'sqlite':
+        sqlite_version = getattr(dialect.dbapi, 'sqlite_version_info', (0,))
+        return tuple(sqlite_version) >= (3, 25)
+
+    if dialect.name in ('mysql', 'mariadb'):
+        server_version = dialect.server_version_info or (0,)
+        if getattr(dialect, 'is_mariadb', False):
+            return tuple(server_version) >= (10, 2)
+
+        return tuple(server_version) >= (8, 0)
+
+    return False
+
+
+def estimated_count_statement(dialect: Dialect, table_name: str) -> Optional[TextClause]:
+    """
+    Return the statement that read the estimated rows of table from database statistics
+    :param dialect: The dialect of engine bound to the session
+    :param table_name: The name of table
+    :return: The statement or None when the dialect do not have statistics
+    """
+    if dialect.name == 'postgresql':
+        return text(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"
+        ).bindparams(table_name=table_name)
+
+    if dialect.name in ('mysql', 'mariadb'):
+        return text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        ).bindparams(table_name=table_name)
+
+    return None
+
+
+class TotalCountCache:
+
+    def __init__(self, seconds_for_expire: int = 60, max_entries: int = 1024):
+        """
+        In process cache of totals by filters, used by TotalCountMode.CACHED
+        :param seconds_for_expire: Seconds that a total is reused before count again
+        :param max_entries: Max of filters combinations kept, the oldest is removed first
+        """
+        self._seconds_for_expire = seconds_for_expire
+        self._max_entries = max_entries
+        self._totals: Dict[Hashable, Tuple[float, int]] = {}
+
+    @staticmethod
+    def _key(filters: dict) -> Hashable:
+        return tuple(sorted((key, repr(value)) for key, value in filters.items()))
+
+    def get(self, filters: dict) -> Optional[int]:
+        key = self._key(filters)
+        cached = self._totals.get(key)
+
+        if not cached:
+            return None
+
+        expire_at, total = cached
+        if expire_at < time.monotonic():
+            self._totals.pop(key, None)
+            return None
+
+        return total
+
+    def set(self, filters: dict, total: int) -> None:
+        if len(self._totals) >= self._max_entries:
+            self._totals.pop(next(iter(self._totals)), None)
+
+        self._totals[self._key(filters)] = (time.monotonic() + self._seconds_for_expire, total)
+
+    def clear(self) -> None:
+        self._totals.clear()
@@ -25,7 +25,7 @@ async def health_check():
     description='This endpoint is check if fastapi is ready for connections'
 )
 async def health_check():
-    ready_schema: ReadySchema = ReadySchema(dependencies=Readiness().ready())
+    ready_schema: ReadySchema = ReadySchema(dependencies=await Readiness().ready())
 
     status_code = HTTPStatus.OK
     for dependency in ready_schema.dependencies:
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -16,6 +16,8 @@ class AliveSchema(BaseModel):
 class DependencyHealthCheckSchema(BaseModel):
     name: str
     ready: bool
+    latency_ms: Optional[float] = None
+    details: Optional[dict] = None
 
 
 class ReadySchema(BaseModel):
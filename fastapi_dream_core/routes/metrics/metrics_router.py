@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from fastapi_dream_core.metrics.metrics_registry import MetricsRegistry
+
+metrics_router = APIRouter()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+
+@metrics_router.get(
+    path='/metrics',
+    response_class=PlainTextResponse,
+    description='This endpoint return the metrics of service in the Prometheus text format'
+)
+async def metrics():
+    return PlainTextResponse(content=MetricsRegistry().render(), media_type=CONTENT_TYPE)
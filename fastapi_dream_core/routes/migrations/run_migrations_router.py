@@ -1,26 +1,30 @@
-import os
-
 from fastapi import APIRouter
 
-from fastapi_dream_core.routes.migrations.run_migrations_schemas import RunMigrationsSchema, MIGRATION_ERROR, \
-    MIGRATION_SUCCESS
+from fastapi_dream_core.helpers.migration_runner import migration_runner
+from fastapi_dream_core.routes.migrations.run_migrations_schemas import RunMigrationsSchema
 
 run_migrations_router = APIRouter()
 
-COMMAND = 'alembic upgrade head'
-
 
 @run_migrations_router.get(
     path='/run',
     response_model=RunMigrationsSchema,
-    description=f'This route execute the command in terminal | COMMAND: "{COMMAND}"'
+    description=f'This route start the command in background | COMMAND: "{migration_runner.command}", '
+                f'only one node run at a time, see the progress in /status'
 )
-async def run_migrations():
-    # Run migrations
-    result = os.system(COMMAND)
+async def run_migrations(wait: bool = False):
+    status = await migration_runner.start()
+
+    if wait:
+        return await migration_runner.wait()
+
+    return status
 
-    if os.WEXITSTATUS(result) > 0:
-        return RunMigrationsSchema(message=MIGRATION_ERROR)
-    else:
-        return RunMigrationsSchema(message=MIGRATION_SUCCESS)
 
+@run_migrations_router.get(
+    path='/status',
+    response_model=RunMigrationsSchema,
+    description='This route return the status and the last lines of output of migrations'
+)
+async def migrations_status():
+    return migration_runner.schema()
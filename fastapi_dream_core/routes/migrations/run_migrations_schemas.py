@@ -1,8 +1,26 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 MIGRATION_SUCCESS = 'Success in run migrations'
 MIGRATION_ERROR = 'Error in run migrations - See more details in logs of services'
+MIGRATION_RUNNING = 'Migrations are running - See the progress in /migrations/status'
+MIGRATION_IDLE = 'Migrations were not run'
+
+
+class MigrationStatusEnum(str, Enum):
+    IDLE = 'IDLE'
+    RUNNING = 'RUNNING'
+    SUCCESS = 'SUCCESS'
+    ERROR = 'ERROR'
 
 
 class RunMigrationsSchema(BaseModel):
     message: str
+    status: MigrationStatusEnum = MigrationStatusEnum.IDLE
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    return_code: Optional[int] = None
+    output: List[str] = []
@@ -1,3 +1,18 @@
-from .logger import logger
+from typing import TYPE_CHECKING
+
+from fastapi_dream_core.lazy_imports import lazy_attributes
+
+from .logger import logger, configure_logger
 from .singleton_meta import Singleton, SingletonMeta
-from .csv_exporter import CSVExporter
+
+# Imported on first access, they import fastapi
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'CSVExporter': '.csv_exporter',
+    'FastJSONResponse': '.json_response',
+    'FastJSONRoute': '.json_response',
+    'use_fast_json': '.json_response',
+})
+
+if TYPE_CHECKING:
+    from .csv_exporter import CSVExporter
+    from .json_response import FastJSONResponse, FastJSONRoute, use_fast_json
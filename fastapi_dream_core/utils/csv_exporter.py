@@ -1,19 +1,53 @@
+import csv as csv_writer
 from io import StringIO
-from typing import List, TypeVar
+from operator import attrgetter
+from typing import Any, Callable, List, Sequence, Tuple, TypeVar, Iterable, AsyncIterable, Iterator, AsyncIterator, \
+    Union
 
 from pydantic import BaseModel
 from fastapi.responses import StreamingResponse
 
 
+class ModelExportValidationError(ValueError):
+
+    def __init__(self, model):
+        super(ModelExportValidationError, self).__init__(f'All items of export should be {model.__name__}')
+
+
 class CSVExporter:
     Model = TypeVar("Model", bound=BaseModel)
     __NEW_LINE = '\n'
 
-    def __init__(self, model: Model, separator: str = ';'):
+    def __init__(self, model: Model, separator: str = ';', chunk_size: int = 64 * 1024, encoding: str = 'utf-8'):
+        """
+        Export models to csv
+        :param model: The model of items, the headers are the title or the name of fields
+        :param separator: The separator of columns
+        :param chunk_size: The min size of each chunk yielded by iter_csv and aiter_csv
+        :param encoding: The encoding of chunks
+        """
         self._MODEL = model
         self._sep = separator
-
-    def __generate_headers(self) -> str:
+        self._chunk_size = chunk_size
+        self._encoding = encoding
+        self._fields = self.__fields_getter(tuple(self._MODEL.__fields__.keys()))
+
+    @staticmethod
+    def __fields_getter(names: Sequence[str]) -> Callable[[Any], Tuple[Any, ...]]:
+        """
+        Return a function that read the values of fields as a tuple, attrgetter return a scalar
+        for one name and raise TypeError without names
+        """
+        if not names:
+            return lambda item: ()
+
+        if len(names) == 1:
+            getter = attrgetter(names[0])
+            return lambda item: (getter(item),)
+
+        return attrgetter(*names)
+
+    def __header_names(self) -> List[str]:
         headers = []
 
         for filed_name, field_model in self._MODEL.__fields__.items():
@@ -22,33 +56,80 @@ class CSVExporter:
             else:
                 headers.append(filed_name)
 
-        return self._sep.join(headers)
+        return headers
 
     def to_csv(self, data: List[Model]) -> StringIO:
-        csv = StringIO()
-        csv.write(self.__generate_headers())
+        """
+        The whole csv in a StringIO, written like iter_csv so the values with separator, quotes or new lines
+        are quoted, use iter_csv or to_csv_streaming_response for exports that do not fit in memory
+        :param data: A list of models
+        """
+        buffer, writer = self.__writer()
+        writer.writerows(self.__row(item) for item in data)
+        return buffer
+
+    def __row(self, item: Model) -> list:
+        if not isinstance(item, self._MODEL):
+            raise ModelExportValidationError(self._MODEL)
+
+        return [
+            '' if value is None else str(value.dict()) if isinstance(value, BaseModel) else value
+            for value in self._fields(item)
+        ]
+
+    def __writer(self):
+        buffer = StringIO()
+        writer = csv_writer.writer(buffer, delimiter=self._sep, lineterminator=self.__NEW_LINE)
+        writer.writerow(self.__header_names())
+        return buffer, writer
+
+    def __flush(self, buffer: StringIO) -> bytes:
+        chunk = buffer.getvalue().encode(self._encoding)
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    def iter_csv(self, data: Iterable[Model]) -> Iterator[bytes]:
+        """
+        Yield the csv encoded in chunks of chunk_size, only one chunk is kept in memory,
+        the values with separator, quotes or new lines are quoted
+        :param data: A list or an iterator of models, example: a generator fed by a server side cursor
+        """
+        buffer, writer = self.__writer()
 
         for item in data:
-            if not isinstance(item, self._MODEL):
-                raise ModelExportValidationError(self._MODEL)
+            writer.writerow(self.__row(item))
+
+            if buffer.tell() >= self._chunk_size:
+                yield self.__flush(buffer)
 
-            item_data = []
-            csv.write(self.__NEW_LINE)
+        if buffer.tell():
+            yield self.__flush(buffer)
 
-            for value in item.dict().values():
-                if not isinstance(value, str) and value is not None:
-                    value = str(value)
+    async def aiter_csv(self, data: AsyncIterable[Model]) -> AsyncIterator[bytes]:
+        """
+        Async version of iter_csv
+        :param data: An async iterator of models
+        """
+        buffer, writer = self.__writer()
 
-                item_data.append(value if value else '')
+        async for item in data:
+            writer.writerow(self.__row(item))
 
-            csv.write(self._sep.join(item_data))
+            if buffer.tell() >= self._chunk_size:
+                yield self.__flush(buffer)
 
-        return csv
+        if buffer.tell():
+            yield self.__flush(buffer)
 
-    def to_csv_streaming_response(self, data: List[Model], filename: str = 'export.csv') -> StreamingResponse:
-        stream = self.to_csv(data=data)
+    def to_csv_streaming_response(
+            self,
+            data: Union[Iterable[Model], AsyncIterable[Model]],
+            filename: str = 'export.csv'
+    ) -> StreamingResponse:
+        content = self.aiter_csv(data) if hasattr(data, '__aiter__') else self.iter_csv(data)
 
-        response = StreamingResponse(iter([stream.getvalue()]), media_type="text/csv")
+        response = StreamingResponse(content, media_type="text/csv")
 
         if not filename.__contains__('.csv'):
             filename += '.csv'
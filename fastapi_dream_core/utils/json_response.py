@@ -0,0 +1,187 @@
+import asyncio
+import dataclasses
+import datetime
+import functools
+import json
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Optional, Set
+from uuid import UUID
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import ModelField
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_default(value: Any) -> Any:
+    """
+    Encode the values that json do not know, with the same result of jsonable_encoder
+    but only for the values that need it, the dicts, lists and scalars are not walked
+    """
+    if isinstance(value, BaseModel):
+        return {field: getattr(value, field) for field in value.__fields__}
+
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+
+    if isinstance(value, Decimal):
+        return float(value)
+
+    if isinstance(value, Enum):
+        return value.value
+
+    if isinstance(value, (UUID, PurePath)):
+        return str(value)
+
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+
+    if isinstance(value, bytes):
+        return value.decode()
+
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+
+    if hasattr(value, '_mapping'):
+        return dict(value._mapping)
+
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def json_dumps(content: Any) -> bytes:
+    """
+    Serialize the content with orjson when it is installed, datetimes, UUIDs and dataclasses are encoded by
+    orjson itself, otherwise with json of standard library, the other values are encoded by json_default
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=json_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse that serialize the content directly, without jsonable_encoder, with orjson when it is installed
+    (pip install fastapi_dream_core[orjson]). When a route return this response FastAPI do not validate
+    the content again with the response_model, example:
+
+        page = await repository.find_by_filters_paginated(page_query, projection=UserListSchema)
+        return FastJSONResponse(page)
+
+    As response_class of a route, with FastJSONRoute or with default_response_class of fast_api_create_app
+    the result of route is validated with the response_model and serialized without jsonable_encoder,
+    see use_fast_json
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def _has_aliases(field: Optional[ModelField], seen: Set[type] = None) -> bool:
+    if field is None:
+        return False
+
+    seen = seen if seen is not None else set()
+    if field.alias != field.name:
+        return True
+
+    if any(_has_aliases(sub_field, seen) for sub_field in (field.sub_fields or [])):
+        return True
+
+    model = field.type_
+    if isinstance(model, type) and issubclass(model, BaseModel) and model not in seen:
+        seen.add(model)
+        return any(_has_aliases(model_field, seen) for model_field in model.__fields__.values())
+
+    return False
+
+
+def _uses_response_parameter(dependant: Dependant) -> bool:
+    if dependant.response_param_name:
+        return True
+
+    return any(_uses_response_parameter(sub_dependant) for sub_dependant in dependant.dependencies)
+
+
+def use_fast_json(route: APIRoute) -> bool:
+    """
+    Make the route return a FastJSONResponse, the result is validated with the response_model and serialized
+    without jsonable_encoder. Only applied when the response_class is FastJSONResponse and the result would be
+    the same of FastAPI: without response_model_include/exclude/exclude_*, aliases in the response_model
+    or a Response parameter, the other routes are not changed
+    :return: True when the route was changed
+    """
+    response_class = route.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+
+    if not (isinstance(response_class, type) and issubclass(response_class, FastJSONResponse)):
+        return False
+
+    if getattr(route.dependant.call, '__fast_json__', False):
+        return True
+
+    if route.response_model_include is not None or route.response_model_exclude is not None \
+            or route.response_model_exclude_unset or route.response_model_exclude_defaults \
+            or route.response_model_exclude_none or _has_aliases(route.response_field) \
+            or _uses_response_parameter(route.dependant):
+        return False
+
+    call = route.dependant.call
+    response_field = route.response_field
+    status_code = route.status_code if route.status_code is not None else 200
+
+    def to_response(result: Any) -> Any:
+        if isinstance(result, Response):
+            return result
+
+        if response_field is not None:
+            result, errors = response_field.validate(result, {}, loc=('response',))
+            if errors:
+                raise ValidationError(errors if isinstance(errors, list) else [errors], response_field.type_)
+
+        return response_class(content=result, status_code=status_code)
+
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def fast_json_call(*args, **kwargs):
+            return to_response(await call(*args, **kwargs))
+    else:
+        @functools.wraps(call)
+        def fast_json_call(*args, **kwargs):
+            return to_response(call(*args, **kwargs))
+
+    fast_json_call.__fast_json__ = True
+    route.dependant.call = fast_json_call
+    return True
+
+
+class FastJSONRoute(APIRoute):
+    """
+    APIRoute that apply use_fast_json, for routes with FastJSONResponse added after fast_api_create_app, example:
+
+        router = APIRouter(route_class=FastJSONRoute, default_response_class=FastJSONResponse)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(FastJSONRoute, self).__init__(*args, **kwargs)
+        use_fast_json(self)
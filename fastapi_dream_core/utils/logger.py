@@ -1,18 +1,173 @@
+import atexit
+import datetime
+import json
 import logging
+import queue
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
 
-from fastapi_dream_core.environments import AppBaseEnvironments
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 
-log_level = logging.INFO
+logger = logging.getLogger(__name__)
 
-if AppBaseEnvironments().is_dev_environment():
-    log_level = logging.DEBUG
+request_id: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
 
-logger = logging.getLogger(__name__)
-logger.setLevel(log_level)
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional['BackgroundQueueHandler'] = None
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object by line with time, level, logger, message, request_id and the traceback of exception
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': datetime.datetime.fromtimestamp(record.created, tz=datetime.timezone.utc).isoformat(
+                timespec='milliseconds'
+            ),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+
+        if getattr(record, 'request_id', None):
+            data['request_id'] = record.request_id
+
+        if getattr(record, 'suppressed', 0):
+            data['suppressed'] = record.suppressed
+
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class RepeatedErrorsFilter(logging.Filter):
+
+    def __init__(self, burst: int = 5, period_seconds: float = 60, level: int = logging.ERROR):
+        """
+        Rate limit of errors logged by the same line with the same exception, the first burst records
+        of each period_seconds pass, the others are dropped before any formatting and counted in
+        the field suppressed of the next record that pass
+        :param burst: The records that pass by period
+        :param period_seconds: The period of rate limit
+        :param level: The records with this level or higher are limited
+        """
+        super(RepeatedErrorsFilter, self).__init__()
+        self.burst = burst
+        self.period_seconds = period_seconds
+        self.level = level
+        self._windows: Dict[tuple, List] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level:
+            return True
+
+        key = (record.pathname, record.lineno, record.exc_info[0] if record.exc_info else None)
+        now = time.monotonic()
+        window = self._windows.get(key)
+
+        # window = [start, passed, suppressed]
+        if window is None or now - window[0] >= self.period_seconds:
+            record.suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            return True
+
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+
+        window[2] += 1
+        return False
+
+
+class BackgroundQueueHandler(QueueHandler):
+
+    def __init__(self, log_queue: queue.Queue):
+        """
+        Handler that only enqueue the records, the format and the write are made by the thread of QueueListener,
+        when the queue is full the record is dropped and counted, so the request never wait the log I/O
+        """
+        super(BackgroundQueueHandler, self).__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The message is merged with args here, the args can change after, the traceback is formatted later
+        record.msg = record.getMessage()
+        record.args = None
+        record.request_id = request_id.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BackgroundQueueListener(QueueListener):
+
+    def enqueue_sentinel(self) -> None:
+        # The listener thread is draining the queue, so wait a free slot instead of raise queue.Full on stop
+        self.queue.put(self._sentinel)
+
+
+def configure_logger(
+        log_level: int = None,
+        json_format: bool = None,
+        queue_size: int = 10000,
+        error_burst: int = 5,
+        error_period_seconds: float = 60
+) -> logging.Logger:
+    """
+    Configure the logger once, the records are enqueued and written to stderr by a background thread,
+    called by fast_api_create_app, the scripts and workers that do not create the app should call it.
+    Nothing is configured at import time
+    :param log_level: By default DEBUG in DEV and INFO in the other environments
+    :param json_format: One JSON by line, by default text in DEV and JSON in the other environments
+    :param queue_size: Max records waiting the background thread, after the records are dropped
+    :param error_burst: Errors of the same line and exception logged by error_period_seconds
+    :param error_period_seconds: The period of rate limit of repeated errors
+    """
+    global _listener, _queue_handler
+
+    if log_level is None or json_format is None:
+        from fastapi_dream_core.environments import AppBaseEnvironments
+
+        is_dev_environment = AppBaseEnvironments().is_dev_environment()
+        log_level = log_level if log_level is not None else logging.DEBUG if is_dev_environment else logging.INFO
+        json_format = json_format if json_format is not None else not is_dev_environment
+
+    logger.setLevel(log_level)
+
+    if _listener is None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(JSONFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+
+        _queue_handler = BackgroundQueueHandler(queue.Queue(maxsize=queue_size))
+        _queue_handler.addFilter(RepeatedErrorsFilter(burst=error_burst, period_seconds=error_period_seconds))
+        logger.addHandler(_queue_handler)
+
+        _listener = BackgroundQueueListener(_queue_handler.queue, stream_handler)
+        _listener.start()
+        atexit.register(stop_logger)
+
+    return logger
+
+
+def stop_logger() -> None:
+    """
+    Write the records in queue and stop the background thread
+    """
+    global _listener, _queue_handler
 
-handler = logging.StreamHandler()
-handler.setLevel(log_level)
+    if _listener is None:
+        return
 
-formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+    _listener.stop()
+    logger.removeHandler(_queue_handler)
+    _listener = None
+    _queue_handler = None
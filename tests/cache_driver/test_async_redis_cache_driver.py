@@ -0,0 +1,130 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from fastapi_dream_core.cache_driver import AsyncRedisCacheDriver, CircuitBreaker
+from fastapi_dream_core.cache_driver.compression import COMPRESSED_PREFIX
+from fastapi_dream_core.metrics.instrumentation import CACHE_OPERATION_SECONDS
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+def create_driver(server: FakeServer, **kwargs) -> AsyncRedisCacheDriver:
+    return AsyncRedisCacheDriver(client=FakeRedis(server=server), **kwargs)
+
+
+def test_get_set_and_add(server):
+    cache_driver = create_driver(server)
+
+    async def scenario():
+        await cache_driver.set('key', 'value')
+        assert await cache_driver.get('key') == b'value'
+        assert await cache_driver.get('missing') is None
+
+        assert await cache_driver.add('key', 'other') is False
+        assert await cache_driver.add('lock', 'token') is True
+        assert await cache_driver.get('lock') == b'token'
+
+        await cache_driver.dump('key')
+        assert await cache_driver.get('key') is None
+
+    asyncio.run(scenario())
+
+
+def test_many(server):
+    cache_driver = create_driver(server)
+
+    async def scenario():
+        await cache_driver.set_many({'first': 1, 'second': 'two', 'third': b'3'}, seconds_for_expire=60)
+        assert await cache_driver.get_many(['first', 'missing', 'second', 'third']) == [b'1', None, b'two', b'3']
+        assert 0 < await cache_driver.redis.ttl('first') <= 60
+
+        await cache_driver.delete_many(['first', 'second'])
+        assert await cache_driver.get_many(['first', 'second', 'third']) == [None, None, b'3']
+
+        assert await cache_driver.get_many([]) == []
+        await cache_driver.set_many({})
+        await cache_driver.delete_many([])
+
+    asyncio.run(scenario())
+
+
+def test_compression_round_trip(server):
+    cache_driver = create_driver(server, compress_min_bytes=100)
+    large = 'x' * 1000
+
+    async def scenario():
+        await cache_driver.set('large', large)
+        await cache_driver.set_many({'small': 'value', 'large_many': large})
+
+        stored = await cache_driver.redis.get('large')
+        assert stored.startswith(COMPRESSED_PREFIX) and len(stored) < len(large)
+        assert await cache_driver.redis.get('small') == b'value'
+
+        assert await cache_driver.get('large') == large.encode()
+        assert await cache_driver.get_many(['small', 'large_many']) == [b'value', large.encode()]
+
+        # A driver without compression still read the values compressed by other workers
+        assert await create_driver(server).get('large') == large.encode()
+
+    asyncio.run(scenario())
+
+
+def test_circuit_breaker_open_half_open_and_close(server):
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+    cache_driver = create_driver(server, circuit_breaker=circuit_breaker)
+
+    async def scenario():
+        await cache_driver.set('key', 'value')
+        server.connected = False
+
+        assert await cache_driver.get('key') is None
+        assert circuit_breaker.is_open is False
+        assert await cache_driver.get_many(['key']) == [None]
+        assert circuit_breaker.is_open is True
+
+        # Open: the calls are skipped, also when Redis is back
+        server.connected = True
+        assert await cache_driver.get('key') is None
+        assert await cache_driver.add('lock', 'token') is True
+        assert await cache_driver.redis.get('lock') is None
+
+        # Half open: one call after reset_seconds, a failure open the circuit again
+        time.sleep(0.06)
+        server.connected = False
+        assert await cache_driver.get('key') is None
+        assert circuit_breaker.is_open is True
+        server.connected = True
+        assert await cache_driver.get('key') is None
+
+        # Half open: a success close the circuit
+        time.sleep(0.06)
+        assert await cache_driver.get('key') == b'value'
+        assert circuit_breaker.is_open is False
+        assert await cache_driver.get_many(['key']) == [b'value']
+
+    asyncio.run(scenario())
+
+
+def test_writes_are_observed(server):
+    cache_driver = create_driver(server)
+
+    def observed(operation: str) -> int:
+        return sum(CACHE_OPERATION_SECONDS.labels('AsyncRedisCacheDriver', operation).counts)
+
+    before = {operation: observed(operation) for operation in ('add', 'dump', 'delete_many')}
+
+    async def scenario():
+        await cache_driver.add('key', 'value')
+        await cache_driver.dump('key')
+        await cache_driver.delete_many(['key'])
+
+    asyncio.run(scenario())
+    assert {operation: observed(operation) - count for operation, count in before.items()} == \
+        {'add': 1, 'dump': 1, 'delete_many': 1}
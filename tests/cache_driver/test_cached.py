@@ -0,0 +1,94 @@
+import asyncio
+import pickle
+
+from fastapi_dream_core.cache_driver import InMemoryCacheDriver, cached
+from tests.cache_driver.test_serializer import Payload
+
+
+def test_cached_function_compute_once():
+    cache_driver = InMemoryCacheDriver()
+    calls = []
+
+    @cached(cache_driver, seconds_for_expire=60, early_refresh_beta=0)
+    async def square(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * value
+
+    async def scenario():
+        assert await asyncio.gather(*[square(3) for _ in range(5)]) == [9] * 5
+        assert await square(3) == 9
+        assert calls == [3]
+
+        await square.invalidate(3)
+        assert await square(3) == 9
+        assert calls == [3, 3]
+
+    asyncio.run(scenario())
+
+
+def test_cached_method():
+    cache_driver = InMemoryCacheDriver()
+
+    class Service:
+        def __init__(self):
+            self.calls = 0
+
+        @cached(cache_driver, early_refresh_beta=0)
+        async def double(self, value: int) -> int:
+            self.calls += 1
+            return value * 2
+
+    async def scenario():
+        service = Service()
+        assert await service.double(3) == 6
+        assert await service.double(3) == 6
+        assert service.calls == 1
+
+        await service.double.invalidate(3)
+        assert await service.double(value=3) == 6
+        assert service.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_cached_lock_is_released_only_by_its_owner():
+    cache_driver = InMemoryCacheDriver()
+
+    @cached(cache_driver, lock_seconds=30)
+    async def slow() -> int:
+        # The lock expired and other process took it while this computation was running
+        cache_driver.set(lock_key, 'other process', seconds_for_expire=30)
+        return 1
+
+    lock_key = f'{slow.key()}:lock'
+
+    asyncio.run(slow())
+    assert cache_driver.get(lock_key) == b'other process'
+
+
+def test_dump_if_equal():
+    cache_driver = InMemoryCacheDriver()
+    cache_driver.set('lock', 'token')
+
+    assert cache_driver.dump_if_equal('lock', 'other') is False
+    assert cache_driver.get('lock') == b'token'
+    assert cache_driver.dump_if_equal('lock', 'token') is True
+    assert cache_driver.get('lock') is None
+
+
+def test_cached_does_not_load_pickle():
+    cache_driver = InMemoryCacheDriver()
+    calls = []
+
+    @cached(cache_driver, early_refresh_beta=0)
+    async def compute() -> dict:
+        calls.append(1)
+        return {'value': 1}
+
+    cache_driver.set(compute.key(), pickle.dumps(Payload()))
+
+    assert asyncio.run(compute()) == {'value': 1}
+    assert calls == [1]
+    assert asyncio.run(compute()) == {'value': 1}
+    assert calls == [1]
@@ -0,0 +1,56 @@
+import time
+
+from fastapi_dream_core.cache_driver import InMemoryCacheDriver
+from fastapi_dream_core.metrics.instrumentation import CACHE_HITS
+
+
+def test_lru_eviction():
+    cache_driver = InMemoryCacheDriver(max_entries=2)
+    cache_driver.set('a', 1)
+    cache_driver.set('b', 2)
+    assert cache_driver.get('a') == b'1'
+
+    cache_driver.set('c', 3)
+    assert cache_driver.get('b') is None
+    assert cache_driver.get('a') == b'1' and cache_driver.get('c') == b'3'
+    assert cache_driver.stats()['evictions'] == 1
+
+
+def test_max_bytes():
+    cache_driver = InMemoryCacheDriver(max_bytes=10)
+    cache_driver.set('a', b'x' * 6)
+    cache_driver.set('b', b'x' * 6)
+
+    assert cache_driver.get('a') is None
+    assert cache_driver.stats()['bytes'] == 6
+
+
+def test_expiry_and_sweep():
+    cache_driver = InMemoryCacheDriver()
+    cache_driver.set('a', 1, seconds_for_expire=0)
+    cache_driver.set('b', 1, seconds_for_expire=0)
+    time.sleep(0.01)
+
+    assert cache_driver.get('a') is None
+    assert cache_driver.sweep() == 1
+    assert cache_driver.stats()['size'] == 0 and cache_driver.stats()['expirations'] == 2
+
+
+def test_instances_do_not_share_memory():
+    InMemoryCacheDriver().set('a', 1)
+    assert InMemoryCacheDriver().get('a') is None
+
+
+def test_observe_is_opt_in():
+    labels = ('InMemoryCacheDriver',)
+    before = CACHE_HITS.labels(*labels).value
+
+    cache_driver = InMemoryCacheDriver()
+    cache_driver.set('a', 1)
+    cache_driver.get('a')
+    assert CACHE_HITS.labels(*labels).value == before
+
+    cache_driver = InMemoryCacheDriver(observe=True)
+    cache_driver.set('a', 1)
+    cache_driver.get('a')
+    assert CACHE_HITS.labels(*labels).value == before + 1
@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from fastapi_dream_core.cache_driver import InMemoryCacheDriver, LocalInvalidationChannel, NearCacheDriver
+
+
+@pytest.fixture
+def workers():
+    """
+    Two workers with their own L1 over the same L2 and the same invalidation channel
+    """
+    l2 = InMemoryCacheDriver()
+    channel = LocalInvalidationChannel()
+
+    return l2, NearCacheDriver(l2, invalidation_channel=channel), NearCacheDriver(l2, invalidation_channel=channel)
+
+
+def test_l1_hit(workers):
+    l2, worker, _ = workers
+    worker.set('key', 'value')
+
+    # Only the L1 has the key now, so the value can only come from it
+    l2.dump('key')
+    assert worker.get('key') == b'value'
+    assert worker.get('missing') is None
+
+    stats = worker.stats()
+    assert (stats['l1_hits'], stats['l2_hits'], stats['misses']) == (1, 0, 1)
+    assert stats['l1_hit_ratio'] == stats['hit_ratio'] == 0.5
+
+
+def test_l2_hit_fill_the_l1(workers):
+    l2, worker, _ = workers
+    l2.set('key', 'value')
+
+    assert worker.get('key') == b'value'
+    assert worker.get('key') == b'value'
+    assert worker.get_many(['key', 'missing']) == [b'value', None]
+
+    stats = worker.stats()
+    assert (stats['l1_hits'], stats['l2_hits'], stats['misses']) == (2, 1, 1)
+    assert stats['l1']['size'] == 1
+
+
+def test_set_invalidate_the_l1_of_other_workers(workers):
+    _, worker, other = workers
+    worker.set('key', 'first')
+    assert other.get('key') == b'first'
+
+    worker.set('key', 'second')
+    assert other.get('key') == b'second'
+    assert other.stats()['l2_hits'] == 2
+
+    worker.set_many({'key': 'third'})
+    assert other.get('key') == b'third'
+
+
+def test_dump_and_delete_many_invalidate_the_l1_of_other_workers(workers):
+    _, worker, other = workers
+    worker.set_many({'first': 1, 'second': 2, 'third': 3})
+    assert other.get_many(['first', 'second', 'third']) == [b'1', b'2', b'3']
+
+    worker.dump('first')
+    assert other.get('first') is None
+
+    worker.delete_many(['second', 'third'])
+    assert other.get_many(['second', 'third']) == [None, None]
+
+    worker.set('lock', 'token')
+    assert other.get('lock') == b'token'
+    assert worker.dump_if_equal('lock', 'token') is True
+    assert other.get('lock') is None
+
+
+def test_own_messages_do_not_drop_the_l1(workers):
+    l2, worker, _ = workers
+    worker.set('key', 'value')
+    l2.dump('key')
+
+    assert worker.get('key') == b'value'
+
+
+def test_l1_seconds_for_expire_is_capped():
+    l2 = InMemoryCacheDriver()
+    cache_driver = NearCacheDriver(l2, l1_seconds_for_expire=0)
+
+    cache_driver.set('key', 'value', seconds_for_expire=600)
+    time.sleep(0.01)
+
+    # The L1 expired by l1_seconds_for_expire, the L2 keep it for 600 seconds
+    assert cache_driver.get('key') == b'value'
+    assert cache_driver.stats()['l2_hits'] == 1
+
+
+def test_l1_seconds_for_expire_is_not_longer_than_the_key():
+    cache_driver = NearCacheDriver(InMemoryCacheDriver(), l1_seconds_for_expire=60)
+
+    cache_driver.set('key', 'value', seconds_for_expire=0)
+    time.sleep(0.01)
+
+    assert cache_driver.get('key') is None
+    assert cache_driver.stats()['misses'] == 1
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Union
+
+from fastapi import BackgroundTasks, FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from fastapi_dream_core.cache_driver import AsyncCacheDriverABC, InMemoryCacheDriver, ResponseCache
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    password_hash: str
+
+
+class UserSchema(BaseModel):
+    id: int
+    name: str
+
+
+class AsyncInMemoryCacheDriver(AsyncCacheDriverABC):
+    """
+    An async driver over InMemoryCacheDriver that record the operations
+    """
+
+    def __init__(self):
+        self.cache_driver = InMemoryCacheDriver()
+        self.operations = []
+
+    def __record(self, operation: str) -> None:
+        self.operations.append(operation)
+
+    async def get(self, key: str) -> Union[bytes, None]:
+        self.__record('get')
+        return self.cache_driver.get(key)
+
+    async def set(self, key: str, value, seconds_for_expire: int = 600) -> None:
+        self.__record('set')
+        self.cache_driver.set(key, value, seconds_for_expire=seconds_for_expire)
+
+    async def dump(self, key: str) -> None:
+        self.__record('dump')
+        self.cache_driver.dump(key)
+
+    async def get_many(self, keys):
+        self.__record('get_many')
+        return self.cache_driver.get_many(keys)
+
+
+def create_client(cache_driver=None):
+    response_cache = ResponseCache(cache_driver if cache_driver else InMemoryCacheDriver())
+    calls = []
+    app = FastAPI()
+
+    @app.get('/users/{user_id}', response_model=UserSchema)
+    @response_cache.cached(seconds_for_expire=60, tags=['users', 'user:{user_id}'])
+    async def get_user(user_id: int, response: Response, background_tasks: BackgroundTasks):
+        calls.append(user_id)
+        response.headers['X-Source'] = 'database'
+        background_tasks.add_task(calls.append, 'background')
+        return User(id=user_id, name='Deadpond', password_hash='secret')
+
+    return TestClient(app), response_cache, calls
+
+
+def test_response_model_is_applied_before_store():
+    client, _, calls = create_client()
+
+    first = client.get('/users/1')
+    second = client.get('/users/1')
+
+    assert first.json() == second.json() == {'id': 1, 'name': 'Deadpond'}
+    assert calls == [1, 'background']
+
+
+def test_headers_and_background_tasks_of_route_are_kept():
+    client, _, calls = create_client()
+
+    miss = client.get('/users/1')
+    assert miss.headers['x-source'] == 'database'
+    assert miss.headers['cache-control'] == 'max-age=60'
+    assert calls == [1, 'background']
+
+    hit = client.get('/users/1')
+    assert hit.headers['x-source'] == 'database'
+    assert hit.headers['content-type'] == 'application/json'
+    assert hit.headers['etag'] == miss.headers['etag']
+
+
+def test_etag_and_invalidate():
+    client, response_cache, calls = create_client()
+
+    etag = client.get('/users/1').headers['etag']
+    response = client.get('/users/1', headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.content == b''
+
+    asyncio.run(response_cache.invalidate('user:1'))
+    response = client.get('/users/1', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert calls == [1, 'background', 1, 'background']
+
+
+def test_async_driver_is_awaited_and_tags_are_read_with_get_many():
+    cache_driver = AsyncInMemoryCacheDriver()
+    client, response_cache, calls = create_client(cache_driver)
+
+    client.get('/users/1')
+    assert cache_driver.operations == ['get_many', 'set', 'set', 'get', 'set']
+
+    cache_driver.operations.clear()
+    assert client.get('/users/1').json() == {'id': 1, 'name': 'Deadpond'}
+    assert cache_driver.operations == ['get_many', 'get']
+
+    client.get('/users/2')
+    assert calls == [1, 'background', 2, 'background']
+
+
+def test_sync_driver_runs_in_thread_pool():
+    in_event_loop = []
+
+    class RecordingCacheDriver(InMemoryCacheDriver):
+
+        def get_many(self, keys):
+            in_event_loop.append(is_event_loop_thread())
+            return super(RecordingCacheDriver, self).get_many(keys)
+
+        def get(self, key: str):
+            in_event_loop.append(is_event_loop_thread())
+            return super(RecordingCacheDriver, self).get(key)
+
+    def is_event_loop_thread() -> bool:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+        return True
+
+    client, _, _ = create_client(RecordingCacheDriver())
+    client.get('/users/1')
+    client.get('/users/1')
+
+    assert in_event_loop and not any(in_event_loop)
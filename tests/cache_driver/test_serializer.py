@@ -0,0 +1,34 @@
+import datetime
+import decimal
+import pickle
+import uuid
+
+import pytest
+
+from fastapi_dream_core.cache_driver import serializer
+
+
+class Payload:
+
+    def __reduce__(self):
+        return exec, ('raise SystemExit("executed")',)
+
+
+def test_round_trip():
+    value = [
+        (1, 'a', None, True, 1.5, {'nested': [1, 2]}),
+        datetime.datetime(2022, 5, 1, 10, 30, tzinfo=datetime.timezone.utc),
+        datetime.date(2022, 5, 1),
+        datetime.time(10, 30),
+        datetime.timedelta(seconds=90),
+        decimal.Decimal('10.50'),
+        uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        b'\x00\xff',
+    ]
+
+    assert serializer.loads(serializer.dumps(value)) == [list(value[0])] + value[1:]
+
+
+def test_pickle_is_not_loaded():
+    with pytest.raises(ValueError):
+        serializer.loads(pickle.dumps(Payload()))
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from sqlmodel import SQLModel, create_engine
+
+from fastapi_dream_core.database import DatabaseSQLModel, AsyncDatabaseSQLModel
+from fastapi_dream_core.repository import BaseRepository, AsyncBaseRepository
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / 'test.db'
+
+    engine = create_engine(f'sqlite:///{path}')
+    SQLModel.metadata.create_all(engine)
+    engine.dispose()
+
+    return path
+
+
+@pytest.fixture
+def database(db_path):
+    return DatabaseSQLModel(f'sqlite:///{db_path}')
+
+
+@pytest.fixture
+def async_database(db_path):
+    database = AsyncDatabaseSQLModel(f'sqlite+aiosqlite:///{db_path}')
+    yield database
+    asyncio.run(database.dispose())
+
+
+@pytest.fixture(params=['sync', 'async'])
+def make_repository(request, db_path):
+    """
+    Build a BaseRepository or an AsyncBaseRepository over the same SQLite file, the tests of repository
+    run with both
+    """
+    if request.param == 'sync':
+        database = DatabaseSQLModel(f'sqlite:///{db_path}')
+        yield lambda model, **kwargs: BaseRepository(
+            database.session, model, read_session_factory=database.read_session, **kwargs
+        )
+        return
+
+    database = AsyncDatabaseSQLModel(f'sqlite+aiosqlite:///{db_path}')
+    yield lambda model, **kwargs: AsyncBaseRepository(
+        database.session, model, read_session_factory=database.read_session, **kwargs
+    )
+    asyncio.run(database.dispose())
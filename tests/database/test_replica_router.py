@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+
+from fastapi_dream_core.database import AsyncDatabaseSQLModel, DatabaseSQLModel
+from fastapi_dream_core.database.replica_router import Replica, ReplicaRouter
+
+
+def create_replica(name: str) -> Replica:
+    engine = create_engine(f'sqlite:///file:{name}?mode=memory&uri=true')
+    return Replica(engine=engine, sync_engine=engine)
+
+
+def test_unhealthy_replica_is_out_of_rotation():
+    first, second, third = replicas = [create_replica(name) for name in ('first', 'second', 'third')]
+    router = ReplicaRouter(replicas)
+
+    assert [router.candidates()[0] for _ in range(3)] == replicas
+
+    second.mark_unhealthy(retry_seconds=60)
+    assert {router.candidates()[0] for _ in range(6)} == {first, third}
+    assert second not in router.candidates()
+
+    second.mark_unhealthy(retry_seconds=0)
+    assert router.candidates()[-1] is second
+
+    second.mark_healthy()
+    assert {router.candidates()[0] for _ in range(3)} == set(replicas)
+
+
+def test_no_candidates_when_all_are_unhealthy():
+    replicas = [create_replica(name) for name in ('first', 'second')]
+    router = ReplicaRouter(replicas)
+
+    for replica in replicas:
+        replica.mark_unhealthy(retry_seconds=60)
+
+    assert router.candidates() == []
+    assert ReplicaRouter([]).candidates() == []
+
+
+@pytest.fixture
+def urls(tmp_path):
+    return {name: f'sqlite:///{tmp_path / name}.db' for name in ('primary', 'first', 'second')}
+
+
+def bind_name(session) -> str:
+    return session.get_bind().url.database.rsplit('/', 1)[-1][:-3]
+
+
+def test_reads_go_to_the_healthy_replicas(urls):
+    database = DatabaseSQLModel(urls['primary'], replica_urls=[urls['first'], urls['second']])
+    first, second = database._replica_router.replicas
+
+    reads = []
+    for _ in range(4):
+        with database.read_session() as session:
+            reads.append(bind_name(session))
+
+    assert sorted(reads) == ['first', 'first', 'second', 'second']
+
+    first.mark_unhealthy(retry_seconds=60)
+    for _ in range(3):
+        with database.read_session() as session:
+            assert bind_name(session) == 'second'
+
+    second.mark_unhealthy(retry_seconds=60)
+    with database.read_session() as session:
+        assert bind_name(session) == 'primary'
+
+
+def test_replica_that_fail_in_connect_is_marked_unhealthy(urls, tmp_path):
+    broken_url = f'sqlite:///{tmp_path / "missing" / "broken.db"}'
+    database = DatabaseSQLModel(urls['primary'], replica_urls=[broken_url], replica_retry_seconds=60)
+    broken, = database._replica_router.replicas
+
+    with database.read_session() as session:
+        assert bind_name(session) == 'primary'
+
+    assert broken.healthy is False
+    assert database.details()['replicas'][0]['healthy'] is False
+
+
+def test_writes_and_read_your_writes_use_the_primary(urls):
+    database = DatabaseSQLModel(urls['primary'], replica_urls=[urls['first']])
+
+    with database.session() as session:
+        assert bind_name(session) == 'primary'
+
+    with database.read_your_writes():
+        with database.read_session() as session:
+            assert bind_name(session) == 'primary'
+
+    with database.unit_of_work() as unit_of_work:
+        with database.read_session() as session:
+            assert session is unit_of_work and bind_name(session) == 'primary'
+
+    with database.read_session() as session:
+        assert bind_name(session) == 'first'
+
+
+def test_async_reads_fall_back_to_the_primary(urls):
+    database = AsyncDatabaseSQLModel(
+        urls['primary'].replace('sqlite', 'sqlite+aiosqlite'),
+        replica_urls=[urls['first'].replace('sqlite', 'sqlite+aiosqlite')]
+    )
+    replica, = database._replica_router.replicas
+
+    async def read_bind() -> str:
+        async with database.read_session() as session:
+            return bind_name(session)
+
+    async def scenario():
+        assert await read_bind() == 'first'
+
+        with database.read_your_writes():
+            assert await read_bind() == 'primary'
+
+        replica.mark_unhealthy(retry_seconds=60)
+        assert await read_bind() == 'primary'
+
+        await database.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from fastapi_dream_core.repository import BaseRepository, AsyncBaseRepository
+from tests.models import Hero, HeroCreate
+
+
+@pytest.fixture(params=['sync', 'async'])
+def client(request, database, async_database):
+    database = database if request.param == 'sync' else async_database
+    repository_class = BaseRepository if request.param == 'sync' else AsyncBaseRepository
+    repository = repository_class(database.session, Hero, read_session_factory=database.read_session)
+
+    app = FastAPI()
+
+    @app.post('/heroes')
+    @database.transactional
+    async def create_hero(hero_in: HeroCreate):
+        return await repository.create(hero_in)
+
+    return TestClient(app, raise_server_exceptions=False), repository
+
+
+@pytest.fixture
+def failing_commit():
+    def before_commit(session):
+        raise RuntimeError('commit failed')
+
+    event.listen(Session, 'before_commit', before_commit)
+    yield
+    event.remove(Session, 'before_commit', before_commit)
+
+
+def test_transactional_commit(client):
+    client, repository = client
+
+    response = client.post('/heroes', json={'name': 'Deadpond'})
+    assert response.status_code == 200
+    assert response.json()['id'] == 1
+
+
+def test_transactional_failed_commit_is_an_error_response(client, failing_commit):
+    client, _ = client
+
+    response = client.post('/heroes', json={'name': 'Deadpond'})
+    assert response.status_code == 500
+
+
+def test_transactional_rejects_sync_endpoint_in_async_database(async_database):
+    with pytest.raises(TypeError):
+        async_database.transactional(lambda: None)
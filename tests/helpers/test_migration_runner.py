@@ -0,0 +1,105 @@
+import asyncio
+import os
+from contextlib import contextmanager
+
+import pytest
+
+from fastapi_dream_core.database import advisory_lock
+from fastapi_dream_core.helpers.migration_runner import MigrationRunner
+from fastapi_dream_core.routes.migrations.run_migrations_schemas import MigrationStatusEnum
+
+
+@pytest.fixture
+def lock_events(monkeypatch):
+    events = []
+
+    @contextmanager
+    def fake_advisory_lock(engine, name, timeout_seconds=600):
+        events.append('acquired')
+        try:
+            yield True
+        finally:
+            events.append('released')
+
+    monkeypatch.setattr(advisory_lock, 'advisory_lock', fake_advisory_lock)
+    return events
+
+
+def create_runner(db_path: str, command: str) -> MigrationRunner:
+    return MigrationRunner(command=command, lock_url=f'sqlite:///{db_path}', lock_timeout_seconds=1)
+
+
+def test_success(db_path, lock_events):
+    runner = create_runner(db_path, 'echo upgrade')
+
+    async def scenario():
+        await runner.start()
+        return await runner.wait()
+
+    schema = asyncio.run(scenario())
+    assert schema.status == MigrationStatusEnum.SUCCESS and schema.return_code == 0
+    assert schema.output == ['upgrade']
+    assert lock_events == ['acquired', 'released']
+
+
+def test_failure(db_path, lock_events):
+    runner = create_runner(db_path, 'echo broken migration; exit 3')
+
+    async def scenario():
+        await runner.start()
+        return await runner.wait()
+
+    schema = asyncio.run(scenario())
+    assert schema.status == MigrationStatusEnum.ERROR and schema.return_code == 3
+    assert schema.output == ['broken migration']
+    assert not runner.readiness()
+    assert lock_events == ['acquired', 'released']
+
+
+def test_lock_contention(db_path, monkeypatch):
+    @contextmanager
+    def taken_advisory_lock(engine, name, timeout_seconds=600):
+        yield False
+
+    monkeypatch.setattr(advisory_lock, 'advisory_lock', taken_advisory_lock)
+    runner = create_runner(db_path, f'touch {db_path}.ran')
+
+    async def scenario():
+        await runner.start()
+        return await runner.wait()
+
+    schema = asyncio.run(scenario())
+    assert schema.status == MigrationStatusEnum.ERROR
+    assert schema.output == ['lock fastapi_dream_core_migrations not acquired in 1s']
+    assert not os.path.exists(f'{db_path}.ran')
+
+
+def test_cancel_kills_the_command_before_release_the_lock(db_path, monkeypatch):
+    events = []
+
+    @contextmanager
+    def recording_advisory_lock(engine, name, timeout_seconds=600):
+        yield True
+        pid = int(runner.schema().output[0])
+        try:
+            os.kill(pid, 0)
+            events.append('command running')
+        except ProcessLookupError:
+            events.append('command killed')
+        events.append('released')
+
+    monkeypatch.setattr(advisory_lock, 'advisory_lock', recording_advisory_lock)
+    runner = create_runner(db_path, 'echo $$; exec sleep 30')
+
+    async def scenario():
+        await runner.start()
+        while not runner.schema().output:
+            await asyncio.sleep(0.01)
+
+        runner._task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await runner._task
+
+    asyncio.run(scenario())
+    assert events == ['command killed', 'released']
+    assert runner.status == MigrationStatusEnum.ERROR and runner.finished_at is not None
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+import pytest
+
+from fastapi_dream_core.application_dependencies.application_dependencies_abc import ApplicationDependenciesABC
+from fastapi_dream_core.helpers.readiness import Readiness
+from fastapi_dream_core.utils.singleton_meta import SingletonMeta
+
+
+class SyncDependency(ApplicationDependenciesABC):
+
+    def __init__(self, ready: bool = True):
+        self.ready = ready
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def readiness(self) -> bool:
+        self.calls += 1
+        self.release.wait(5)
+        return self.ready
+
+    def __str__(self):
+        return 'SyncDependency'
+
+
+class AsyncDependency(ApplicationDependenciesABC):
+
+    def __init__(self):
+        self.calls = 0
+
+    async def readiness(self) -> bool:
+        self.calls += 1
+        await asyncio.sleep(1)
+        return True
+
+    def details(self):
+        raise RuntimeError('details failed')
+
+    def __str__(self):
+        return 'AsyncDependency'
+
+
+@pytest.fixture
+def readiness():
+    SingletonMeta._instances.pop(Readiness, None)
+    yield Readiness(timeout_seconds=0.1, max_workers=1)
+    SingletonMeta._instances.pop(Readiness, None)
+
+
+def test_timeout_of_sync_dependency_do_not_starve_the_pool(readiness):
+    hung = SyncDependency()
+    hung.release.clear()
+    other = SyncDependency()
+    readiness.add_dependency(hung)
+
+    first = asyncio.run(readiness.ready())
+    assert [health.ready for health in first] == [False]
+
+    # The readiness still running is not submitted again, so the only thread of pool is free for the other
+    readiness.add_dependency(other)
+    second = asyncio.run(readiness.ready())
+    assert [health.ready for health in second] == [False, False]
+    assert hung.calls == 1
+
+    hung.release.set()
+    readiness.configure(timeout_seconds=1)
+    third = asyncio.run(readiness.ready())
+    assert [health.ready for health in third] == [True, True]
+    assert hung.calls == 2 and other.calls == 1
+
+
+def test_timeout_of_async_dependency_and_details_error(readiness):
+    dependency = AsyncDependency()
+    readiness.add_dependency(dependency)
+
+    health = asyncio.run(readiness.ready())[0]
+    assert health.ready is False and health.details is None
+    assert health.latency_ms < 1000
+
+
+def test_result_is_cached(readiness):
+    dependency = SyncDependency()
+    readiness.add_dependency(dependency)
+    readiness.configure(cache_seconds=60)
+
+    async def scenario():
+        return await asyncio.gather(*(readiness.ready() for _ in range(5)))
+
+    asyncio.run(scenario())
+    asyncio.run(readiness.ready())
+    assert dependency.calls == 1
+
+    readiness.configure(cache_seconds=0)
+    asyncio.run(readiness.ready())
+    assert dependency.calls == 2
@@ -0,0 +1,78 @@
+import pytest
+
+from fastapi_dream_core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from fastapi_dream_core.metrics.metrics_registry import Metric
+from fastapi_dream_core.utils.singleton_meta import SingletonMeta
+
+
+def test_metric_is_abstract():
+    with pytest.raises(TypeError):
+        Metric('untyped_total', 'Untyped')
+
+
+def test_counter_and_gauge_exposition():
+    counter = Counter('requests_total', 'Requests by method', ('method',))
+    counter.labels('GET').inc()
+    counter.labels('GET').inc(2)
+    counter.labels('POST').inc()
+
+    gauge = Gauge('in_progress', 'Requests in progress')
+    gauge.inc(3)
+    gauge.dec()
+
+    assert counter.render() == [
+        '# HELP requests_total Requests by method',
+        '# TYPE requests_total counter',
+        'requests_total{method="GET"} 3.0',
+        'requests_total{method="POST"} 1.0',
+    ]
+    assert gauge.render()[2:] == ['in_progress 2.0']
+
+
+def test_histogram_exposition():
+    histogram = Histogram('duration_seconds', 'Duration', ('route',), buckets=(0.5, 0.1))
+    histogram.labels('/users').observe(0.05)
+    histogram.labels('/users').observe(0.3)
+    histogram.labels('/users').observe(2)
+
+    assert histogram.render()[2:] == [
+        'duration_seconds_bucket{route="/users",le="0.1"} 1',
+        'duration_seconds_bucket{route="/users",le="0.5"} 2',
+        'duration_seconds_bucket{route="/users",le="+Inf"} 3',
+        'duration_seconds_sum{route="/users"} 2.35',
+        'duration_seconds_count{route="/users"} 3',
+    ]
+
+
+def test_labels():
+    counter = Counter('errors_total', 'Errors', ('model', 'method'))
+
+    assert counter.labels('Hero', 'find') is counter.labels('Hero', 'find')
+    assert counter.labels('Hero', 'find') is not counter.labels('Hero', 'save')
+
+    with pytest.raises(ValueError):
+        counter.labels('Hero')
+
+    counter.labels('He said "hi"\\', 'new\nline').inc()
+    assert counter.render()[-1] == 'errors_total{model="He said \\"hi\\"\\\\",method="new\\nline"} 1.0'
+
+
+@pytest.fixture
+def registry():
+    # A registry apart from the singleton of application
+    application_registry = SingletonMeta._instances.pop(MetricsRegistry, None)
+    yield MetricsRegistry()
+    SingletonMeta._instances.pop(MetricsRegistry, None)
+    if application_registry is not None:
+        SingletonMeta._instances[MetricsRegistry] = application_registry
+
+
+def test_registry(registry):
+    counter = registry.counter('test_registry_total', 'Registry')
+
+    assert registry.counter('test_registry_total', 'Registry') is counter
+    with pytest.raises(ValueError):
+        registry.gauge('test_registry_total', 'Registry')
+
+    registry.add_collector(lambda: counter.inc())
+    assert 'test_registry_total 1.0\n' in registry.render()
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from fastapi_dream_core.exceptions import InternalErrorSchema
+from fastapi_dream_core.middleware import DevelopMiddleware
+from fastapi_dream_core.middleware.app_middleware import AppMiddleware
+from fastapi_dream_core.middleware.metrics_middleware import REQUEST_SECONDS, REQUESTS_IN_PROGRESS, \
+    MetricsMiddleware
+from fastapi_dream_core.utils.logger import request_id
+
+STREAM_CHUNKS = 5
+
+
+def create_app(is_environment_dev: bool = True) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/users/{user_id}')
+    async def get_user(user_id: int):
+        return {'id': user_id, 'request_id': request_id.get()}
+
+    @app.get('/error')
+    async def error():
+        raise RuntimeError('unexpected')
+
+    @app.get('/stream')
+    async def stream(fail: bool = False):
+        async def chunks():
+            for index in range(STREAM_CHUNKS):
+                yield f'{index}\n'.encode()
+
+            if fail:
+                raise RuntimeError('failed in the middle of stream')
+
+        return StreamingResponse(chunks(), media_type='text/csv')
+
+    # Same order of fast_api_create_app, the last added is the outermost
+    app.add_middleware(DevelopMiddleware, is_environment_dev=is_environment_dev)
+    app.add_middleware(AppMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def call(app: FastAPI, path: str, query_string: bytes = b'') -> list:
+    """
+    Call the ASGI app like a server and return the messages sent, so the chunks of streaming are seen one by one
+    """
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query_string, 'root_path': '',
+        'headers': [(b'host', b'test')], 'client': ('127.0.0.1', 50000), 'server': ('test', 80),
+    }
+    messages = []
+    completed = asyncio.Event()
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        await completed.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+        if message['type'] == 'http.response.body' and not message.get('more_body', False):
+            completed.set()
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        completed.set()
+
+    return messages
+
+
+def observed(method: str, route: str, status: str) -> int:
+    return sum(REQUEST_SECONDS.labels(method, route, status).counts)
+
+
+def test_exception_is_internal_error():
+    client = TestClient(create_app())
+    before = observed('GET', '/error', '500')
+
+    response = client.get('/error', headers={'X-Request-ID': 'request-1'})
+
+    assert response.status_code == 500
+    assert response.json() == InternalErrorSchema().dict()
+    assert response.headers['x-request-id'] == 'request-1'
+    assert observed('GET', '/error', '500') == before + 1
+    assert REQUESTS_IN_PROGRESS.labels('GET').value == 0
+
+
+def test_request_id_header():
+    client = TestClient(create_app())
+
+    response = client.get('/users/1', headers={'X-Request-ID': 'request-2'})
+    assert response.headers['x-request-id'] == response.json()['request_id'] == 'request-2'
+
+    response = client.get('/users/1')
+    generated = response.headers['x-request-id']
+    assert len(generated) == 32 and response.json()['request_id'] == generated
+    assert client.get('/users/1').headers['x-request-id'] != generated
+
+    response = client.get('/users/1', headers={'X-Request-ID': 'x' * 500})
+    assert response.headers['x-request-id'] == 'x' * 128
+
+    assert request_id.get() is None
+
+
+def test_metrics_by_route_template():
+    client = TestClient(create_app())
+    before = observed('GET', '/users/{user_id}', '200')
+
+    client.get('/users/1')
+    client.get('/users/2')
+
+    assert observed('GET', '/users/{user_id}', '200') == before + 2
+
+
+def test_process_time_only_in_dev():
+    assert 'x-process-time' in TestClient(create_app(is_environment_dev=True)).get('/users/1').headers
+    assert 'x-process-time' not in TestClient(create_app(is_environment_dev=False)).get('/users/1').headers
+
+
+def test_streaming_pass_through():
+    messages = asyncio.run(call(create_app(), '/stream'))
+
+    start, *bodies = messages
+    assert start['status'] == 200
+    assert len(dict(start['headers'])[b'x-request-id']) == 32
+    assert [body['body'] for body in bodies if body['body']] == [
+        f'{index}\n'.encode() for index in range(STREAM_CHUNKS)
+    ]
+    assert all(body.get('more_body') for body in bodies[:STREAM_CHUNKS])
+
+
+def test_error_after_response_started_is_raised():
+    with pytest.raises(RuntimeError):
+        asyncio.run(call(create_app(), '/stream', query_string=b'fail=true'))
@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from sqlmodel import SQLModel, Field, Relationship
+
+
+class Team(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+
+    heroes: List['Hero'] = Relationship(back_populates='team')
+
+
+class Hero(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    age: Optional[int] = None
+    team_id: Optional[int] = Field(default=None, foreign_key='team.id')
+
+    team: Optional[Team] = Relationship(back_populates='heroes')
+
+
+class HeroCreate(SQLModel):
+    name: str
+    age: Optional[int] = None
+    team_id: Optional[int] = None
+
+
+class HeroList(SQLModel):
+    id: int
+    name: str
+
+
+class Membership(SQLModel, table=True):
+    team_id: int = Field(primary_key=True)
+    hero_id: int = Field(primary_key=True)
+    rank: Optional[int] = None
+
+
+class Account(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    owner: str
+    balance: Optional[int] = Field(default=None, nullable=False, sa_column_kwargs={'server_default': '7'})
@@ -0,0 +1,241 @@
+import asyncio
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+from pydantic import BaseModel
+
+from fastapi_dream_core.cache_driver import InMemoryCacheDriver, AsyncRedisCacheDriver
+from fastapi_dream_core.pagination import PageQuery, CursorPageQuery, TotalCountMode
+from fastapi_dream_core.repository import RepositoryQueryCache, AsyncRepositoryQueryCache, AsyncBaseRepository
+from tests.models import Hero, HeroCreate, HeroList
+
+
+async def create_heroes(repository, count: int = 10):
+    await repository.create_many([{'name': f'hero {index}', 'age': index} for index in range(count)])
+
+
+def test_create_update_and_delete(make_repository):
+    repository = make_repository(Hero)
+
+    async def scenario():
+        hero = await repository.create(HeroCreate(name='Deadpond', age=30))
+        assert hero.id == 1
+
+        hero = await repository.update(hero, {'age': 31})
+        assert (await repository.find_one_by_filters({'id': hero.id})).age == 31
+
+        await repository.delete(hero)
+        assert await repository.find_one_by_filters({'id': hero.id}) is None
+
+    asyncio.run(scenario())
+
+
+def test_find_by_filters_paginated(make_repository):
+    repository = make_repository(Hero)
+
+    async def scenario():
+        await create_heroes(repository)
+
+        page = await repository.find_by_filters_paginated(PageQuery(page=2, size=3), order='age', desc=True)
+        assert [hero.age for hero in page.items] == [6, 5, 4]
+        assert page.total == 10
+
+        page = await repository.find_by_filters_paginated(PageQuery(page=5, size=3))
+        assert page.items == [] and page.total == 10
+
+        page = await repository.find_by_filters_paginated(PageQuery(size=2), filters={'age__gte': 8})
+        assert [hero.age for hero in page.items] == [8, 9] and page.total == 2
+
+    asyncio.run(scenario())
+
+
+def test_find_by_filters_paginated_cached_total(make_repository):
+    repository = make_repository(Hero, count_mode=TotalCountMode.CACHED)
+
+    async def scenario():
+        await create_heroes(repository)
+        assert (await repository.find_by_filters_paginated(PageQuery(size=2))).total == 10
+
+        await repository.create({'name': 'hero 10'})
+        assert (await repository.find_by_filters_paginated(PageQuery(size=2))).total == 10
+
+    asyncio.run(scenario())
+
+
+def test_projection(make_repository):
+    repository = make_repository(Hero)
+
+    async def scenario():
+        await create_heroes(repository, count=3)
+
+        assert await repository.find_one_by_filters({'id': 1}, projection=['id', 'age']) == {'id': 1, 'age': 0}
+        page = await repository.find_by_filters_paginated(PageQuery(size=2), projection=HeroList)
+        assert page.items == [{'id': 1, 'name': 'hero 0'}, {'id': 2, 'name': 'hero 1'}]
+        assert await repository.find_all_by_filters({'id__in': [3]}, projection=['name']) == [{'name': 'hero 2'}]
+
+    asyncio.run(scenario())
+
+
+def test_empty_projection_is_rejected(make_repository):
+    repository = make_repository(Hero)
+
+    class WithoutColumns(BaseModel):
+        power: str
+
+    async def scenario():
+        for projection in ([], WithoutColumns):
+            with pytest.raises(ValueError):
+                await repository.find_all_by_filters(projection=projection)
+
+            with pytest.raises(ValueError):
+                await repository.find_by_filters_cursor_paginated(projection=projection)
+
+    asyncio.run(scenario())
+
+
+def test_cursor_paginated_projection(make_repository):
+    repository = make_repository(Hero)
+    query_cache = repository.query_cache = query_cache_for(repository)
+
+    async def scenario():
+        await create_heroes(repository, count=5)
+
+        for _ in range(2):
+            page = await repository.find_by_filters_cursor_paginated(
+                CursorPageQuery(size=2), order='age', desc=True, projection=['name']
+            )
+            assert page.items == [{'name': 'hero 4'}, {'name': 'hero 3'}]
+
+        assert query_cache.stats()['hits'] == 1
+
+        page = await repository.find_by_filters_cursor_paginated(
+            CursorPageQuery(cursor=page.next_cursor, size=2), order='age', desc=True, projection=HeroList
+        )
+        assert page.items == [{'id': 3, 'name': 'hero 2'}, {'id': 2, 'name': 'hero 1'}]
+
+        page = await repository.find_by_filters_cursor_paginated(
+            CursorPageQuery(cursor=page.previous_cursor, size=2), order='age', desc=True, projection=['name']
+        )
+        assert page.items == [{'name': 'hero 4'}, {'name': 'hero 3'}]
+
+    asyncio.run(scenario())
+
+
+def test_find_by_filters_cursor_paginated(make_repository):
+    repository = make_repository(Hero)
+
+    async def scenario():
+        await create_heroes(repository)
+
+        ids = []
+        cursor_query = CursorPageQuery(size=4, include_total=True)
+        while True:
+            page = await repository.find_by_filters_cursor_paginated(cursor_query, order='age', desc=True)
+            assert page.total == 10
+            ids.extend(hero.id for hero in page.items)
+
+            if not page.next_cursor:
+                break
+
+            cursor_query = CursorPageQuery(cursor=page.next_cursor, size=4, include_total=True)
+
+        assert ids == list(range(10, 0, -1))
+
+        previous = await repository.find_by_filters_cursor_paginated(
+            CursorPageQuery(cursor=page.previous_cursor, size=4), order='age', desc=True
+        )
+        assert [hero.id for hero in previous.items] == [6, 5, 4, 3]
+
+    asyncio.run(scenario())
+
+
+def test_count_and_find_all(make_repository):
+    repository = make_repository(Hero)
+
+    async def scenario():
+        await create_heroes(repository)
+
+        assert await repository.count_by_filters({'age__lt': 4}) == 4
+        assert [hero.age for hero in await repository.find_all_by_filters(order='age', desc=True)][:2] == [9, 8]
+
+    asyncio.run(scenario())
+
+
+def test_update_many_and_delete_by_filters(make_repository):
+    repository = make_repository(Hero)
+
+    async def scenario():
+        await create_heroes(repository)
+
+        assert await repository.update_many({'name': 'young'}, filters={'age__lt': 3}) == 3
+        heroes = await repository.find_all_by_filters({'age__gte': 8})
+        assert await repository.update_many({'age': 100}, db_objs=heroes) == 2
+        assert await repository.count_by_filters({'name': 'young'}) == 3
+        assert await repository.count_by_filters({'age': 100}) == 2
+
+        assert await repository.delete_by_filters({'age': 100}) == 2
+        assert await repository.count_by_filters() == 8
+
+    asyncio.run(scenario())
+
+
+def query_cache_for(repository):
+    if isinstance(repository, AsyncBaseRepository):
+        return AsyncRepositoryQueryCache(AsyncRedisCacheDriver(client=FakeRedis()))
+
+    return RepositoryQueryCache(InMemoryCacheDriver())
+
+
+def test_query_cache(make_repository):
+    repository = make_repository(Hero)
+    query_cache = repository.query_cache = query_cache_for(repository)
+
+    async def scenario():
+        await create_heroes(repository, count=3)
+
+        first = await repository.find_all_by_filters({'age__gte': 1})
+        second = await repository.find_all_by_filters({'age__gte': 1})
+        assert [hero.name for hero in first] == [hero.name for hero in second]
+        assert query_cache.stats()['hits'] == 1
+
+        await repository.create({'name': 'hero 3', 'age': 3})
+        assert len(await repository.find_all_by_filters({'age__gte': 1})) == 3
+
+    asyncio.run(scenario())
+
+
+def test_query_cache_hit_can_be_updated_and_deleted(make_repository):
+    repository = make_repository(Hero)
+    query_cache = repository.query_cache = query_cache_for(repository)
+
+    async def scenario():
+        await create_heroes(repository, count=2)
+
+        await repository.find_one_by_filters({'id': 1})
+        hero = await repository.find_one_by_filters({'id': 1})
+        assert query_cache.stats()['hits'] == 1
+
+        await repository.update(hero, {'name': 'updated'})
+        assert (await repository.find_one_by_filters({'id': 1})).name == 'updated'
+        assert await repository.count_by_filters() == 2
+
+        await repository.delete(await repository.find_one_by_filters({'id': 1}))
+        assert await repository.count_by_filters() == 1
+
+    asyncio.run(scenario())
+
+
+def test_iterate_by_filters(make_repository):
+    repository = make_repository(Hero)
+
+    async def scenario():
+        await create_heroes(repository, count=5)
+
+        if hasattr(repository, 'iter_by_filters'):
+            batches = list(repository.iter_by_filters(batch_size=2, batches=True))
+        else:
+            batches = [batch async for batch in repository.stream_by_filters(batch_size=2, batches=True)]
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+
+    asyncio.run(scenario())
@@ -0,0 +1,41 @@
+import asyncio
+
+from fastapi_dream_core.repository.bulk import model_rows, grouped_chunks
+from tests.models import Account
+
+
+def test_model_rows_skip_none_of_primary_keys_and_defaults():
+    rows = model_rows(Account, [{'owner': 'a'}, {'id': 5, 'owner': 'b', 'balance': 1}])
+
+    assert rows == [{'owner': 'a'}, {'id': 5, 'owner': 'b', 'balance': 1}]
+
+
+def test_grouped_chunks_by_columns():
+    rows = [{'owner': 'a'}, {'id': 5, 'owner': 'b'}, {'owner': 'c'}, {'owner': 'd'}]
+
+    assert list(grouped_chunks(rows, chunk_size=2)) == [
+        ([0, 2], [{'owner': 'a'}, {'owner': 'c'}]),
+        ([3], [{'owner': 'd'}]),
+        ([1], [{'id': 5, 'owner': 'b'}]),
+    ]
+
+
+def test_create_many_use_server_default_and_mixed_primary_keys(make_repository):
+    repository = make_repository(Account)
+
+    async def scenario():
+        created = await repository.create({'owner': 'single'})
+        assert created.balance == 7
+
+        await repository.create_many([
+            {'owner': 'a'},
+            {'id': 10, 'owner': 'b', 'balance': 1},
+            {'owner': 'c'},
+        ], chunk_size=1)
+
+        accounts = await repository.find_all_by_filters(order='id')
+        assert [(account.id, account.owner, account.balance) for account in accounts] == [
+            (1, 'single', 7), (2, 'a', 7), (3, 'c', 7), (10, 'b', 1)
+        ]
+
+    asyncio.run(scenario())
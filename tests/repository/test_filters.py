@@ -0,0 +1,50 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_dream_core.repository import query_filters
+
+app = FastAPI()
+
+
+@app.get('/heroes')
+def list_heroes(filters: dict = Depends(query_filters({'age': ('eq', 'gte'), 'name': ('startswith',)}))):
+    return filters
+
+
+@app.get('/search')
+def search_heroes(
+        q: str,
+        filters: dict = Depends(query_filters({'age': ('gte',)}, extra_params=('sort__by',)))
+):
+    return {'q': q, 'filters': filters}
+
+
+client = TestClient(app)
+
+
+def test_query_filters_allowed():
+    response = client.get('/heroes', params={'age__gte': '18', 'name__startswith': 'De', 'page': 2})
+    assert response.status_code == 200
+    assert response.json() == {'age__gte': '18', 'name__startswith': 'De'}
+
+    assert client.get('/heroes', params={'age': '18'}).json() == {'age': '18'}
+
+
+@pytest.mark.parametrize('param', ['password_hash__startswith', 'age__lt', 'name', 'name__contains', 'age__between'])
+def test_query_filters_not_allowed(param):
+    response = client.get('/heroes', params={param: 'a'})
+    assert response.status_code == 400
+    assert response.json() == {'detail': f'Filter {param} is not allowed!'}
+
+
+def test_params_that_are_not_filters():
+    assert client.get('/heroes', params={'unknown': 'a', 'age': '18'}).json() == {'age': '18'}
+
+    response = client.get('/search', params={'q': 'Dead', 'sort__by': 'name', 'age__gte': '18'})
+    assert response.json() == {'q': 'Dead', 'filters': {'age__gte': '18'}}
+
+
+def test_query_filters_unknown_operator():
+    with pytest.raises(ValueError):
+        query_filters({'age': ('between',)})
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from fastapi_dream_core.pagination import CursorPageQuery
+from tests.models import Membership
+
+RANKS = [3, None, 1, 3, None, 2, 1, None, 3, 2]
+
+
+def expected_order(desc: bool):
+    # The NULLs are after the values in ASC and before them in DESC
+    memberships = [(index % 3, index, rank) for index, rank in enumerate(RANKS)]
+    memberships.sort(key=lambda item: (item[2] is None, item[2] or 0, item[0], item[1]), reverse=desc)
+    return [(team_id, hero_id) for team_id, hero_id, _ in memberships]
+
+
+async def paginate(repository, desc: bool, size: int = 3):
+    keys = []
+    pages = []
+    cursor_query = CursorPageQuery(size=size)
+
+    while True:
+        page = await repository.find_by_filters_cursor_paginated(cursor_query, order='rank', desc=desc)
+        keys.extend((item.team_id, item.hero_id) for item in page.items)
+        pages.append(page)
+
+        if not page.next_cursor:
+            return keys, pages
+
+        cursor_query = CursorPageQuery(cursor=page.next_cursor, size=size)
+
+
+@pytest.mark.parametrize('desc', [False, True])
+def test_nullable_order_column_and_composite_primary_key(make_repository, desc):
+    repository = make_repository(Membership)
+
+    async def scenario():
+        await repository.create_many([
+            {'team_id': index % 3, 'hero_id': index, 'rank': rank} for index, rank in enumerate(RANKS)
+        ])
+
+        keys, pages = await paginate(repository, desc=desc)
+        assert keys == expected_order(desc)
+
+        previous_keys = []
+        for page in reversed(pages[1:]):
+            previous = await repository.find_by_filters_cursor_paginated(
+                CursorPageQuery(cursor=page.previous_cursor, size=3), order='rank', desc=desc
+            )
+            previous_keys = [(item.team_id, item.hero_id) for item in previous.items] + previous_keys
+
+        assert previous_keys == keys[:len(previous_keys)]
+        assert len(previous_keys) == 9
+
+    asyncio.run(scenario())
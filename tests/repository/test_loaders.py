@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import InvalidRequestError
+
+from fastapi_dream_core.pagination import PageQuery
+from fastapi_dream_core.repository import LoadStrategy
+from tests.models import Hero, Team
+
+TEAMS = 20
+
+
+@pytest.fixture
+def statements():
+    """
+    The SELECTs sent to the database while the test run, by a listener of all engines
+    """
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            executed.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+    yield executed
+    event.remove(Engine, 'before_cursor_execute', before_cursor_execute)
+
+
+async def create_teams(make_repository):
+    await make_repository(Team).create_many([{'name': f'team {index}'} for index in range(TEAMS)])
+    await make_repository(Hero).create_many([
+        {'name': f'hero {index}', 'team_id': index % TEAMS + 1} for index in range(TEAMS * 2)
+    ])
+
+
+@pytest.mark.parametrize('strategy, expected', [(LoadStrategy.SELECTIN, 2), (LoadStrategy.JOINED, 1)])
+def test_find_all_eager_loading_statements(make_repository, statements, strategy, expected):
+    repository = make_repository(Team, loaders={'heroes': strategy})
+
+    async def scenario():
+        await create_teams(make_repository)
+        statements.clear()
+
+        teams = await repository.find_all_by_filters()
+        assert len(teams) == TEAMS
+        assert all(len(team.heroes) == 2 for team in teams)
+        assert len(statements) == expected
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize('strategy, expected', [(LoadStrategy.SELECTIN, 2), (LoadStrategy.JOINED, 1)])
+def test_paginated_eager_loading_statements(make_repository, statements, strategy, expected):
+    repository = make_repository(Team)
+
+    async def scenario():
+        await create_teams(make_repository)
+        statements.clear()
+
+        page = await repository.find_by_filters_paginated(PageQuery(size=5), loaders={'heroes': strategy})
+        assert [len(team.heroes) for team in page.items] == [2] * 5
+        assert page.total == TEAMS
+        # The total is counted in the query of page, the heroes are loaded in the same query or in one SELECTIN
+        assert len(statements) == expected
+
+    asyncio.run(scenario())
+
+
+def test_raise_loader(make_repository):
+    repository = make_repository(Team, loaders={'*': LoadStrategy.RAISE})
+
+    async def scenario():
+        await create_teams(make_repository)
+
+        team = await repository.find_one_by_filters({'id': 1})
+        with pytest.raises(InvalidRequestError):
+            team.heroes
+
+    asyncio.run(scenario())
@@ -0,0 +1,75 @@
+import asyncio
+import csv
+from io import StringIO
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel, Field
+
+from fastapi_dream_core.utils.csv_exporter import CSVExporter, ModelExportValidationError
+
+
+class Item(BaseModel):
+    id: int
+    name: str = Field(title='Name')
+    description: Optional[str]
+
+
+class Single(BaseModel):
+    name: str
+
+
+class Empty(BaseModel):
+    pass
+
+
+ITEMS = [
+    Item(id=1, name='semicolon; "quotes"', description='new\nline'),
+    Item(id=0, name='plain', description=None),
+]
+
+
+def read(content: str) -> list:
+    return list(csv.reader(StringIO(content), delimiter=';'))
+
+
+def test_to_csv_quotes_values():
+    content = CSVExporter(Item).to_csv(ITEMS).getvalue()
+
+    assert read(content) == [
+        ['id', 'Name', 'description'],
+        ['1', 'semicolon; "quotes"', 'new\nline'],
+        ['0', 'plain', ''],
+    ]
+
+
+def test_to_csv_is_equal_to_iter_csv():
+    exporter = CSVExporter(Item, chunk_size=1)
+
+    assert exporter.to_csv(ITEMS).getvalue() == b''.join(exporter.iter_csv(ITEMS)).decode()
+
+
+def test_aiter_csv():
+    async def items():
+        for item in ITEMS:
+            yield item
+
+    async def scenario():
+        return [chunk async for chunk in CSVExporter(Item).aiter_csv(items())]
+
+    assert b''.join(asyncio.run(scenario())).decode() == CSVExporter(Item).to_csv(ITEMS).getvalue()
+
+
+def test_single_field():
+    content = CSVExporter(Single).to_csv([Single(name='a;b'), Single(name='c')]).getvalue()
+
+    assert content == 'name\n"a;b"\nc\n'
+
+
+def test_without_fields():
+    assert CSVExporter(Empty).to_csv([Empty(), Empty()]).getvalue() == '\n\n\n'
+
+
+def test_other_model_is_rejected():
+    with pytest.raises(ModelExportValidationError):
+        CSVExporter(Item).to_csv([Single(name='a')])
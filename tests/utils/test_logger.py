@@ -0,0 +1,90 @@
+import importlib
+import json
+import logging
+import queue
+
+from fastapi_dream_core.utils.logger import BackgroundQueueHandler, JSONFormatter, RepeatedErrorsFilter, \
+    configure_logger, request_id, stop_logger
+
+# fastapi_dream_core.utils.logger is the attribute logger of the package, not the module
+logger_module = importlib.import_module('fastapi_dream_core.utils.logger')
+
+
+def make_record(level: int = logging.ERROR, lineno: int = 10, message: str = 'failed') -> logging.LogRecord:
+    return logging.LogRecord('test', level, 'service.py', lineno, message, None, None)
+
+
+def test_repeated_errors_filter_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(logger_module.time, 'monotonic', lambda: now[0])
+    repeated_errors_filter = RepeatedErrorsFilter(burst=2, period_seconds=60)
+
+    assert [repeated_errors_filter.filter(make_record()) for _ in range(5)] == [True, True, False, False, False]
+    # Other line and lower levels are not limited
+    assert repeated_errors_filter.filter(make_record(lineno=20)) is True
+    assert all(repeated_errors_filter.filter(make_record(level=logging.INFO)) for _ in range(5))
+
+    now[0] += 59
+    assert repeated_errors_filter.filter(make_record()) is False
+
+    now[0] += 1
+    record = make_record()
+    assert repeated_errors_filter.filter(record) is True
+    assert record.suppressed == 4
+
+    record = make_record()
+    assert repeated_errors_filter.filter(record) is True
+    assert getattr(record, 'suppressed', 0) == 0
+
+
+def test_request_id_is_in_the_json():
+    handler = BackgroundQueueHandler(queue.Queue())
+    args = {'name': 'Deadpond'}
+    record = logging.LogRecord('test', logging.INFO, 'service.py', 10, 'hello %(name)s', (args,), None)
+
+    token = request_id.set('request-1')
+    try:
+        handler.handle(record)
+    finally:
+        request_id.reset(token)
+
+    args['name'] = 'changed'
+    enqueued = handler.queue.get_nowait()
+    data = json.loads(JSONFormatter().format(enqueued))
+
+    assert data['message'] == 'hello Deadpond'
+    assert data['request_id'] == 'request-1'
+    assert data['level'] == 'INFO' and data['logger'] == 'test'
+
+
+def test_queue_full_drop_the_record():
+    handler = BackgroundQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(make_record())
+    handler.handle(make_record())
+
+    assert handler.dropped == 1
+    assert handler.queue.qsize() == 1
+
+
+def test_stop_logger_flush_the_queue(capsys):
+    stop_logger()
+    configured_logger = configure_logger(log_level=logging.INFO, json_format=True)
+
+    token = request_id.set('request-2')
+    try:
+        for index in range(100):
+            configured_logger.info('message %s', index)
+    finally:
+        request_id.reset(token)
+
+    stop_logger()
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+
+    assert [line['message'] for line in lines] == [f'message {index}' for index in range(100)]
+    assert {line['request_id'] for line in lines} == {'request-2'}
+    assert not any(isinstance(handler, BackgroundQueueHandler) for handler in configured_logger.handlers)
+
+    # Stop again is a no-op and the logger can be configured again
+    stop_logger()
+    configure_logger(log_level=logging.INFO, json_format=True)
+    stop_logger()